@@ -1,9 +1,23 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
-import os, json
-from datetime import datetime
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, ORJSONResponse
+import os
+from datetime import datetime, timedelta
+from backend.utils.file_cache import file_cache
+from backend.utils.timeline_writer import timeline_writer
+from backend.services.token_cache import token_cache
+from backend.services.password_hasher import password_hasher
+from backend.services.google_certs import google_certs
+from backend.services.llm_gateway import llm_gateway
+from backend.services.llm_scheduler import llm_scheduler, ollama_scheduler
+from backend.services.llm_cache import llm_cache, LLMCacheMiddleware
+from backend.services.semantic_cache import semantic_cache
+from backend.utils import timeline_store
+from backend.services import entry_store, rollups
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+from backend.utils.serializer import HAS_ORJSON
 
 # ------------------------------------
 # Import routers for all your features
@@ -21,6 +35,10 @@ from backend.routers import (
     braindump,
     confusion,
     chatbot,
+    blobs,
+    stats,
+    search,
+    timeline,
 )
 from backend.routers.auth_google import router as google_auth_router
 
@@ -29,7 +47,12 @@ from backend.routers.auth_google import router as google_auth_router
 # ------------------
 # Initialize FastAPI
 # ------------------
-app = FastAPI(title="The AURA", version="1.1.0")
+app = FastAPI(
+    title="The AURA",
+    version="1.1.0",
+    # orjson-backed responses everywhere (stdlib encoder if orjson is missing)
+    default_response_class=ORJSONResponse if HAS_ORJSON else JSONResponse,
+)
 
 # ---------------------------
 # CORS Configuration
@@ -46,6 +69,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# "Cache-Control: no-cache" / "X-AURA-LLM-Cache: bypass" skip the LLM response cache
+app.add_middleware(LLMCacheMiddleware)
+
 # ---------------------------
 # Include Routers (AI + Auth modules)
 # ---------------------------
@@ -62,6 +88,31 @@ app.include_router(braindump.router)
 app.include_router(confusion.router)
 app.include_router(chatbot.router)
 app.include_router(google_auth_router)
+app.include_router(blobs.router)
+app.include_router(stats.router)
+app.include_router(search.router)
+app.include_router(timeline.router)
+
+# ---------------------------
+# Timeline Segments (split legacy log, compact old days)
+# ---------------------------
+@app.on_event("startup")
+def prepare_timeline_segments():
+    timeline_store.migrate_legacy_log()
+    timeline_store.compact()
+
+# ---------------------------
+# Graceful Shutdown
+# ---------------------------
+@app.on_event("shutdown")
+def stop_background_workers():
+    timeline_writer.stop()
+    google_certs.stop()
+    llm_cache.flush_hits()
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    await llm_gateway.aclose()
 
 # ---------------------------
 # Root Route
@@ -85,47 +136,49 @@ def root():
 # ---------------------------
 # Universal Saved Notes Route
 # ---------------------------
-@app.get("/notes/list/{module_name}")
-async def universal_saved_notes(module_name: str):
-    base_path = os.path.join(os.path.dirname(__file__), "backend", "saved_files")
-    file_map = {
-        "autonote": "autonote_notes/saved_autonotes.json",
-        "planner": "planner_notes/saved_plans.json",
-        "focus": "focus_notes/saved_focus.json",
-        "flashcards": "flashcards_notes/saved_flashcards.json",
-        "confusion": "confusion_notes/saved_confusion.json",
-        "timepredict": "timepredict_notes/saved_timepredict.json",
-    }
+LISTABLE_MODULES = {"autonote", "planner", "focus", "flashcards", "confusion", "timepredict"}
 
-    if module_name not in file_map:
+@app.get("/notes/list/{module_name}")
+async def universal_saved_notes(module_name: str, page: PageParams = Depends(page_params)):
+    if module_name not in LISTABLE_MODULES:
         return JSONResponse({"entries": []}, status_code=200)
 
-    save_file_path = os.path.join(base_path, file_map[module_name])
-    save_dir = os.path.dirname(save_file_path)
-    os.makedirs(save_dir, exist_ok=True)
-
-    if not os.path.exists(save_file_path):
-        with open(save_file_path, "w", encoding="utf-8") as f:
-            json.dump([], f, indent=2)
-
     try:
-        with open(save_file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        return {"entries": data}
+        # Previews + blob refs; ?expand=true inlines offloaded transcripts / answers
+        if page.stream:
+            return ndjson_response(entry_store.iter_module(module_name, page))
+        return entry_store.page_module(module_name, page)
     except Exception as e:
         return JSONResponse({"error": str(e), "entries": []}, status_code=500)
 
+# ---------------------------
+# Runtime Metrics
+# ---------------------------
+@app.get("/metrics")
+async def runtime_metrics():
+    return {
+        "file_cache": file_cache.stats(),
+        "timeline_writer": timeline_writer.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "google_certs": google_certs.stats(),
+        "llm_gateway": llm_gateway.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "ollama_scheduler": ollama_scheduler.stats(),
+        "llm_router": llm_gateway.router.stats(),
+        "llm_cache": llm_cache.stats(),
+        "semantic_cache": semantic_cache.stats(),
+    }
+
 # ---------------------------
 # Dashboard (for quick viewing)
 # ---------------------------
 @app.get("/dashboard", response_class=HTMLResponse)
-async def unified_dashboard():
-    SAVE_DIR = "saved_data"
-    LOG_FILE = os.path.join(SAVE_DIR, "smart_study_log.json")
-
-    if not os.path.exists(SAVE_DIR):
-        os.makedirs(SAVE_DIR)
+async def unified_dashboard(days: int = Query(30, ge=1, le=3650), details: bool = False):
+    # Day summaries come from the rollup tables; ?details=true also opens
+    # the timeline segments inside the window to list individual entries
+    end = datetime.utcnow().date()
+    start = end - timedelta(days=days - 1)
 
     html = """
     <html>
@@ -138,32 +191,38 @@ async def unified_dashboard():
             .entry { background: #f3f4f6; border-radius: 8px; padding: 12px 16px; margin-top: 10px; }
             .timestamp { color: #6b7280; font-size: 12px; margin-bottom: 5px; }
             .summary { color: #374151; margin-top: 5px; }
+            .stats { background: #eef2ff; border-radius: 8px; padding: 12px 16px; margin-top: 10px; }
         </style>
     </head>
     <body>
         <h1>📘 Smart Study Assistant Dashboard</h1>
-        <p>All saved session logs are listed below.</p>
+        <p>Daily activity across all modules is summarized below.</p>
     """
 
-    logs = []
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, "r", encoding="utf-8") as f:
-                logs = json.load(f)
-        except Exception as e:
-            html += f"<p style='color:red;'>⚠️ Failed to read logs: {e}</p>"
+    summaries, entries_by_day = [], {}
+    try:
+        summaries = rollups.global_days(start.isoformat(), end.isoformat())
+        if details:
+            entries_by_day = dict(timeline_store.iter_days(start, end))
+    except Exception as e:
+        html += f"<p style='color:red;'>⚠️ Failed to read logs: {e}</p>"
 
-    if not logs:
+    if not summaries:
         html += "<p style='color:gray;'>No data found yet. Use any module to create entries.</p>"
     else:
-        grouped = {}
-        for log in logs:
-            date_key = log.get("timestamp", "")[:10]
-            grouped.setdefault(date_key, []).append(log)
-
-        for date_key, entries in sorted(grouped.items(), reverse=True):
-            html += f"<h2>📅 {date_key}</h2>"
-            for entry in entries[::-1]:
+        for day in summaries:
+            modules = ", ".join(f"{m.capitalize()}: {n}" for m, n in sorted(day["modules"].items()))
+            moods = ", ".join(f"{m} × {n}" for m, n in day["moods"].items()) or "—"
+            attention = day["avg_attention"] if day["avg_attention"] is not None else "—"
+            html += f"""
+            <h2>📅 {day['day']}</h2>
+            <div class='stats'>
+                <b>{day['entries']} entries</b> — {modules}<br>
+                🎯 Avg attention: {attention} | 😊 Moods: {moods}<br>
+                🤖 LLM calls: {day['llm_calls']} | 🃏 Flashcards: {day['flashcards']}
+            </div>
+            """
+            for entry in entries_by_day.get(day["day"], [])[::-1]:
                 module = entry.get("module", "Unknown").capitalize()
                 title = entry.get("title", "Untitled Entry")
                 content = entry.get("content", "")
@@ -0,0 +1,27 @@
+# backend/models/entry.py
+from sqlalchemy import Column, Integer, String, Text, Index
+from backend.database import Base
+
+class SavedEntry(Base):
+    __tablename__ = "saved_entries"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    module = Column(String, nullable=False)
+    email = Column(String, nullable=False, default="")
+    timestamp = Column(String, nullable=False)  # normalized ISO-8601 (sortable as text)
+    data = Column(Text, nullable=False)         # the original entry as JSON
+
+    __table_args__ = (
+        # Per-user history: WHERE module=? AND email=? ORDER BY timestamp
+        Index("ix_saved_entries_module_email_ts", "module", "email", "timestamp", "id"),
+        # Module-wide listings (universal notes, latest focus result)
+        Index("ix_saved_entries_module_ts", "module", "timestamp", "id"),
+    )
+
+
+class BlobOwner(Base):
+    """Which users saved an entry referencing a blob (blobs are shared by content)."""
+    __tablename__ = "blob_owners"
+
+    sha256 = Column(String, primary_key=True)
+    email = Column(String, primary_key=True, default="")
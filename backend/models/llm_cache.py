@@ -0,0 +1,27 @@
+# backend/models/llm_cache.py
+from sqlalchemy import Column, Integer, String, Float, Text
+from backend.database import Base
+
+class LLMCacheEntry(Base):
+    """One cached completion, keyed on sha256(model, normalized messages, temperature bucket)."""
+    __tablename__ = "llm_cache"
+
+    key = Column(String, primary_key=True)
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+    size = Column(Integer, nullable=False)            # bytes of response (UTF-8)
+    latency_ms = Column(Float, nullable=False, default=0.0)   # what the original call cost
+    created_at = Column(Float, nullable=False)
+    last_used = Column(Float, nullable=False, index=True)     # LRU order
+    hits = Column(Integer, nullable=False, default=0)
+
+
+class SemanticCacheEntry(Base):
+    """A question and the explanation it got, matched by TF-IDF similarity (doubts / confusion)."""
+    __tablename__ = "semantic_cache"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scope = Column(String, nullable=False, index=True)   # "doubts" | "confusion"
+    question = Column(Text, nullable=False)
+    answer = Column(Text, nullable=False)
+    created_at = Column(Float, nullable=False)
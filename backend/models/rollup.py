@@ -0,0 +1,35 @@
+# backend/models/rollup.py
+from sqlalchemy import Column, Integer, String, Float, Index
+from backend.database import Base
+
+class DailyRollup(Base):
+    """Per user / day / module activity counters, updated with every saved entry."""
+    __tablename__ = "daily_rollups"
+
+    email = Column(String, primary_key=True, default="")
+    day = Column(String, primary_key=True)      # YYYY-MM-DD (UTC)
+    module = Column(String, primary_key=True)
+    entries = Column(Integer, nullable=False, default=0)
+    attention_sum = Column(Float, nullable=False, default=0.0)   # focus attention_score total
+    attention_count = Column(Integer, nullable=False, default=0)
+    llm_calls = Column(Integer, nullable=False, default=0)
+    flashcards = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Cross-user dashboard: WHERE day BETWEEN ? AND ? GROUP BY day, module
+        Index("ix_daily_rollups_day_module", "day", "module"),
+    )
+
+
+class MoodRollup(Base):
+    """Per user / day mood distribution."""
+    __tablename__ = "daily_mood_rollups"
+
+    email = Column(String, primary_key=True, default="")
+    day = Column(String, primary_key=True)
+    mood = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_daily_mood_rollups_day", "day"),
+    )
@@ -0,0 +1,31 @@
+# backend/models/search.py
+from sqlalchemy import Column, Integer, String
+from backend.database import Base
+
+class SearchPosting(Base):
+    """Inverted index: one row per (user, term, entry) with the term frequency."""
+    __tablename__ = "search_postings"
+
+    email = Column(String, primary_key=True, default="")
+    term = Column(String, primary_key=True)
+    entry_id = Column(Integer, primary_key=True)   # saved_entries.id
+    tf = Column(Integer, nullable=False)
+
+
+class SearchDoc(Base):
+    """Indexed entry and its length in tokens (for BM25 length normalization)."""
+    __tablename__ = "search_docs"
+
+    entry_id = Column(Integer, primary_key=True)
+    email = Column(String, nullable=False, default="", index=True)
+    module = Column(String, nullable=False)
+    length = Column(Integer, nullable=False)
+
+
+class SearchStats(Base):
+    """Per-user corpus totals: document count and summed length."""
+    __tablename__ = "search_stats"
+
+    email = Column(String, primary_key=True, default="")
+    docs = Column(Integer, nullable=False, default=0)
+    total_length = Column(Integer, nullable=False, default=0)
@@ -3,7 +3,10 @@ from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from passlib.context import CryptContext
-import json, os
+import os
+from backend.services.user_directory import user_directory
+from backend.services.token_cache import token_cache
+from backend.services.password_hasher import password_hasher, PasswordHasherBusy
 
 # ---------------------------
 # Configuration
@@ -14,19 +17,11 @@ SECRET_KEY = os.getenv("JWT_SECRET", "e2a93f1a2054458ef8c97e6c74f7bc1d")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-# Make sure users.json stays stable
-USER_FILE = os.path.join(os.path.dirname(__file__), "..", "users.json")
-
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 # BCrypt setup
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Initialize user file
-if not os.path.exists(USER_FILE):
-    with open(USER_FILE, "w") as f:
-        json.dump([], f)
-
 # ---------------------------
 # Schemas
 # ---------------------------
@@ -59,15 +54,17 @@ def create_access_token(data: dict):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+async def run_bcrypt(fn, *args):
+    """bcrypt takes ~100-300 ms: run it on the bounded bcrypt pool, never on the event loop."""
+    try:
+        return await password_hasher.run(fn, *args)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+
+
 def find_user(email: str):
-    if not os.path.exists(USER_FILE):
-        return None
-    with open(USER_FILE, "r") as f:
-        users = json.load(f)
-    for u in users:
-        if u["email"].lower() == email.lower():
-            return u
-    return None
+    # O(1) hash lookup on the lower-cased email (shared with Google login)
+    return user_directory.get(email)
 
 
 # ---------------------------
@@ -81,19 +78,15 @@ async def signup(user: UserCreate):
 
     new_user = {
         "email": user.email,
-        "password": get_password_hash(user.password),
+        "password": await run_bcrypt(get_password_hash, user.password),
         "name": user.name,
         "created_at": datetime.utcnow().isoformat(),
     }
 
-    with open(USER_FILE, "r+") as f:
-        try:
-            users = json.load(f)
-        except json.JSONDecodeError:
-            users = []
-        users.append(new_user)
-        f.seek(0)
-        json.dump(users, f, indent=2)
+    try:
+        user_directory.add(new_user)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Email already registered")
 
     token = create_access_token({"sub": user.email})
     return {"access_token": token, "user": user.email}
@@ -105,7 +98,8 @@ async def signup(user: UserCreate):
 @router.post("/login")
 async def login(request: LoginRequest):
     user = find_user(request.email)
-    if not user or not verify_password(request.password, user["password"]):
+    # Google-only accounts have no password hash
+    if not user or not user.get("password") or not await run_bcrypt(verify_password, request.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_access_token({"sub": user["email"]})
@@ -116,13 +110,16 @@ async def login(request: LoginRequest):
 # Get current user
 # ---------------------------
 async def get_current_user(Authorization: str = Header(None)):
-    print("🔍 Incoming Authorization header:", Authorization)
-
     if not Authorization:
         raise HTTPException(status_code=401, detail="Missing token")
 
     token = Authorization.replace("Bearer ", "").strip()
 
+    # Already verified and the user directory hasn't changed since
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -134,6 +131,7 @@ async def get_current_user(Authorization: str = Header(None)):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
+        token_cache.put(token, user, payload.get("exp"))
         return user
 
     except JWTError:
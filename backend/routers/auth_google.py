@@ -1,11 +1,11 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from datetime import datetime, timedelta
 import jwt
 import os
-import json
+import asyncio
+from backend.services.user_directory import user_directory
+from backend.services.google_certs import google_certs
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -13,14 +13,6 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 JWT_SECRET = os.getenv("JWT_SECRET", "e2a93f1a2054458ef8c97e6c74f7bc1d")
 
-# Users stored here (same as normal login)
-USERS_FILE = "saved_files/users.json"
-os.makedirs("saved_files", exist_ok=True)
-
-if not os.path.exists(USERS_FILE):
-    with open(USERS_FILE, "w") as f:
-        json.dump([], f, indent=2)
-
 
 # --------------------------
 # Request Model
@@ -33,25 +25,13 @@ class GoogleAuthRequest(BaseModel):
 # Create or fetch user
 # --------------------------
 def create_or_get_user(email: str, name: str, picture: str):
-    with open(USERS_FILE, "r+", encoding="utf-8") as f:
-        users = json.load(f)
-
-        for u in users:
-            if u["email"] == email:
-                return u
-
-        new_user = {
-            "email": email,
-            "name": name,
-            "picture": picture,
-            "auth_method": "google",
-            "created_at": datetime.utcnow().isoformat(),
-        }
-
-        users.append(new_user)
-        f.seek(0)
-        json.dump(users, f, indent=2)
-        return new_user
+    # Same directory as password logins, so get_current_user finds Google users too
+    return user_directory.get_or_create(email, {
+        "name": name,
+        "picture": picture,
+        "auth_method": "google",
+        "created_at": datetime.utcnow().isoformat(),
+    })
 
 
 # --------------------------
@@ -62,12 +42,8 @@ async def google_login(payload: GoogleAuthRequest):
     try:
         token = payload.token
 
-        # Verify Google Token
-        info = id_token.verify_oauth2_token(
-            token,
-            requests.Request(),
-            GOOGLE_CLIENT_ID
-        )
+        # Verify Google Token against the cached certs (no fetch per login)
+        info = await asyncio.to_thread(google_certs.verify, token, GOOGLE_CLIENT_ID)
 
         email = info["email"]
         name = info.get("name", "AURA User")
@@ -3,7 +3,11 @@ from pydantic import BaseModel
 from backend.routers.auth import get_current_user
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
-from groq import Groq
+from backend.services import entry_store, blob_store
+from backend.services.llm_gateway import llm_gateway, CallCounter
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+from backend.utils.chunker import chunk_text
 import os, json, tempfile, whisper, fitz, asyncio, traceback
 from datetime import datetime
 
@@ -14,7 +18,6 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise RuntimeError("❌ GROQ_API_KEY missing")
 
-client = Groq(api_key=GROQ_API_KEY)
 MODEL_NAME = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,9 +25,7 @@ SAVE_DIR = os.path.join(PROJECT_ROOT, "saved_files", "autonote_notes")
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 SAVE_FILE = os.path.join(SAVE_DIR, "saved_autonotes.json")
-if not os.path.exists(SAVE_FILE):
-    with open(SAVE_FILE, "w") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("autonote", SAVE_FILE)
 
 # Models
 class TextRequest(BaseModel):
@@ -64,7 +65,7 @@ def flatten_list(items):
         return [str(x.get("description", x)) if isinstance(x, dict) else str(x) for x in items]
     return []
 
-def save_note(title, transcript, summary, highlights, bullets, email):
+def save_note(title, transcript, summary, highlights, bullets, email, llm_calls=0):
     entry = {
         "id": datetime.utcnow().strftime("%Y%m%d%H%M%S"),
         "email": email,
@@ -78,29 +79,19 @@ def save_note(title, transcript, summary, highlights, bullets, email):
         "timestamp": datetime.utcnow().isoformat(),
     }
 
-    try:
-        with open(SAVE_FILE, "r+") as f:
-            data = json.load(f)
-            data.append(entry)
-            f.seek(0)
-            json.dump(data, f, indent=2)
-    except:
-        with open(SAVE_FILE, "w") as f:
-            json.dump([entry], f, indent=2)
+    # The full transcript lives in the blob store; the entry keeps a preview + hash
+    entry_store.add("autonote", email, blob_store.offload(entry, "transcript", owner=email), llm_calls=llm_calls)
 
     asyncio.create_task(send_summary_email(email, title, summary))
     return entry
 
-# Summarization
-def summarize(text: str, email: str):
-    if not text.strip():
-        raise HTTPException(400, "Empty text")
+# Summarization (map-reduce)
+MAP_CONCURRENCY = int(os.getenv("AURA_AUTONOTE_CONCURRENCY", "8"))
+CHUNK_RETRIES = int(os.getenv("AURA_AUTONOTE_RETRIES", "2"))
+REDUCE_FANIN = 4   # partial summaries merged per reduce call
+RETRY_TEMPERATURE_STEP = 0.2   # at temperature 0 a retry would just repeat the broken reply
 
-    chunks = [text[i:i+6000] for i in range(0, len(text), 6000)]
-    summaries, highlights, bullets = [], [], []
-
-    for chunk in chunks:
-        prompt = f"""
+MAP_PROMPT = """
 Summarize academically into JSON:
 {{
   "summary":"",
@@ -111,36 +102,121 @@ Summarize academically into JSON:
 Text:
 \"\"\"{chunk}\"\"\"
 """
+
+REDUCE_PROMPT = """
+These are summaries of consecutive sections of one document, in order.
+Merge them into one coherent academic summary without repeating points.
+Answer as JSON: {{"summary":""}}
+
+Sections:
+{sections}
+"""
+
+
+def _parse_json(content: str) -> dict:
+    s, e = content.find("{"), content.rfind("}")
+    return json.loads(content[s:e+1])
+
+
+def _is_json(content: str) -> bool:
+    try:
+        _parse_json(content)
+        return True
+    except ValueError:
+        return False
+
+
+async def _llm_json(prompt: str, label: str, email: str):
+    """
+    One JSON completion (batch priority), retried with backoff; None once
+    every attempt failed. Replies that don't parse are never cached, and
+    each retry samples at a slightly higher temperature.
+    """
+    for attempt in range(CHUNK_RETRIES + 1):
         try:
-            res = client.chat.completions.create(
+            content = await llm_gateway.chat(
+                [{"role": "user", "content": prompt}],
                 model=MODEL_NAME,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0,
+                temperature=attempt * RETRY_TEMPERATURE_STEP,
+                priority="batch",
+                user=email,
+                cache_if=_is_json,
             )
-            content = res.choices[0].message.content
-            s, e = content.find("{"), content.rfind("}")
-            data = json.loads(content[s:e+1])
-            summaries.append(data["summary"])
-            highlights.extend(flatten_list(data["highlights"]))
-            bullets.extend(flatten_list(data["bullets"]))
-        except:
+            return _parse_json(content)
+        except Exception as e:
+            print(f"⚠️ AutoNote {label} attempt {attempt + 1} failed: {e}")
+            if attempt < CHUNK_RETRIES:
+                await asyncio.sleep(2 ** attempt)
+    return None
+
+
+async def _reduce(summaries: list, email: str) -> str:
+    """Merge partial summaries REDUCE_FANIN at a time, level by level, until one is left."""
+    level = 0
+    while len(summaries) > 1:
+        level += 1
+        groups = [summaries[i:i + REDUCE_FANIN] for i in range(0, len(summaries), REDUCE_FANIN)]
+
+        async def merge(group, n):
+            if len(group) == 1:
+                return group[0]
+            sections = "\n\n".join(f"[{i + 1}] {text}" for i, text in enumerate(group))
+            data = await _llm_json(REDUCE_PROMPT.format(sections=sections), f"reduce {level}.{n}", email)
+            # A failed merge keeps its inputs, so nothing is lost
+            return (data or {}).get("summary") or "\n".join(group)
+
+        summaries = await asyncio.gather(*(merge(group, n) for n, group in enumerate(groups)))
+    return summaries[0] if summaries else ""
+
+
+async def summarize(text: str, email: str):
+    if not text.strip():
+        raise HTTPException(400, "Empty text")
+
+    # Whole sentences / paragraphs packed up to the model's token budget
+    chunks = list(chunk_text(text, MODEL_NAME))
+    semaphore = asyncio.Semaphore(MAP_CONCURRENCY)
+
+    async def map_chunk(n, chunk):
+        async with semaphore:
+            return await _llm_json(MAP_PROMPT.format(chunk=chunk), f"chunk {n + 1}/{len(chunks)}", email)
+
+    # Only completions that really went upstream count (cache hits don't)
+    counter = CallCounter()
+
+    # Map: all chunks at once (bounded), results come back in chunk order
+    with counter:
+        results = await asyncio.gather(*(map_chunk(n, chunk) for n, chunk in enumerate(chunks)))
+
+    summaries, highlights, bullets = [], [], []
+    for data in results:
+        if not data:
             continue
+        if data.get("summary"):
+            summaries.append(str(data["summary"]))
+        highlights.extend(flatten_list(data.get("highlights")))
+        bullets.extend(flatten_list(data.get("bullets")))
 
-    final_summary = "\n".join(summaries).strip() or text[:800]
+    # Reduce: one summary for the whole document
+    with counter:
+        final_summary = (await _reduce(summaries, email)).strip() or text[:800]
+    highlights = list(dict.fromkeys(highlights))
+    bullets = list(dict.fromkeys(bullets))
+    print(f"🧠 AutoNote: {len(chunks)} chunk(s), {len(summaries)} summarized, {counter.calls} LLM call(s)")
 
-    save_note("AutoNote Summary", text, final_summary, list(set(highlights)), list(set(bullets)), email)
+    save_note("AutoNote Summary", text, final_summary, highlights, bullets, email, llm_calls=counter.calls)
 
     return {
         "summary": final_summary,
-        "highlights": list(set(highlights)),
-        "bullets": list(set(bullets)),
+        "highlights": highlights,
+        "bullets": bullets,
     }
 
 # ROUTES
 
 @router.post("/text")
 async def summarize_text(payload: TextRequest, current_user: dict = Depends(get_current_user)):
-    return summarize(payload.text, current_user["email"])
+    return await summarize(payload.text, current_user["email"])
 
 
 @router.post("/audio")
@@ -161,7 +237,7 @@ async def summarize_audio(file: UploadFile = File(...), current_user: dict = Dep
     if not transcript:
         raise HTTPException(400, "No speech detected")
 
-    return {"transcript": transcript, **summarize(transcript, current_user["email"])}
+    return {"transcript": transcript, **(await summarize(transcript, current_user["email"]))}
 
 
 @router.post("/upload")
@@ -184,7 +260,7 @@ async def summarize_file(file: UploadFile = File(...), current_user: dict = Depe
     else:
         raise HTTPException(400, "Only .pdf or .txt allowed")
 
-    return summarize(text, current_user["email"])
+    return await summarize(text, current_user["email"])
 
 
 @router.post("/save")
@@ -201,23 +277,9 @@ async def manual_save(payload: ManualSaveRequest, current_user: dict = Depends(g
 
 
 @router.get("/saved")
-async def saved_notes(current_user: dict = Depends(get_current_user)):
-    # Ensure file exists
-    if not os.path.exists(SAVE_FILE):
-        return {"entries": []}
-
-    # Read safely
-    try:
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except:
-        data = []
-
-    # FIX: Use n.get("email") so KeyError never happens
-    notes = [n for n in data if n.get("email") == current_user["email"]]
-
-    # Sort safely
-    notes.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-    return {"entries": notes}
+async def saved_notes(current_user: dict = Depends(get_current_user), page: PageParams = Depends(page_params)):
+    # Indexed keyset page, already newest first
+    if page.stream:
+        return ndjson_response(entry_store.iter_for_user("autonote", current_user["email"], page))
+    return entry_store.page_for_user("autonote", current_user["email"], page)
 
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Depends, Response
+from backend.routers.auth import get_current_user
+from backend.services import blob_store
+
+router = APIRouter(prefix="/blobs", tags=["Blobs"])
+
+
+# -------------------------------
+# 🧱 Lazy fetch of offloaded content
+# -------------------------------
+@router.get("/{sha256}")
+async def get_blob(sha256: str, format: str = "text", current_user: dict = Depends(get_current_user)):
+    """
+    Return the full body behind an entry's blobs[field] reference
+    (transcripts, flashcard decks, AI explanations). Content never
+    changes for a given hash, so clients may cache it forever.
+    Only users the blob was offloaded for may read it.
+    """
+    sha256 = sha256.lower()
+    # 404 rather than 403: don't reveal that someone else saved this content
+    if not blob_store.owns(current_user["email"], sha256):
+        raise HTTPException(404, "Blob not found")
+    try:
+        data = blob_store.get(sha256)
+    except blob_store.BlobNotFound:
+        raise HTTPException(404, "Blob not found")
+
+    media_type = "application/json" if format == "json" else "text/plain; charset=utf-8"
+    return Response(
+        content=data,
+        media_type=media_type,
+        headers={"Cache-Control": "private, max-age=31536000, immutable", "ETag": f'"{sha256}"'},
+    )
@@ -4,6 +4,9 @@ from backend.routers.auth import get_current_user
 from backend.models.user import User
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
 import random
 import os
 import asyncio
@@ -23,20 +26,21 @@ class BrainDumpResponse(BaseModel):
 
 # ---------- Helper Functions ----------
 def ensure_save_paths():
-    """Create required save directories/files if not present."""
+    """Create required save directories if not present."""
     save_dir = os.path.join("saved_files", "brain_dumps")
     os.makedirs(save_dir, exist_ok=True)
 
     save_file = os.path.join(save_dir, "saved_brain_dumps.json")
-    if not os.path.exists(save_file):
-        with open(save_file, "w", encoding="utf-8") as f:
-            json.dump([], f, indent=2)
     return save_dir, save_file
 
 
+# Pull any pre-database dumps into the entry store once
+entry_store.import_legacy("braindump", ensure_save_paths()[1])
+
+
 def save_to_file(input_text: str, response_text: str, user_email: str) -> str:
     """Save both user input and organized output to a .txt and JSON."""
-    save_dir, save_file = ensure_save_paths()
+    save_dir, _ = ensure_save_paths()
 
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     file_name = f"braindump_{user_email.replace('@', '_')}_{timestamp}.txt"
@@ -60,11 +64,7 @@ def save_to_file(input_text: str, response_text: str, user_email: str) -> str:
         "organized_text": response_text,
         "file_path": file_path,
     }
-    with open(save_file, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        data.append(entry)
-        f.seek(0)
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    entry_store.add("braindump", user_email, entry)
 
     return file_path
 
@@ -149,23 +149,18 @@ async def save_brain_dump(req: BrainDumpRequest, current_user: User = Depends(ge
 
 # ---------- Retrieve all dumps for current user ----------
 @router.get("/saved")
-async def get_saved_brain_dumps(current_user: User = Depends(get_current_user)):
+async def get_saved_brain_dumps(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
     """Return all saved brain dumps for the logged-in user."""
     try:
-        _, save_file = ensure_save_paths()
-        with open(save_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
         user_email = (
             current_user.get("email")
             if isinstance(current_user, dict)
             else getattr(current_user, "email", None)
         )
 
-        user_data = [d for d in data if d.get("email") == user_email]
-        user_data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return {"entries": user_data}
+        if page.stream:
+            return ndjson_response(entry_store.iter_for_user("braindump", user_email, page))
+        return entry_store.page_for_user("braindump", user_email, page)
 
     except Exception as e:
         print(f"⚠️ Error fetching brain dumps: {e}")
@@ -3,6 +3,9 @@ from backend.routers.auth import get_current_user
 from backend.models.user import User
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
 import os, json, asyncio
 from datetime import datetime
 
@@ -14,10 +17,7 @@ router = APIRouter(prefix="/calendar", tags=["Smart Calendar"])
 CALENDAR_DIR = "saved_files/calendar"
 CALENDAR_PATH = os.path.join(CALENDAR_DIR, "study_calendar.json")
 os.makedirs(CALENDAR_DIR, exist_ok=True)
-
-if not os.path.exists(CALENDAR_PATH):
-    with open(CALENDAR_PATH, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("calendar", CALENDAR_PATH)
 
 
 # --------------------------
@@ -39,15 +39,11 @@ async def send_calendar_email(user_email: str, subject: str, body_text: str):
 # Routes
 # --------------------------
 @router.get("/list")
-async def list_calendar(current_user: User = Depends(get_current_user)):
-    """📅 Fetch all study sessions for the logged-in user."""
-    with open(CALENDAR_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Filter by user
-    user_data = [entry for entry in data if entry.get("email") == current_user.email]
-    user_data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    return {"entries": user_data}
+async def list_calendar(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
+    """📅 Fetch study sessions for the logged-in user (paged with ?limit=&cursor=)."""
+    if page.stream:
+        return ndjson_response(entry_store.iter_for_user("calendar", current_user.email, page))
+    return entry_store.page_for_user("calendar", current_user.email, page)
 
 
 @router.post("/add")
@@ -67,11 +63,7 @@ async def add_calendar_event(event: dict, current_user: User = Depends(get_curre
         "timestamp": datetime.utcnow().isoformat(),
     }
 
-    with open(CALENDAR_PATH, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        data.append(new_entry)
-        f.seek(0)
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    entry_store.add("calendar", current_user.email, new_entry)
 
     # Send async email confirmation
     asyncio.create_task(
@@ -88,13 +80,8 @@ async def add_calendar_event(event: dict, current_user: User = Depends(get_curre
 @router.delete("/clear")
 async def clear_calendar(current_user: User = Depends(get_current_user)):
     """🧹 Clear all study sessions for the current user."""
-    with open(CALENDAR_PATH, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        # Keep only other users' events
-        filtered = [entry for entry in data if entry.get("email") != current_user.email]
-        f.seek(0)
-        json.dump(filtered, f, indent=2)
-        f.truncate()
+    # Other users' events are untouched
+    entry_store.delete_for_user("calendar", current_user.email)
 
     # Send async email notification
     asyncio.create_task(
@@ -111,11 +98,5 @@ async def clear_calendar(current_user: User = Depends(get_current_user)):
 @router.get("/count")
 async def calendar_count(current_user: User = Depends(get_current_user)):
     """📊 Count how many study sessions exist for the logged-in user."""
-    if not os.path.exists(CALENDAR_PATH):
-        return {"count": 0}
-
-    with open(CALENDAR_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    user_count = len([entry for entry in data if entry.get("email") == current_user.email])
+    user_count = entry_store.count_for_user("calendar", current_user.email)
     return {"count": user_count}
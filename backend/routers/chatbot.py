@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from backend.routers.auth import get_current_user
 from backend.models.user import User
-from backend.services.gpt_connector import ask_gpt
+from backend.services.gpt_connector import ask_gpt, stream_gpt
+from backend.services.llm_gateway import CallCounter
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+from backend.utils.sse import wants_sse, sse_response, stream_completion
 from datetime import datetime
 import asyncio, os, json
 
@@ -22,13 +27,10 @@ class ChatRequest(BaseModel):
 # Helper Functions
 # -------------------------------
 SAVE_PATH = os.path.join("saved_files", "chatbot_logs.json")
-os.makedirs(os.path.dirname(SAVE_PATH), exist_ok=True)
-if not os.path.exists(SAVE_PATH):
-    with open(SAVE_PATH, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("chatbot", SAVE_PATH)
 
 
-def log_chat(user_email: str, question: str, answer: str):
+def log_chat(user_email: str, question: str, answer: str, llm_calls: int):
     """Save chat logs per user for future reference."""
     entry = {
         "email": user_email,
@@ -37,11 +39,7 @@ def log_chat(user_email: str, question: str, answer: str):
         "timestamp": datetime.utcnow().isoformat(),
     }
 
-    with open(SAVE_PATH, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        data.append(entry)
-        f.seek(0)
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    entry_store.add("chatbot", user_email, entry, llm_calls=llm_calls)
 
     print(f"💬 Chat saved for {user_email}")
 
@@ -71,8 +69,8 @@ async def send_chat_email(user_email: str, question: str, answer: str):
 # 💬 ChatBot Endpoint
 # -------------------------------
 @router.post("/")
-async def chatbot(request: ChatRequest, current_user: User = Depends(get_current_user)):
-    """Handle chat requests and link them to user identity."""
+async def chatbot(request: ChatRequest, http_request: Request, current_user: User = Depends(get_current_user)):
+    """Handle chat requests and link them to user identity (SSE with Accept: text/event-stream)."""
     user_email = current_user["email"] if isinstance(current_user, dict) else current_user.email
     user_question = (request.question or request.query or "").strip()
 
@@ -90,44 +88,44 @@ async def chatbot(request: ChatRequest, current_user: User = Depends(get_current
         {"role": "user", "content": user_question},
     ]
 
-    # ✅ Await ask_gpt() if it’s async
-    try:
-        answer = await ask_gpt(messages)
-    except TypeError:
-        # Fallback if ask_gpt is synchronous
-        answer = ask_gpt(messages)
+    # Cached answers are not LLM calls; only what actually went upstream is recorded
+    counter = CallCounter()
 
-    if not answer:
-        raise HTTPException(status_code=500, detail="Failed to get response from GPT.")
+    def finish(answer: str):
+        # Save chat
+        log_chat(user_email, user_question, answer, counter.calls)
 
-    # Save chat
-    log_chat(user_email, user_question, answer)
+        # Send chat summary email asynchronously
+        asyncio.create_task(send_chat_email(user_email, user_question, answer))
 
-    # Send chat summary email asynchronously
-    asyncio.create_task(send_chat_email(user_email, user_question, answer))
+        return {
+            "email": user_email,
+            "question": user_question,
+            "answer": answer,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
 
-    return {
-        "email": user_email,
-        "question": user_question,
-        "answer": answer,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+    # 📡 Tokens are forwarded as they arrive; saving + email run after the last one
+    if wants_sse(http_request):
+        return sse_response(stream_completion(counter.track(stream_gpt(messages, user=user_email)), finish))
+
+    # ✅ Async LLM gateway: other requests keep being served while Groq answers
+    with counter:
+        answer = await ask_gpt(messages, user=user_email)
+
+    if not answer:
+        raise HTTPException(status_code=500, detail="Failed to get response from GPT.")
+
+    return finish(answer)
 
 
 # -------------------------------
 # 📜 Retrieve Chat History
 # -------------------------------
 @router.get("/history")
-async def get_chat_history(current_user: User = Depends(get_current_user)):
-    """Fetch all past chats for the logged-in user."""
-    if not os.path.exists(SAVE_PATH):
-        return {"entries": []}
-
-    with open(SAVE_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    user_chats = [c for c in data if c.get("email") == (
-        current_user["email"] if isinstance(current_user, dict) else current_user.email
-    )]
-    user_chats.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    return {"entries": user_chats}
+async def get_chat_history(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
+    """Fetch past chats for the logged-in user (paged with ?limit=&cursor=)."""
+    user_email = current_user["email"] if isinstance(current_user, dict) else current_user.email
+    if page.stream:
+        return ndjson_response(entry_store.iter_for_user("chatbot", user_email, page))
+    return entry_store.page_for_user("chatbot", user_email, page)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from backend.routers.auth import get_current_user
 from backend.models.user import User
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
-from groq import Groq
+from backend.services import entry_store, blob_store
+from backend.services.llm_gateway import llm_gateway, LLMEmptyReply, CallCounter
+from backend.services.semantic_cache import semantic_cache
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+from backend.utils.sse import wants_sse, sse_response, stream_completion, single_delta
 from datetime import datetime
 import os, time, json, asyncio
 
@@ -17,7 +22,6 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise ValueError("❌ Missing GROQ_API_KEY environment variable.")
 
-client = Groq(api_key=GROQ_API_KEY)
 MODEL_NAME = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
 
 # =========================
@@ -27,9 +31,7 @@ SAVE_DIR = os.path.join("saved_files", "confusion_explanations")
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 SAVE_FILE = os.path.join(SAVE_DIR, "confusion_logs.json")
-if not os.path.exists(SAVE_FILE):
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("confusion", SAVE_FILE)
 
 
 # =========================
@@ -67,12 +69,38 @@ async def send_confusion_email(user_email: str, topic: str, explanation: str):
     await fm.send_message(message)
 
 
+# =========================
+# 🧾 Persist + notify
+# =========================
+def record_explanation(user_email: str, topic: str, explanation: str, llm_calls: int) -> dict:
+    """Save the explanation, queue the email and remember it for paraphrases."""
+    if llm_calls:
+        semantic_cache.add("confusion", topic, explanation)
+
+    # ✅ Save explanation to JSON log
+    entry = {
+        "id": datetime.utcnow().strftime("%Y%m%d%H%M%S"),
+        "email": user_email,
+        "title": topic,
+        "content": explanation.strip(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+    # ✅ Full explanation is archived once in the blob store (replaces the per-entry .txt)
+    entry_store.add("confusion", user_email, blob_store.offload(entry, "content", owner=user_email), llm_calls=llm_calls)
+
+    # ✅ Send email asynchronously
+    asyncio.create_task(send_confusion_email(user_email, topic, explanation))
+
+    return {"explanation": explanation.strip()}
+
+
 # =========================
 # 🧠 MAIN ENDPOINT
 # =========================
 @router.post("/analyze", response_model=ConfusionResponse)
-async def analyze_confusion(req: ConfusionRequest, current_user: User = Depends(get_current_user)):
-    """Analyze a confusing topic and explain it clearly, linked to the logged-in user."""
+async def analyze_confusion(req: ConfusionRequest, request: Request, current_user: User = Depends(get_current_user)):
+    """Analyze a confusing topic and explain it clearly (SSE with Accept: text/event-stream)."""
     topic = req.text.strip()
     user_email = current_user.email
 
@@ -87,53 +115,38 @@ Avoid jargon and make it relatable.
 
 Topic: {topic}
 """
+    messages = [{"role": "user", "content": prompt}]
+
+    # 🧲 A paraphrase of an earlier topic reuses its explanation
+    cached = semantic_cache.lookup("confusion", topic)
+    if cached:
+        print(f"🧲 Reused a cached explanation (similarity {cached[1]}) for {user_email}")
+    counter = CallCounter()   # exact-cache hits don't count as LLM calls either
+
+    # 📡 Tokens are forwarded as they arrive; saving + email run after the last one
+    if wants_sse(request):
+        deltas = single_delta(cached[0]) if cached else llm_gateway.stream_chat(messages, model=MODEL_NAME, temperature=1.0, user=user_email)
+        return sse_response(stream_completion(
+            counter.track(deltas), lambda explanation: record_explanation(user_email, topic, explanation, counter.calls)
+        ))
+
     try:
-        explanation = ""
-        start_time = time.time()
-
-        # ✅ Stream response from Groq
-        completion = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            stream=True,
-        )
-
-        for chunk in completion:
-            delta = getattr(chunk.choices[0].delta, "content", "") or ""
-            explanation += delta
-
-        duration = round(time.time() - start_time, 1)
-        print(f"✅ Groq responded in {duration}s ({len(explanation)} chars) for {user_email}")
-
-        if not explanation.strip():
-            raise HTTPException(500, "🤖 AI did not return an explanation. Try rephrasing your question.")
-
-        # ✅ Save explanation to JSON log
-        entry = {
-            "id": datetime.utcnow().strftime("%Y%m%d%H%M%S"),
-            "email": user_email,
-            "title": topic,
-            "content": explanation.strip(),
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            data = json.load(f)
-            data.append(entry)
-            f.seek(0)
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-        # ✅ Save individual file for archival
-        file_name = f"{entry['id']}_{user_email.replace('@','_')}.txt"
-        file_path = os.path.join(SAVE_DIR, file_name)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(f"🧠 AURA Concept Explanation\nUser: {user_email}\nTopic: {topic}\nTimestamp: {entry['timestamp']}\n\n")
-            f.write(explanation.strip())
-
-        # ✅ Send email asynchronously
-        asyncio.create_task(send_confusion_email(user_email, topic, explanation))
-
-        return {"explanation": explanation.strip()}
+        if cached:
+            explanation = cached[0]
+        else:
+            start_time = time.time()
+
+            # ✅ Async completion through the shared LLM gateway
+            try:
+                with counter:
+                    explanation = await llm_gateway.chat(messages, model=MODEL_NAME, temperature=1.0, user=user_email)
+            except LLMEmptyReply:
+                raise HTTPException(500, "🤖 AI did not return an explanation. Try rephrasing your question.")
+
+            duration = round(time.time() - start_time, 1)
+            print(f"✅ Groq responded in {duration}s ({len(explanation)} chars) for {user_email}")
+
+        return record_explanation(user_email, topic, explanation, counter.calls)
 
     except Exception as e:
         raise HTTPException(500, f"Confusion analysis failed: {e}")
@@ -143,19 +156,12 @@ Topic: {topic}
 # 📁 SAVED ENTRIES
 # =========================
 @router.get("/saved")
-async def get_saved_confusion(current_user: User = Depends(get_current_user)):
-    """Return all saved confusion explanations for the logged-in user."""
+async def get_saved_confusion(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
+    """Return saved confusion explanations for the logged-in user."""
     try:
-        if not os.path.exists(SAVE_FILE):
-            return {"entries": []}
-
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        user_entries = [e for e in data if e.get("email") == current_user.email]
-        user_entries.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return {"entries": user_entries}
+        if page.stream:
+            return ndjson_response(entry_store.iter_for_user("confusion", current_user.email, page))
+        return entry_store.page_for_user("confusion", current_user.email, page)
 
     except Exception as e:
         raise HTTPException(500, f"Failed to load confusion entries: {e}")
@@ -163,6 +169,6 @@ async def get_saved_confusion(current_user: User = Depends(get_current_user)):
 
 # ✅ Alias for Frontend Compatibility
 @router.get("/notes/list/confusion")
-async def get_confusion_alias(current_user: User = Depends(get_current_user)):
+async def get_confusion_alias(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
     """Frontend-friendly alias for saved confusions."""
-    return await get_saved_confusion(current_user)
+    return await get_saved_confusion(current_user, page)
@@ -3,6 +3,9 @@ from backend.routers.auth import get_current_user
 from backend.models.user import User
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
 import subprocess, os, json, asyncio
 from datetime import datetime
 
@@ -15,9 +18,7 @@ LOG_DIR = "saved_files/distraction_logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE = os.path.join(LOG_DIR, "blocker_activity.json")
-if not os.path.exists(LOG_FILE):
-    with open(LOG_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("distraction", LOG_FILE)
 
 
 # ----------------------------
@@ -38,11 +39,7 @@ def log_action(user_email: str, action: str, result: dict):
         "timestamp": datetime.utcnow().isoformat(),
         "result": result,
     }
-    with open(LOG_FILE, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        data.append(entry)
-        f.seek(0)
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    entry_store.add("distraction", user_email, entry)
 
 
 async def send_distraction_email(user_email: str, action: str, details: str):
@@ -107,12 +104,11 @@ async def rollback_distraction_block(current_user: User = Depends(get_current_us
 
 
 @router.get("/logs", dependencies=[Depends(get_current_user)])
-async def get_distraction_logs(current_user: User = Depends(get_current_user)):
+async def get_distraction_logs(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
     """Fetch user-specific distraction logs."""
     try:
-        with open(LOG_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        user_logs = [entry for entry in data if entry.get("email") == current_user.email]
-        return {"entries": user_logs}
+        if page.stream:
+            return ndjson_response(entry_store.iter_for_user("distraction", current_user.email, page))
+        return entry_store.page_for_user("distraction", current_user.email, page)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch logs: {e}")
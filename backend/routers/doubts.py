@@ -1,10 +1,15 @@
 import os, json, asyncio
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from backend.routers.auth import get_current_user
 from datetime import datetime
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
-from groq import Groq  # ✅ Groq AI SDK
+from backend.services import entry_store, blob_store
+from backend.services.llm_gateway import llm_gateway, CallCounter
+from backend.services.semantic_cache import semantic_cache
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+from backend.utils.sse import wants_sse, sse_response, stream_completion, single_delta
 
 router = APIRouter(prefix="/doubts", tags=["Doubts"])
 
@@ -15,17 +20,15 @@ SAVE_DIR = os.path.join("saved_files", "doubts")
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 SAVE_FILE = os.path.join(SAVE_DIR, "saved_doubts.json")
-if not os.path.exists(SAVE_FILE):
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("doubts", SAVE_FILE)
 
 # -------------------------------
-# 🤖 Initialize Groq Client
+# 🤖 Groq (via the shared async LLM gateway)
 # -------------------------------
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     print("⚠️ Warning: GROQ_API_KEY not found in environment.")
-client = Groq(api_key=GROQ_API_KEY)
+DOUBT_MODEL = "llama-3.3-70b-versatile"  # ⚡ You can replace this model if desired
 
 # -------------------------------
 # 📧 Email Notification Helper (Safe)
@@ -48,64 +51,84 @@ async def send_doubt_email(user_email: str, topic: str, response: str):
     except Exception as e:
         print(f"⚠️ Email skipped: {e}")
 
+# -------------------------------
+# 🧾 Persist + notify
+# -------------------------------
+def record_clarification(user_email: str, question: str, clarification: str, llm_calls: int) -> dict:
+    """Save the clarification, queue the email and remember it for paraphrases."""
+    if llm_calls:
+        semantic_cache.add("doubts", question, clarification)
+
+    # 🧾 Save the entry
+    entry = {
+        "email": user_email,
+        "topic": question,
+        "response": clarification,
+        "confidence": "AI-generated",
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+    # 📁 Full answer is archived once in the blob store (replaces the per-entry .txt)
+    entry_store.add("doubts", user_email, blob_store.offload(entry, "response", owner=user_email), llm_calls=llm_calls)
+
+    # 📧 Send async email
+    asyncio.create_task(send_doubt_email(user_email, question, clarification))
+
+    # ✅ Return structured response
+    return {
+        "topic": question,
+        "response": clarification,
+        "confidence": "High",
+        "timestamp": entry["timestamp"],
+    }
+
 # -------------------------------
 # 🧠 Report a Doubt (Groq-powered)
 # -------------------------------
 @router.post("/report")
-async def report_doubt(data: dict, current_user: dict = Depends(get_current_user)):
+async def report_doubt(data: dict, request: Request, current_user: dict = Depends(get_current_user)):
     """
     Logs a user's question/doubt and uses Groq AI to generate a clarification.
+    With Accept: text/event-stream the clarification is streamed as SSE.
     """
-    try:
-        question = data.get("question", "").strip()
-        if not question:
-            raise HTTPException(400, "Question cannot be empty.")
-
-        # 🔮 Generate Groq AI response
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",  # ⚡ You can replace this model if desired
-            messages=[
-                {"role": "system", "content": "You are AURA, an intelligent academic assistant who gives clear, structured answers to student doubts."},
-                {"role": "user", "content": f"Explain this concept in a simple and detailed way: {question}"}
-            ],
-            temperature=0.7,
-            max_tokens=400
+    question = data.get("question", "").strip()
+    if not question:
+        raise HTTPException(400, "Question cannot be empty.")
+
+    messages = [
+        {"role": "system", "content": "You are AURA, an intelligent academic assistant who gives clear, structured answers to student doubts."},
+        {"role": "user", "content": f"Explain this concept in a simple and detailed way: {question}"}
+    ]
+
+    # 🧲 A paraphrase of an earlier doubt reuses its clarification
+    cached = semantic_cache.lookup("doubts", question)
+    counter = CallCounter()   # exact-cache hits don't count as LLM calls either
+
+    # 📡 Tokens are forwarded as they arrive; saving + email run after the last one
+    if wants_sse(request):
+        deltas = single_delta(cached[0]) if cached else llm_gateway.stream_chat(
+            messages, model=DOUBT_MODEL, temperature=0.7, max_tokens=400, user=current_user["email"]
         )
+        return sse_response(stream_completion(
+            counter.track(deltas),
+            lambda clarification: record_clarification(current_user["email"], question, clarification, counter.calls)
+        ))
 
-        clarification = response.choices[0].message.content.strip() if response.choices else "No response generated."
-
-        # 🧾 Save the entry
-        entry = {
-            "email": current_user["email"],
-            "topic": question,
-            "response": clarification,
-            "confidence": "AI-generated",
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            data_log = json.load(f)
-            data_log.append(entry)
-            f.seek(0)
-            json.dump(data_log, f, indent=2)
-
-        # 📁 Optional text file log
-        txt_file = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{current_user['email'].replace('@','_')}.txt"
-        with open(os.path.join(SAVE_DIR, txt_file), "w", encoding="utf-8") as f:
-            f.write(f"User: {current_user['email']}\n")
-            f.write(f"Topic: {question}\n\n")
-            f.write(f"Response:\n{clarification}")
-
-        # 📧 Send async email
-        asyncio.create_task(send_doubt_email(current_user["email"], question, clarification))
-
-        # ✅ Return structured response
-        return {
-            "topic": question,
-            "response": clarification,
-            "confidence": "High",
-            "timestamp": entry["timestamp"],
-        }
+    try:
+        if cached:
+            clarification = cached[0]
+        else:
+            # 🔮 Generate Groq AI response
+            with counter:
+                clarification = await llm_gateway.chat(
+                    messages,
+                    model=DOUBT_MODEL,
+                    temperature=0.7,
+                    max_tokens=400,
+                    user=current_user["email"],
+                )
+
+        return record_clarification(current_user["email"], question, clarification, counter.calls)
 
     except Exception as e:
         print(f"❌ Groq doubt generation error: {e}")
@@ -120,18 +143,15 @@ async def save_doubt(entry: dict, current_user: dict = Depends(get_current_user)
     try:
         entry["email"] = current_user["email"]
         entry["timestamp"] = datetime.utcnow().isoformat()
+        response = entry.get("response", "No response available")
 
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            data = json.load(f)
-            data.append(entry)
-            f.seek(0)
-            json.dump(data, f, indent=2)
+        entry_store.add("doubts", current_user["email"], blob_store.offload(entry, "response", owner=current_user["email"]))
 
         asyncio.create_task(
             send_doubt_email(
                 current_user["email"],
                 entry.get("topic", "Unknown Topic"),
-                entry.get("response", "No response available"),
+                response,
             )
         )
 
@@ -143,13 +163,11 @@ async def save_doubt(entry: dict, current_user: dict = Depends(get_current_user)
 # 📜 History
 # -------------------------------
 @router.get("/history")
-async def get_doubt_history(current_user: dict = Depends(get_current_user)):
+async def get_doubt_history(current_user: dict = Depends(get_current_user), page: PageParams = Depends(page_params)):
     """Retrieve saved doubts for the current user."""
     try:
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-        user_data = [d for d in all_data if d["email"] == current_user["email"]]
-        user_data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        return {"entries": user_data}
+        if page.stream:
+            return ndjson_response(entry_store.iter_for_user("doubts", current_user["email"], page))
+        return entry_store.page_for_user("doubts", current_user["email"], page)
     except Exception as e:
         raise HTTPException(500, f"Failed to load saved doubts: {e}")
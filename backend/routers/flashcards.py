@@ -8,9 +8,13 @@ from rake_nltk import Rake
 from sumy.parsers.plaintext import PlaintextParser
 from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.luhn import LuhnSummarizer
-from groq import Groq
+from backend.services import entry_store, blob_store
+from backend.services.llm_gateway import llm_gateway, CallCounter
+from backend.utils.chunker import chunk_text
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
 import nltk
-import os, re, json, asyncio, traceback
+import os, re, json, math, asyncio, traceback
 from datetime import datetime
 from typing import List
 
@@ -32,8 +36,8 @@ for resource in ["stopwords", "punkt", "punkt_tab"]:
 # ✅ Groq Setup
 # -------------------------------------------
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
 GROQ_MODEL = "llama-3.1-70b-versatile"  # ✅ stable model name
+AI_MAX_CHUNKS = 3  # parts of the document the AI fallback draws cards from
 
 # -------------------------------------------
 # 📁 Storage Setup
@@ -44,9 +48,7 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 SAVE_FILE = os.path.join(SAVE_DIR, "saved_flashcards.json")
-if not os.path.exists(SAVE_FILE):
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("flashcards", SAVE_FILE)
 
 # -------------------------------------------
 # 📧 Email Helper
@@ -105,6 +107,26 @@ def _keyword_phrases(text: str, topn: int = 30):
 def _make_cloze(sentence: str, term: str):
     return re.sub(re.escape(term), "____", sentence, flags=re.IGNORECASE)
 
+async def _ai_flashcards(chunk: str, count: int, email: str) -> str:
+    prompt = f"""
+    Generate {count} educational flashcards (Q&A pairs) from this text:
+    {chunk}
+
+    Format strictly as:
+    Q: <question> | A: <answer>
+    """
+    return await llm_gateway.chat(
+        model=GROQ_MODEL,
+        messages=[
+            {"role": "system", "content": "You generate educational flashcards."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.6,
+        max_tokens=1000,
+        priority="batch",
+        user=email,
+    )
+
 # -------------------------------------------
 # ⚙️ Generate Flashcards (NLP + Groq)
 # -------------------------------------------
@@ -135,6 +157,7 @@ async def generate_flashcards(req: FlashcardRequest, current_user: dict = Depend
         phrases = _keyword_phrases(summarized, topn=num_cards * 2)
         sentences = re.split(r"[.!?]\s+", summarized)
         cards: List[Flashcard] = []
+        counter = CallCounter()   # only completions that really went upstream
 
         for term in phrases:
             for s in sentences:
@@ -145,30 +168,24 @@ async def generate_flashcards(req: FlashcardRequest, current_user: dict = Depend
                 break
 
         # Step 3. Fallback: Groq AI
-        if len(cards) == 0 and client:
+        if len(cards) == 0 and GROQ_API_KEY:
             print("⚙️ Falling back to Groq AI...")
-            prompt = f"""
-            Generate {num_cards} educational flashcards (Q&A pairs) from this text:
-            {text[:4000]}
-
-            Format strictly as:
-            Q: <question> | A: <answer>
-            """
-
-            try:
-                res = client.chat.completions.create(
-                    model=GROQ_MODEL,
-                    messages=[
-                        {"role": "system", "content": "You generate educational flashcards."},
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0.6,
-                    max_tokens=1000,
+            # Whole-sentence chunks spread over the document instead of its first 4000 chars
+            chunks = list(chunk_text(text, GROQ_MODEL))
+            step = max(1, math.ceil(len(chunks) / AI_MAX_CHUNKS))
+            picked = chunks[::step][:AI_MAX_CHUNKS]
+            per_chunk = math.ceil(num_cards / len(picked))
+
+            with counter:
+                outputs = await asyncio.gather(
+                    *(_ai_flashcards(chunk, per_chunk, current_user["email"]) for chunk in picked),
+                    return_exceptions=True,
                 )
-
-                output = res.choices[0].message.content.strip()
+            for output in outputs:
+                if isinstance(output, Exception):
+                    print("❌ Groq API error:", output)
+                    continue
                 print("🤖 Groq output sample:", output[:250])
-
                 for line in output.split("\n"):
                     if "Q:" in line and "A:" in line:
                         parts = line.split("|")
@@ -180,11 +197,7 @@ async def generate_flashcards(req: FlashcardRequest, current_user: dict = Depend
                     if len(cards) >= num_cards:
                         break
 
-                print(f"✅ Groq generated {len(cards)} flashcards")
-
-            except Exception as e:
-                print("❌ Groq API error:", e)
-                traceback.print_exc()
+            print(f"✅ Groq generated {len(cards)} flashcards")
 
         # Step 4. Guaranteed fallback
         if len(cards) == 0:
@@ -199,11 +212,7 @@ async def generate_flashcards(req: FlashcardRequest, current_user: dict = Depend
             "timestamp": datetime.utcnow().isoformat(),
         }
 
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            data = json.load(f)
-            data.append(entry)
-            f.seek(0)
-            json.dump(data, f, indent=2)
+        entry_store.add("flashcards", current_user["email"], blob_store.offload(entry, "metadata.cards", owner=current_user["email"]), llm_calls=counter.calls)
 
         asyncio.create_task(send_flashcard_email(current_user["email"], source, len(cards)))
         print(f"💾 Saved {len(cards)} flashcards for {current_user['email']}")
@@ -218,16 +227,14 @@ async def generate_flashcards(req: FlashcardRequest, current_user: dict = Depend
 # 📚 Fetch User’s Flashcards
 # -------------------------------------------
 @router.get("/saved")
-async def get_saved_flashcards(current_user: dict = Depends(get_current_user)):
-    with open(SAVE_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    user_cards = [d for d in data if d.get("email") == current_user["email"]]
-    user_cards.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    return {"entries": user_cards}
+async def get_saved_flashcards(current_user: dict = Depends(get_current_user), page: PageParams = Depends(page_params)):
+    if page.stream:
+        return ndjson_response(entry_store.iter_for_user("flashcards", current_user["email"], page))
+    return entry_store.page_for_user("flashcards", current_user["email"], page)
 
 @router.get("/notes/list/flashcards")
-async def get_flashcards_alias(current_user: dict = Depends(get_current_user)):
-    return await get_saved_flashcards(current_user)
+async def get_flashcards_alias(current_user: dict = Depends(get_current_user), page: PageParams = Depends(page_params)):
+    return await get_saved_flashcards(current_user, page)
 # -------------------------------------------
 # 💾 Save Flashcards (Manual Save from Frontend)
 # -------------------------------------------
@@ -260,12 +267,8 @@ async def save_flashcards(data: dict, current_user: dict = Depends(get_current_u
             "timestamp": datetime.utcnow().isoformat(),
         }
 
-        # ✅ Save to master JSON
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            data_log = json.load(f)
-            data_log.append(entry)
-            f.seek(0)
-            json.dump(data_log, f, indent=2)
+        # ✅ Save to the store (the deck itself goes to the blob store)
+        entry_store.add("flashcards", current_user["email"], blob_store.offload(entry, "flashcards", owner=current_user["email"]))
 
         # ✅ Also save a readable text version
         backup_path = os.path.join(
@@ -4,6 +4,9 @@ from backend.models.schemas import FocusEvent, FocusSuggestResponse
 from backend.routers.auth import get_current_user
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
 from datetime import datetime
 import os, json, asyncio, statistics, time
 
@@ -27,10 +30,7 @@ BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SAVE_DIR = os.path.join(BACKEND_ROOT, "saved_files", "focus_sessions")
 os.makedirs(SAVE_DIR, exist_ok=True)
 SAVE_FILE = os.path.join(SAVE_DIR, "saved_focus.json")
-
-if not os.path.exists(SAVE_FILE):
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("focus", SAVE_FILE)
 
 LATEST_FOCUS_CACHE = {
     "focused": True,
@@ -125,11 +125,7 @@ def save_focus_result(result: dict, user_email: str):
         "message": result.get("message", ""),
         "timestamp": datetime.utcnow().isoformat(),
     }
-    with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-        data = json.load(f)
-        data.append(entry)
-        f.seek(0)
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    entry_store.add("focus", user_email, entry)
     print(f"✅ Focus session saved for {user_email}")
 
 # ======================================================
@@ -205,16 +201,15 @@ async def get_pomodoro_plan(current_user: Optional[dict] = Depends(get_current_u
 
 
 @router.get("/saved")
-async def get_saved_focus(current_user: Optional[dict] = Depends(get_current_user)):
-    """Return saved focus sessions."""
+async def get_saved_focus(
+    current_user: Optional[dict] = Depends(get_current_user),
+    page: PageParams = Depends(page_params),
+):
+    """Return saved focus sessions (paged with ?limit=&cursor=&since=&until=)."""
     user_email = current_user.get("email") if current_user else "guest@aura.ai"
-    if not os.path.exists(SAVE_FILE):
-        return {"entries": []}
-    with open(SAVE_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    user_data = [d for d in data if d.get("email") == user_email]
-    user_data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    return {"entries": user_data}
+    if page.stream:
+        return ndjson_response(entry_store.iter_for_user("focus", user_email, page))
+    return entry_store.page_for_user("focus", user_email, page)
 
 
 @router.get("/status")
@@ -225,10 +220,7 @@ async def get_agent_status():
 @router.get("/latest")
 async def get_latest_focus():
     """Return the most recent focus result."""
-    if os.path.exists(SAVE_FILE):
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if data:
-            latest = data[-1]
-            LATEST_FOCUS_CACHE.update(latest)
+    latest = entry_store.latest("focus")
+    if latest:
+        LATEST_FOCUS_CACHE.update(latest)
     return LATEST_FOCUS_CACHE
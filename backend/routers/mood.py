@@ -3,6 +3,9 @@ from pydantic import BaseModel
 from backend.routers.auth import get_current_user
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
 from deepface import DeepFace
 from datetime import datetime
 import shutil, os, json, asyncio
@@ -16,9 +19,7 @@ SAVE_DIR = os.path.join("saved_files", "mood_logs")
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 SAVE_FILE = os.path.join(SAVE_DIR, "mood_log.json")
-if not os.path.exists(SAVE_FILE):
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("mood", SAVE_FILE)
 
 # ----------------------------
 # 🧠 Model Definition
@@ -105,11 +106,7 @@ async def log_mood(entry: MoodEntry, current_user: dict = Depends(get_current_us
             "timestamp": timestamp_str,
         }
 
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            data = json.load(f)
-            data.append(log_entry)
-            f.seek(0)
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        entry_store.add("mood", current_user["email"], log_entry)
 
         # Send async email summary
         asyncio.create_task(send_mood_email(current_user["email"], entry.mood, entry.emoji, entry.note))
@@ -125,19 +122,12 @@ async def log_mood(entry: MoodEntry, current_user: dict = Depends(get_current_us
 # 📜 Fetch User Mood Logs
 # ----------------------------
 @router.get("/logs")
-async def get_mood_logs(current_user: dict = Depends(get_current_user)):
+async def get_mood_logs(current_user: dict = Depends(get_current_user), page: PageParams = Depends(page_params)):
     """Fetch all saved mood logs for the logged-in user."""
     try:
-        if not os.path.exists(SAVE_FILE):
-            return {"entries": []}
-
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            all_logs = json.load(f)
-
-        user_logs = [log for log in all_logs if log.get("email") == current_user["email"]]
-        user_logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return {"entries": user_logs}
+        if page.stream:
+            return ndjson_response(entry_store.iter_for_user("mood", current_user["email"], page))
+        return entry_store.page_for_user("mood", current_user["email"], page)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read logs: {str(e)}")
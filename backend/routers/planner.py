@@ -5,8 +5,13 @@ from backend.services.scheduler import schedule_task, schedule_daily_summary
 from backend.routers.auth import get_current_user
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+from backend.utils.serializer import dump_file
+from backend.utils.jsonl_store import init_store
 from datetime import datetime
-import os, json, asyncio
+import os, asyncio
 
 router = APIRouter(prefix="/planner", tags=["Planner"])
 
@@ -17,12 +22,8 @@ SAVE_DIR = os.path.join("saved_files", "planner_schedules")
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 SAVE_FILE = os.path.join(SAVE_DIR, "planner_log.json")
-TASKS_FILE = os.path.join(SAVE_DIR, "tasks.json")
-
-for f in [SAVE_FILE, TASKS_FILE]:
-    if not os.path.exists(f):
-        with open(f, "w", encoding="utf-8") as file:
-            json.dump([], file, indent=2)
+entry_store.import_legacy("planner", SAVE_FILE)
+TASKS_FILE = init_store(os.path.join(SAVE_DIR, "tasks.json"))
 
 
 # =====================================================================
@@ -130,19 +131,14 @@ async def save_plan(data: dict, current_user: dict = Depends(get_current_user)):
         }
 
         # Save log
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            logs = json.load(f)
-            logs.append(entry)
-            f.seek(0)
-            json.dump(logs, f, indent=2)
+        entry_store.add("planner", current_user["email"], entry)
 
         # Write backup file
         file_name = (
             f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_"
             f"{current_user['email'].replace('@','_')}.json"
         )
-        with open(os.path.join(SAVE_DIR, file_name), "w", encoding="utf-8") as f:
-            json.dump(entry, f, indent=2)
+        dump_file(os.path.join(SAVE_DIR, file_name), entry)
 
         # ================================
         # ⭐ Schedule task reminders + daily summaries
@@ -187,15 +183,11 @@ async def save_plan(data: dict, current_user: dict = Depends(get_current_user)):
 # 📂 Fetch Saved Plans
 # =====================================================================
 @router.get("/saved")
-async def get_saved_plans(current_user: dict = Depends(get_current_user)):
+async def get_saved_plans(current_user: dict = Depends(get_current_user), page: PageParams = Depends(page_params)):
     try:
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        user_plans = [d for d in data if d.get("email") == current_user["email"]]
-        user_plans.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return {"entries": user_plans}
+        if page.stream:
+            return ndjson_response(entry_store.iter_for_user("planner", current_user["email"], page))
+        return entry_store.page_for_user("planner", current_user["email"], page)
 
     except Exception as e:
         raise HTTPException(500, f"Failed to load saved plans: {e}")
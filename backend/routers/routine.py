@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from backend.routers.auth import get_current_user
 import os, json
+from backend.utils.file_cache import load_json, write_json
 
 router = APIRouter(prefix="/routine", tags=["Routine"])
 
@@ -24,8 +25,7 @@ def user_routine_path(email: str):
 def save_user_routine(req: RoutineRequest, current_user=Depends(get_current_user)):
     path = user_routine_path(current_user)
     
-    with open(path, "w") as f:
-        json.dump(req.dict(), f, indent=2)
+    write_json(path, req.dict())
     
     return {"ok": True, "saved": True}
 
@@ -34,8 +34,4 @@ def save_user_routine(req: RoutineRequest, current_user=Depends(get_current_user
 def load_user_routine(current_user=Depends(get_current_user)):
     path = user_routine_path(current_user)
 
-    if not os.path.exists(path):
-        return {"items": []}
-
-    with open(path, "r") as f:
-        return json.load(f)
+    return load_json(path, {"items": []})
@@ -0,0 +1,27 @@
+import time
+from fastapi import APIRouter, Depends, Query
+from backend.routers.auth import get_current_user
+from backend.services import search_index
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# -------------------------------
+# 🔎 Search your own notes, doubts, explanations and chats
+# -------------------------------
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, description="Search terms"),
+    limit: int = Query(20, ge=1, le=100),
+    modules: str | None = Query(None, description="Comma-separated subset of autonote,doubts,confusion,chatbot"),
+    current_user: dict = Depends(get_current_user),
+):
+    """BM25-ranked matches from the logged-in user's saved entries."""
+    start = time.perf_counter()
+    wanted = {m.strip() for m in modules.split(",") if m.strip()} if modules else None
+    results = search_index.search(current_user["email"], q, limit, wanted)
+    return {
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
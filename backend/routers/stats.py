@@ -0,0 +1,38 @@
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, Query
+from backend.routers.auth import get_current_user
+from backend.services import rollups
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+def _empty_day(day: str) -> dict:
+    return {"day": day, "entries": 0, "modules": {}, "llm_calls": 0,
+            "flashcards": 0, "avg_attention": None, "moods": {}}
+
+
+# -------------------------------
+# 📈 Per-user daily activity (served from rollups)
+# -------------------------------
+@router.get("/daily")
+async def daily_stats(
+    days: int = Query(30, ge=1, le=3650),
+    start: date | None = Query(None, description="First day (defaults to today - days + 1)"),
+    end: date | None = Query(None, description="Last day, inclusive (defaults to today)"),
+    current_user: dict = Depends(get_current_user),
+):
+    """Per-day counts per module, avg focus attention, moods, LLM calls and flashcards."""
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=days - 1)
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "days": rollups.user_days(current_user["email"], start.isoformat(), end.isoformat()),
+    }
+
+
+@router.get("/daily/{day}")
+async def day_stats(day: date, current_user: dict = Depends(get_current_user)):
+    """One day's bucket for the logged-in user."""
+    found = rollups.user_days(current_user["email"], day.isoformat(), day.isoformat())
+    return found[0] if found else _empty_day(day.isoformat())
@@ -0,0 +1,41 @@
+from dataclasses import replace
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from backend.routers.auth import get_current_user
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+
+router = APIRouter(prefix="/timeline", tags=["Timeline"])
+
+# Every module that saves per-user entries
+TIMELINE_MODULES = (
+    "autonote", "braindump", "calendar", "chatbot", "confusion", "distraction",
+    "doubts", "flashcards", "focus", "mood", "planner", "timepredict",
+)
+DEFAULT_PAGE_SIZE = 50
+
+
+# -------------------------------
+# 🧵 One newest-first stream across all modules
+# -------------------------------
+@router.get("")
+async def user_timeline(
+    modules: str | None = Query(None, description="Comma-separated module filter (default: all)"),
+    current_user: dict = Depends(get_current_user),
+    page: PageParams = Depends(page_params),
+):
+    """Merged history of the logged-in user (paged with ?limit=&cursor=&since=&until=; ?expand=true inlines offloaded fields)."""
+    wanted = TIMELINE_MODULES
+    if modules:
+        wanted = tuple(m.strip() for m in modules.split(",") if m.strip())
+        unknown = set(wanted) - set(TIMELINE_MODULES)
+        if unknown:
+            raise HTTPException(400, f"Unknown module(s): {', '.join(sorted(unknown))}")
+
+    if page.stream:
+        return ndjson_response(entry_store.iter_timeline(current_user["email"], wanted, page))
+    if not page.limit:
+        page = replace(page, limit=DEFAULT_PAGE_SIZE)
+    # SQLite work (and waiting for a pooled connection) stays off the event loop
+    return await run_in_threadpool(entry_store.timeline_page, current_user["email"], wanted, page)
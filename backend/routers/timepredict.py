@@ -5,8 +5,12 @@ from backend.routers.auth import get_current_user
 from backend.models.user import User
 from fastapi_mail import FastMail, MessageSchema
 from backend.services.mail_config import conf
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, page_params
+from backend.utils.ndjson import ndjson_response
+from backend.utils.serializer import dump_file
 from datetime import datetime, timedelta
-import os, json, asyncio
+import os, asyncio
 
 router = APIRouter(prefix="/timepredict", tags=["StudyTime Predictor"])
 
@@ -17,9 +21,7 @@ SAVE_DIR = os.path.join("saved_files", "timepredict_logs")
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 SAVE_FILE = os.path.join(SAVE_DIR, "timepredict_master.json")
-if not os.path.exists(SAVE_FILE):
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2)
+entry_store.import_legacy("timepredict", SAVE_FILE)
 
 
 # -------------------------------
@@ -59,16 +61,11 @@ async def predict_time(req: TimePredictRequest, current_user: User = Depends(get
         }
 
         # Save to global log
-        with open(SAVE_FILE, "r+", encoding="utf-8") as f:
-            data = json.load(f)
-            data.append(entry)
-            f.seek(0)
-            json.dump(data, f, indent=2)
+        entry_store.add("timepredict", current_user.email, entry)
 
         # Save individual file
         file_name = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{current_user.email.replace('@','_')}.json"
-        with open(os.path.join(SAVE_DIR, file_name), "w", encoding="utf-8") as f:
-            json.dump(entry, f, indent=2)
+        dump_file(os.path.join(SAVE_DIR, file_name), entry)
 
         # ✅ Email summary
         asyncio.create_task(send_prediction_email(
@@ -94,14 +91,10 @@ async def notify_upcoming_end(current_user: User = Depends(get_current_user)):
     The frontend can call this endpoint every few minutes to schedule notifications.
     """
     try:
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        user_entries = [d for d in data if d["email"] == current_user.email]
-        if not user_entries:
+        latest = entry_store.latest_for_user("timepredict", current_user.email)
+        if not latest:
             return {"notify": False}
 
-        latest = user_entries[-1]
         start_time = datetime.fromisoformat(latest["timestamp"])
         predicted_duration = timedelta(hours=float(latest["predicted_time"]))
         end_time = start_time + predicted_duration
@@ -119,21 +112,17 @@ async def notify_upcoming_end(current_user: User = Depends(get_current_user)):
 # 📜 Saved Predictions (Per User)
 # -------------------------------
 @router.get("/saved")
-async def get_saved_timepredict(current_user: User = Depends(get_current_user)):
+async def get_saved_timepredict(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
     """✅ Return saved time predictions for the logged-in user."""
     try:
-        with open(SAVE_FILE, "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-
-        user_data = [entry for entry in all_data if entry["email"] == current_user.email]
-        user_data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return {"entries": user_data}
+        if page.stream:
+            return ndjson_response(entry_store.iter_for_user("timepredict", current_user.email, page))
+        return entry_store.page_for_user("timepredict", current_user.email, page)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load predictions: {e}")
 
 
 # ✅ Frontend compatibility alias
 @router.get("/notes/list/timepredict")
-async def get_timepredict_alias(current_user: User = Depends(get_current_user)):
-    return await get_saved_timepredict(current_user)
+async def get_timepredict_alias(current_user: User = Depends(get_current_user), page: PageParams = Depends(page_params)):
+    return await get_saved_timepredict(current_user, page)
@@ -0,0 +1,186 @@
+import os, hashlib, threading
+from sqlalchemy import select, inspect
+from sqlalchemy.dialects.sqlite import insert
+from backend.database import SessionLocal, engine
+from backend.models.entry import BlobOwner
+from backend.utils.serializer import dumps, loads, copy
+
+try:
+    import zstandard as zstd  # optional: blobs are stored uncompressed without it
+except ImportError:
+    zstd = None
+
+# ======================================================
+# 🧱 Content-addressed blob store
+# ======================================================
+# saved_data/blobs/ab/abcdef...      raw bytes
+# saved_data/blobs/ab/abcdef....zst  zstd-compressed bytes
+# The SHA-256 of the *uncompressed* content is the key, so identical
+# transcripts / answers are stored once no matter how often they are saved.
+BLOB_DIR = os.path.join("saved_data", "blobs")
+BLOB_INLINE_BYTES = int(os.getenv("AURA_BLOB_INLINE_BYTES", "2048"))
+BLOB_PREVIEW_CHARS = int(os.getenv("AURA_BLOB_PREVIEW_CHARS", "280"))
+BLOB_ZSTD_LEVEL = int(os.getenv("AURA_BLOB_ZSTD_LEVEL", "3"))
+
+_LOCK = threading.Lock()
+
+# Who may fetch a blob through /blobs: recorded whenever it is offloaded for a user
+_NEW_OWNER_TABLE = not inspect(engine).has_table(BlobOwner.__tablename__)
+BlobOwner.__table__.create(bind=engine, checkfirst=True)
+
+
+class BlobNotFound(KeyError):
+    pass
+
+
+def _path(sha256: str) -> str:
+    return os.path.join(BLOB_DIR, sha256[:2], sha256)
+
+
+def _valid(sha256: str) -> bool:
+    return len(sha256) == 64 and all(c in "0123456789abcdef" for c in sha256)
+
+
+def _encode(value):
+    """Return (bytes, format) for a str or any JSON-serializable value."""
+    if isinstance(value, str):
+        return value.encode("utf-8"), "text"
+    return dumps(value), "json"
+
+
+# ======================================================
+# 📥 Put / 📤 Get
+# ======================================================
+def put(data: bytes) -> dict:
+    """Store bytes (deduplicated) and return {"sha256": ..., "size": ...}."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    ref = {"sha256": sha256, "size": len(data)}
+    path = _path(sha256)
+    if os.path.exists(path) or os.path.exists(path + ".zst"):
+        return ref
+
+    if zstd is not None:
+        payload, path = zstd.ZstdCompressor(level=BLOB_ZSTD_LEVEL).compress(data), path + ".zst"
+    else:
+        payload = data
+
+    with _LOCK:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    return ref
+
+
+def get(sha256: str) -> bytes:
+    """Return a blob's original bytes. Raises BlobNotFound."""
+    if not _valid(sha256):
+        raise BlobNotFound(sha256)
+    path = _path(sha256)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    if os.path.exists(path + ".zst"):
+        if zstd is None:
+            raise RuntimeError("zstandard is required to read compressed blobs")
+        with open(path + ".zst", "rb") as f:
+            return zstd.ZstdDecompressor().decompress(f.read())
+    raise BlobNotFound(sha256)
+
+
+def exists(sha256: str) -> bool:
+    path = _path(sha256)
+    return _valid(sha256) and (os.path.exists(path) or os.path.exists(path + ".zst"))
+
+
+# ======================================================
+# 🔑 Ownership (blobs are shared by content, access is per user)
+# ======================================================
+def claim(email: str, entry: dict, db=None):
+    """
+    Record email as an owner of every blob the entry references. With db,
+    the rows join the caller's transaction; otherwise they commit here.
+    """
+    shas = {ref["sha256"] for ref in (entry.get("blobs") or {}).values() if ref.get("sha256")}
+    if email is None or not shas:
+        return
+    stmt = insert(BlobOwner).values([{"sha256": sha, "email": email} for sha in shas]).on_conflict_do_nothing()
+    if db is not None:
+        db.execute(stmt)
+        return
+    with SessionLocal() as session:
+        session.execute(stmt)
+        session.commit()
+
+
+def owns(email: str, sha256: str) -> bool:
+    """True if the blob was offloaded for this user."""
+    stmt = select(BlobOwner.sha256).where(BlobOwner.sha256 == sha256, BlobOwner.email == (email or ""))
+    with SessionLocal() as db:
+        return db.scalar(stmt) is not None
+
+
+def owner_table_is_new() -> bool:
+    """True on the first start with the blob_owners table (existing entries need a backfill)."""
+    return _NEW_OWNER_TABLE
+
+
+# ======================================================
+# 🪶 Entry helpers: keep indexes small, fetch bodies lazily
+# ======================================================
+def offload(entry: dict, *fields: str, owner: str = None) -> dict:
+    """
+    Move large fields of an entry into the blob store, in place.
+    Each offloaded field is recorded in entry["blobs"][field] as
+    {"sha256", "size", "format"}; text fields keep a short preview,
+    structured fields (lists / dicts) are removed. Dotted names reach
+    into nested dicts, e.g. "metadata.cards". owner (the user's email)
+    may then fetch the full bodies from /blobs.
+    """
+    for field in fields:
+        *parents, key = field.split(".")
+        holder = entry
+        for name in parents:
+            holder = holder.get(name) if isinstance(holder, dict) else None
+        if not isinstance(holder, dict) or holder.get(key) is None:
+            continue
+
+        data, fmt = _encode(holder[key])
+        if len(data) < BLOB_INLINE_BYTES:
+            continue
+
+        ref = put(data)
+        ref["format"] = fmt
+        entry.setdefault("blobs", {})[field] = ref
+        if fmt == "text":
+            holder[key] = holder[key][:BLOB_PREVIEW_CHARS].rstrip() + "…"
+        else:
+            del holder[key]
+    claim(owner, entry)
+    return entry
+
+
+def load(ref: dict):
+    """Return the value a blob reference points to (str for text, parsed JSON otherwise)."""
+    data = get(ref["sha256"])
+    return data.decode("utf-8") if ref.get("format", "text") == "text" else loads(data)
+
+
+def hydrate(entry: dict) -> dict:
+    """Return a copy of entry with every offloaded field restored in full."""
+    refs = entry.get("blobs") or {}
+    if not refs:
+        return entry
+    full = copy(entry)
+    for field, ref in refs.items():
+        *parents, key = field.split(".")
+        holder = full
+        for name in parents:
+            holder = holder.setdefault(name, {})
+        try:
+            holder[key] = load(ref)
+        except BlobNotFound:
+            print(f"⚠️ Missing blob {ref.get('sha256')} for field '{field}'")
+    full.pop("blobs", None)
+    return full
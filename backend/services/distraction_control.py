@@ -1,7 +1,7 @@
 # backend/services/distraction_control_simple.py
 import os
 import shutil
-import json
+from backend.utils.serializer import dump_file, load_file
 import psutil
 from datetime import datetime
 
@@ -13,15 +13,13 @@ KEYWORDS = ["discord", "spotify", "netflix", "whatsapp", "tiktok", "youtube", "s
 
 def _load_state():
     try:
-        with open(MANIFEST, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_file(MANIFEST)
     except Exception:
         return {"killed": [], "renamed": []}
 
 def _save_state(state):
     state["timestamp"] = datetime.utcnow().isoformat()
-    with open(MANIFEST, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+    dump_file(MANIFEST, state)
 
 def find_running_matches(keywords=None):
     keywords = keywords or KEYWORDS
@@ -1,9 +1,11 @@
 from typing import List
 from collections import Counter
 import json, os, time
-from groq import Groq
 from backend.models.schemas import DoubtEvent, DoubtReport
 from backend.utils.save_helper import save_entry
+from backend.utils.jsonl_store import init_store, append_record
+from backend.services import blob_store
+from backend.services.llm_gateway import llm_gateway, LLMError, LLMEmptyReply
 
 # ===================================
 # ⚙️ GROQ CONFIGURATION
@@ -12,14 +14,12 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise ValueError("❌ Missing GROQ_API_KEY environment variable. Please set it in your environment.")
 
-client = Groq(api_key=GROQ_API_KEY)
 MODEL_NAME = "llama-3.1-8b-instant"
 
 # ===================================
 # 💾 FILE PATHS
 # ===================================
-DOUBT_LOG_PATH = os.path.join("saved_data", "doubts", "saved_doubts.json")
-os.makedirs(os.path.dirname(DOUBT_LOG_PATH), exist_ok=True)
+DOUBT_LOG_PATH = init_store(os.path.join("saved_data", "doubts", "saved_doubts.json"))
 
 # 🧭 Event classification
 HARD_SIGNS = {"tab_switch", "rewind"}
@@ -29,14 +29,14 @@ SOFT_SIGNS = {"pause", "scroll_up"}
 # ===================================
 # 🧠 CALL GROQ LLM
 # ===================================
-def call_groq(question: str) -> str:
+async def call_groq(question: str) -> str:
     """
     Generate a clear, student-friendly explanation using Groq Cloud.
     Fallback text ensures stability even if the API fails.
     """
     try:
         start_time = time.time()
-        completion = client.chat.completions.create(
+        ai_answer = await llm_gateway.chat(
             model=MODEL_NAME,
             messages=[
                 {
@@ -49,22 +49,17 @@ def call_groq(question: str) -> str:
                 }
             ],
             temperature=0.6,
-            stream=True,
         )
 
-        ai_answer = ""
-        for chunk in completion:
-            ai_answer += chunk.choices[0].delta.content or ""
-
         duration = round(time.time() - start_time, 1)
         print(f"✅ Groq responded in {duration}s. Length={len(ai_answer)} chars")
 
-        if not ai_answer.strip():
-            return "🤖 No response generated. Please try rephrasing your question."
+        return ai_answer
 
-        return ai_answer.strip()
+    except LLMEmptyReply:
+        return "🤖 No response generated. Please try rephrasing your question."
 
-    except Exception as e:
+    except LLMError as e:
         return f"⚠️ Unable to reach Groq Cloud. ({e})"
 
 
@@ -94,21 +89,13 @@ def compute_confidence(events: List[DoubtEvent], ai_answer: str = "") -> float:
 # ===================================
 # 💾 SAVE TO LOCAL HISTORY
 # ===================================
-def save_to_history(entry: dict):
+def save_to_history(entry: dict, email: str = None):
     """
-    Save the doubt clarification entry to saved_data/doubts/saved_doubts.json
+    Append the doubt clarification entry to saved_data/doubts/saved_doubts.jsonl
+    (email, if known, may fetch the offloaded response from /blobs)
     """
     try:
-        if not os.path.exists(DOUBT_LOG_PATH):
-            with open(DOUBT_LOG_PATH, "w") as f:
-                json.dump([], f, indent=2)
-
-        with open(DOUBT_LOG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        data.append(entry)
-        with open(DOUBT_LOG_PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        append_record(DOUBT_LOG_PATH, blob_store.offload(entry, "response", owner=email))
 
         print(f"✅ Doubt saved locally: {entry.get('question', '')[:60]}")
 
@@ -119,10 +106,11 @@ def save_to_history(entry: dict):
 # ===================================
 # 🔍 MAIN ANALYZER
 # ===================================
-def report(events: List[DoubtEvent]) -> DoubtReport:
+async def report(events: List[DoubtEvent], email: str = None) -> DoubtReport:
     """
     Detect confusion patterns, generate Groq explanations,
-    compute heuristic confidence, and persist all results.
+    compute heuristic confidence, and persist all results
+    (email, if known, owns the offloaded explanation).
     """
     ctr = Counter(e.event for e in events)
     ctx = [e.context for e in events if e.context]
@@ -131,7 +119,7 @@ def report(events: List[DoubtEvent]) -> DoubtReport:
     question = ctx[-1] if ctx else "No valid question provided."
 
     # Generate AI explanation
-    ai_answer = call_groq(question)
+    ai_answer = await call_groq(question)
 
     # Compute heuristic confidence
     confidence = compute_confidence(events, ai_answer)
@@ -146,13 +134,13 @@ def report(events: List[DoubtEvent]) -> DoubtReport:
             module="doubts",
             title=f"Doubt Clarified: {question[:60]}",
             content=f"AI explained the concept with {confidence}% confidence.",
-            metadata={
+            metadata=blob_store.offload({
                 "confidence": confidence,
                 "events": [e.event for e in events],
                 "context": question,
                 "ai_answer": ai_answer,
                 "event_summary": dict(ctr),
-            },
+            }, "ai_answer", owner=email),
         )
     except Exception as e:
         print(f"⚠️ Failed to log doubt analysis: {e}")
@@ -164,6 +152,6 @@ def report(events: List[DoubtEvent]) -> DoubtReport:
         "confidence": f"{confidence}%",
         "response": ai_answer,
         "events": [e.event for e in events],
-    })
+    }, email)
 
     return DoubtReport(topics=topics, notes=notes)
@@ -0,0 +1,315 @@
+import os, heapq
+from dataclasses import replace
+from datetime import datetime
+from sqlalchemy import select, func, delete, tuple_
+from backend.database import SessionLocal, engine
+from backend.models.entry import SavedEntry
+from backend.utils.jsonl_store import migrate_array_file, iter_records
+from backend.utils.pagination import PageParams, encode_cursor
+from backend.utils.serializer import dumps_str, loads
+from backend.services import rollups, search_index, blob_store
+
+# ======================================================
+# 🗄️ Indexed store for every module's saved entries
+# ======================================================
+SavedEntry.__table__.create(bind=engine, checkfirst=True)
+
+# Timestamp formats used by older modules besides ISO-8601
+_LEGACY_TS_FORMATS = ("%Y-%m-%d_%H-%M-%S", "%Y%m%d_%H%M%S", "%Y%m%d%H%M%S")
+
+
+def normalize_timestamp(value) -> str:
+    """Return a sortable ISO-8601 string for any timestamp a module has written."""
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.utcfromtimestamp(seconds).isoformat()
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value).isoformat()
+        except ValueError:
+            for fmt in _LEGACY_TS_FORMATS:
+                try:
+                    return datetime.strptime(value, fmt).isoformat()
+                except ValueError:
+                    continue
+    return datetime.utcnow().isoformat()
+
+
+def _row(module: str, email: str, entry: dict) -> SavedEntry:
+    return SavedEntry(
+        module=module,
+        email=email or "",
+        timestamp=normalize_timestamp(entry.get("timestamp")),
+        data=dumps_str(entry),
+    )
+
+
+# ======================================================
+# ✍️ Writes
+# ======================================================
+def add(module: str, email: str, entry: dict, llm_calls: int = 0) -> dict:
+    """Persist one entry for a user (and its daily rollup) and return it."""
+    row = _row(module, email, entry)
+    with SessionLocal() as db:
+        db.add(row)
+        db.flush()  # assigns row.id for the search index
+        rollups.record(db, module, row.email, row.timestamp[:10], entry, llm_calls)
+        search_index.index(db, row.id, module, row.email, entry)
+        blob_store.claim(row.email, entry, db)   # also covers entries offloaded without an owner
+        db.commit()
+    return entry
+
+
+def delete_for_user(module: str, email: str) -> int:
+    """Delete all of a user's entries for a module. Returns the number removed."""
+    filters = [SavedEntry.module == module, SavedEntry.email == (email or "")]
+    with SessionLocal() as db:
+        # Rollups need the deleted entries' own contributions (attention, cards, moods)
+        deleted = db.execute(select(SavedEntry.timestamp, SavedEntry.data).where(*filters)).all()
+        if module in search_index.SEARCH_FIELDS:
+            search_index.forget(db, db.scalars(select(SavedEntry.id).where(*filters)).all())
+        result = db.execute(delete(SavedEntry).where(*filters))
+        rollups.forget(db, module, email, deleted)
+        db.commit()
+        return result.rowcount
+
+
+# ======================================================
+# 📖 Reads (all served by the composite indexes)
+# ======================================================
+# Lists, pages and streams stay lean: offloaded fields come back as previews
+# plus blobs[field] refs (fetched lazily from /blobs). Single-entry reads, and
+# pages requested with ?expand=true (PageParams.expand), inline them in full.
+def _entry(data: str, hydrate: bool = False) -> dict:
+    entry = loads(data)
+    return blob_store.hydrate(entry) if hydrate else entry
+
+
+def _line(data: str, hydrate: bool = False) -> str:
+    # Stored data is already one line of JSON: only re-serialized when it has blobs to inline
+    if hydrate and '"blobs"' in data:
+        return dumps_str(blob_store.hydrate(loads(data)))
+    return data
+
+
+def latest_for_user(module: str, email: str):
+    """Return a user's most recent entry for a module (or None)."""
+    stmt = (
+        select(SavedEntry.data)
+        .where(SavedEntry.module == module, SavedEntry.email == (email or ""))
+        .order_by(SavedEntry.timestamp.desc(), SavedEntry.id.desc())
+        .limit(1)
+    )
+    with SessionLocal() as db:
+        data = db.scalars(stmt).first()
+    return _entry(data, hydrate=True) if data else None
+
+
+def count_for_user(module: str, email: str) -> int:
+    """Count a user's entries for a module."""
+    stmt = select(func.count()).select_from(SavedEntry).where(
+        SavedEntry.module == module, SavedEntry.email == (email or "")
+    )
+    with SessionLocal() as db:
+        return db.scalar(stmt) or 0
+
+
+def latest(module: str):
+    """Return the most recent entry of a module across users (or None)."""
+    stmt = (
+        select(SavedEntry.data)
+        .where(SavedEntry.module == module)
+        .order_by(SavedEntry.timestamp.desc(), SavedEntry.id.desc())
+        .limit(1)
+    )
+    with SessionLocal() as db:
+        data = db.scalars(stmt).first()
+    return _entry(data, hydrate=True) if data else None
+
+
+# ======================================================
+# 📄 Keyset pages (cost is O(page size), not O(history))
+# ======================================================
+def _select(filters: list, page: PageParams):
+    stmt = select(SavedEntry.id, SavedEntry.timestamp, SavedEntry.data).where(*filters)
+    if page.since:
+        stmt = stmt.where(SavedEntry.timestamp >= page.since)
+    if page.until:
+        stmt = stmt.where(SavedEntry.timestamp < page.until)
+    if page.cursor:
+        stmt = stmt.where(tuple_(SavedEntry.timestamp, SavedEntry.id) < tuple_(*page.cursor))
+    return stmt.order_by(SavedEntry.timestamp.desc(), SavedEntry.id.desc())
+
+
+def _page(filters: list, page: PageParams) -> dict:
+    page = page or PageParams()
+    stmt = _select(filters, page)
+    if page.limit:
+        # One extra row tells us whether another page exists
+        stmt = stmt.limit(page.limit + 1)
+
+    with SessionLocal() as db:
+        rows = db.execute(stmt).all()
+
+    next_cursor = None
+    if page.limit and len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return {"entries": [_entry(r.data, page.expand) for r in rows], "next_cursor": next_cursor}
+
+
+def page_for_user(module: str, email: str, page: PageParams = None) -> dict:
+    """One newest-first page of a user's entries: {"entries": [...], "next_cursor": ...}."""
+    return _page([SavedEntry.module == module, SavedEntry.email == (email or "")], page)
+
+
+def page_module(module: str, page: PageParams = None) -> dict:
+    """One newest-first page of a module's entries across users."""
+    return _page([SavedEntry.module == module], page)
+
+
+# ======================================================
+# 🌊 Streaming reads (constant memory, for NDJSON exports)
+# ======================================================
+STREAM_BATCH_ROWS = 500
+
+
+def _iter_rows(filters: list, page: PageParams):
+    page = page or PageParams()
+    stmt = _select(filters, page)
+    if page.limit:
+        stmt = stmt.limit(page.limit)
+    batch = min(page.limit or STREAM_BATCH_ROWS, STREAM_BATCH_ROWS)
+    with SessionLocal() as db:
+        yield from db.execute(stmt.execution_options(yield_per=batch))
+
+
+def _iter(filters: list, page: PageParams):
+    page = page or PageParams()
+    for row in _iter_rows(filters, page):
+        yield _line(row.data, page.expand)
+
+
+def iter_for_user(module: str, email: str, page: PageParams = None):
+    """Yield a user's entries newest first as JSON strings, fetched in batches."""
+    return _iter([SavedEntry.module == module, SavedEntry.email == (email or "")], page)
+
+
+def iter_module(module: str, page: PageParams = None):
+    """Yield a module's entries across users newest first as JSON strings."""
+    return _iter([SavedEntry.module == module], page)
+
+
+# ======================================================
+# 🧵 Cross-module timeline (heap-based k-way merge)
+# ======================================================
+def _keyset_batches(db, module: str, email: str, page: PageParams):
+    """
+    (module, row) newest first for one module, read in keyset batches on the
+    caller's session. Each batch is fetched whole, so k streams share one
+    connection without holding k cursors open.
+    """
+    filters = [SavedEntry.module == module, SavedEntry.email == (email or "")]
+    batch = min(page.limit or STREAM_BATCH_ROWS, STREAM_BATCH_ROWS)
+    cursor, left = page.cursor, page.limit
+    while left is None or left > 0:
+        size = batch if left is None else min(batch, left)
+        rows = db.execute(_select(filters, replace(page, cursor=cursor)).limit(size)).all()
+        for row in rows:
+            yield module, row
+        if len(rows) < size:
+            return
+        cursor = (rows[-1].timestamp, rows[-1].id)
+        left = None if left is None else left - len(rows)
+
+
+def merge_for_user(email: str, modules, page: PageParams = None):
+    """
+    Lazily merge a user's per-module streams into one newest-first stream of
+    (module, row). Each module is its own index-ordered keyset query, so only
+    the rows actually consumed are read: O(n log k) for n rows over k modules.
+    All k queries run on one pooled connection.
+    """
+    page = page or PageParams()
+    with SessionLocal() as db:
+        streams = [_keyset_batches(db, module, email, page) for module in modules]
+        try:
+            yield from heapq.merge(*streams, key=lambda item: (item[1].timestamp, item[1].id), reverse=True)
+        finally:
+            for stream in streams:
+                stream.close()
+
+
+def timeline_page(email: str, modules, page: PageParams) -> dict:
+    """One newest-first page across modules: {"entries": [{"module", "entry"}], "next_cursor"}."""
+    # Each module needs at most limit + 1 rows (the extra one detects a next page)
+    probe = replace(page, limit=page.limit + 1)
+    merged = merge_for_user(email, modules, probe)
+    try:
+        rows = [item for _, item in zip(range(probe.limit), merged)]
+    finally:
+        merged.close()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_cursor(rows[-1][1].timestamp, rows[-1][1].id)
+    return {
+        "entries": [{"module": module, "entry": _entry(row.data, page.expand)} for module, row in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def iter_timeline(email: str, modules, page: PageParams = None):
+    """Yield merged timeline items as JSON strings ({"module", "entry"}) for NDJSON streams."""
+    page = page or PageParams()
+    for count, (module, row) in enumerate(merge_for_user(email, modules, page)):
+        if page.limit and count >= page.limit:
+            break
+        yield f'{{"module":{dumps_str(module)},"entry":{_line(row.data, page.expand)}}}'
+
+
+# ======================================================
+# 📦 One-shot import of the old per-module files
+# ======================================================
+def import_legacy(module: str, path: str) -> int:
+    """
+    Import a module's legacy JSON / JSONL file into the store, then rename it
+    to <name>.imported so it is never read (or imported) again.
+    """
+    source = migrate_array_file(path)
+    if not os.path.exists(source):
+        return 0
+
+    records = [r for r in iter_records(source) if isinstance(r, dict)]
+    rows = [_row(module, r.get("email", ""), r) for r in records]
+    if rows:
+        with SessionLocal() as db:
+            db.add_all(rows)
+            db.flush()
+            for row, record in zip(rows, records):
+                rollups.record(db, module, row.email, row.timestamp[:10], record)
+                search_index.index(db, row.id, module, row.email, record)
+                blob_store.claim(row.email, record, db)
+            db.commit()
+    os.replace(source, source + ".imported")
+    print(f"📦 Imported {len(rows)} {module} entries from {source}")
+    return len(rows)
+
+
+def backfill_blob_owners() -> int:
+    """Record blob owners for entries offloaded before the blob_owners table existed."""
+    stmt = select(SavedEntry.email, SavedEntry.data).where(SavedEntry.data.contains('"blobs"'))
+    count = 0
+    with SessionLocal() as db:
+        for email, data in db.execute(stmt).all():
+            blob_store.claim(email, loads(data), db)
+            count += 1
+        db.commit()
+    if count:
+        print(f"📦 Recorded blob owners for {count} existing entries")
+    return count
+
+
+if blob_store.owner_table_is_new():
+    backfill_blob_owners()
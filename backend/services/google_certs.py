@@ -0,0 +1,177 @@
+import os, re, time, threading
+import requests
+from google.auth import exceptions, jwt
+
+# ======================================================
+# 🔑 Google OAuth signing certs, cached and refreshed in the background
+# ======================================================
+# Point at a local stand-in key server for tests / offline development
+GOOGLE_CERTS_URL = os.getenv("AURA_GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+CERTS_FETCH_TIMEOUT = float(os.getenv("AURA_GOOGLE_CERTS_TIMEOUT", "5"))
+CERTS_DEFAULT_MAX_AGE = float(os.getenv("AURA_GOOGLE_CERTS_DEFAULT_MAX_AGE", "3600"))
+CERTS_REFRESH_MARGIN = float(os.getenv("AURA_GOOGLE_CERTS_REFRESH_MARGIN", "300"))
+CERTS_RETRY_SECONDS = 60.0
+# Google unreachable: keep using expired certs this long rather than fail every login
+CERTS_MAX_STALE_SECONDS = float(os.getenv("AURA_GOOGLE_CERTS_MAX_STALE", "86400"))
+CLOCK_SKEW_SECONDS = 10
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: str, default: float = CERTS_DEFAULT_MAX_AGE) -> float:
+    """Seconds from a Cache-Control header's max-age, or default when absent / no-cache."""
+    header = (cache_control or "").lower()
+    if "no-store" in header or "no-cache" in header:
+        return 0.0
+    match = _MAX_AGE_RE.search(header)
+    return float(match.group(1)) if match else default
+
+
+class GoogleCerts:
+    """
+    Google's PEM certs (kid → cert) kept in memory for as long as the
+    certs endpoint's Cache-Control max-age allows. A daemon thread fetches
+    the next set shortly before expiry, so logins never wait on Google;
+    a token signed with a kid we don't know yet forces one refresh.
+    If a fetch fails, expired certs keep being served for up to
+    CERTS_MAX_STALE_SECONDS. All fetches share a pooled HTTP session.
+    """
+
+    def __init__(self, url=GOOGLE_CERTS_URL, timeout=CERTS_FETCH_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._certs = {}
+        self._expires_at = 0.0
+        self._last_forced = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.fetches = 0
+        self.hits = 0
+        self.forced_refreshes = 0
+        self.errors = 0
+        self.stale_served = 0
+
+    # ---------- fetching ----------
+    def _fetch(self) -> dict:
+        response = self._session.get(self.url, timeout=self.timeout)
+        if response.status_code != 200:
+            raise exceptions.TransportError(f"Could not fetch certificates at {self.url}: HTTP {response.status_code}")
+        certs = response.json()
+        max_age = parse_max_age(response.headers.get("Cache-Control", ""))
+        with self._lock:
+            self._certs = certs
+            self._expires_at = time.time() + max_age
+            self.fetches += 1
+        return certs
+
+    def refresh(self) -> dict:
+        """Fetch the certs now; callers that queued behind a fetch reuse its result."""
+        seen = self.fetches
+        with self._fetch_lock:
+            if self.fetches != seen:
+                return self._certs
+            try:
+                return self._fetch()
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                raise
+
+    def certs(self) -> dict:
+        """Current certs; fetched inline only on a cold or fully expired cache."""
+        self._ensure_refresher()
+        with self._lock:
+            if self._certs and time.time() < self._expires_at:
+                self.hits += 1
+                return self._certs
+        try:
+            return self.refresh()
+        except Exception as e:
+            stale = self._stale()
+            if stale is None:
+                raise
+            print(f"⚠️ Google certs refresh failed, using expired certs: {e}")
+            return stale
+
+    def _stale(self):
+        """Expired certs still within CERTS_MAX_STALE_SECONDS, or None."""
+        with self._lock:
+            if self._certs and time.time() < self._expires_at + CERTS_MAX_STALE_SECONDS:
+                self.stale_served += 1
+                return self._certs
+        return None
+
+    # ---------- background refresh ----------
+    def _ensure_refresher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name="google-certs", daemon=True)
+            self._thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            if self._expires_at - time.time() <= CERTS_REFRESH_MARGIN:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Google certs refresh failed: {e}")
+            # Never spin: a failed fetch or a tiny max-age waits the retry interval
+            delay = max(self._expires_at - time.time() - CERTS_REFRESH_MARGIN, CERTS_RETRY_SECONDS)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._session.close()
+
+    # ---------- verification ----------
+    def verify(self, token: str, audience=None) -> dict:
+        """Verify a Google ID token's signature, exp, audience and issuer locally."""
+        certs = self.certs()
+        header = jwt.decode_header(token)
+        if header.get("kid") and header["kid"] not in certs and self._may_force_refresh():
+            # Google rotated its keys before our copy expired
+            try:
+                certs = self.refresh()
+            except Exception as e:
+                print(f"⚠️ Google certs refresh for kid {header['kid']} failed: {e}")
+        info = jwt.decode(token, certs=certs, audience=audience, clock_skew_in_seconds=CLOCK_SKEW_SECONDS)
+        if info.get("iss") not in GOOGLE_ISSUERS:
+            raise exceptions.GoogleAuthError(f"Wrong issuer: {info.get('iss')}")
+        return info
+
+    def _may_force_refresh(self) -> bool:
+        # At most one forced fetch per retry interval, so bogus kids can't hammer Google
+        with self._lock:
+            if time.time() - self._last_forced < CERTS_RETRY_SECONDS:
+                return False
+            self._last_forced = time.time()
+            self.forced_refreshes += 1
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "url": self.url,
+                "keys": len(self._certs),
+                "expires_in_seconds": round(max(0.0, self._expires_at - time.time()), 1),
+                "fetches": self.fetches,
+                "hits": self.hits,
+                "forced_refreshes": self.forced_refreshes,
+                "errors": self.errors,
+                "stale_served": self.stale_served,
+            }
+
+
+# Shared by auth_google.py
+google_certs = GoogleCerts()
@@ -1,5 +1,5 @@
-from groq import Groq
 from backend.utils.save_helper import save_entry
+from backend.services.llm_gateway import llm_gateway
 import os, time
 
 # ==============================
@@ -9,14 +9,39 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise ValueError("❌ Missing GROQ_API_KEY environment variable. Please set it in Railway or Render.")
 
-client = Groq(api_key=GROQ_API_KEY)
 DEFAULT_MODEL = "llama-3.1-8b-instant"
 
 
+# ==============================
+# 🧾 TIMELINE LOGGING
+# ==============================
+def log_interaction(messages, reply: str, model: str = DEFAULT_MODEL):
+    """Save one chat exchange to the unified Smart Study timeline."""
+    # 🗨️ Extract user query for context
+    user_message = next(
+        (m["content"] for m in reversed(messages) if m["role"] == "user"),
+        "[No user message found]"
+    )
+
+    try:
+        save_entry(
+            module="chatbot",
+            title="Chatbot Interaction",
+            content=f"User asked: {user_message[:120]}",
+            metadata={
+                "model": model,
+                "user_message": user_message,
+                "assistant_reply": reply
+            },
+        )
+    except Exception as log_err:
+        print(f"⚠️ Failed to log chatbot message: {log_err}")
+
+
 # ==============================
 # 🤖 ASK GROQ FUNCTION
 # ==============================
-def ask_gpt(messages, model=DEFAULT_MODEL):
+async def ask_gpt(messages, model=DEFAULT_MODEL, user=None):
     """
     Send chat messages to Groq (cloud-hosted Llama3.1 model)
     and log the interaction to the unified Smart Study timeline.
@@ -24,38 +49,12 @@ def ask_gpt(messages, model=DEFAULT_MODEL):
     try:
         start_time = time.time()
 
-        # 🧠 Chat completion call
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=0.7,
-        )
-
-        # Extract reply text
-        reply = response.choices[0].message.content.strip()
+        # 🧠 Chat completion call (async gateway, never blocks the event loop)
+        reply = await llm_gateway.chat(messages, model=model, temperature=0.7, user=user)
         duration = round(time.time() - start_time, 1)
         print(f"✅ Groq replied in {duration}s: {len(reply)} chars")
 
-        # 🗨️ Extract user query for context
-        user_message = next(
-            (m["content"] for m in reversed(messages) if m["role"] == "user"),
-            "[No user message found]"
-        )
-
-        # 🧾 Save chat to unified Smart Study timeline
-        try:
-            save_entry(
-                module="chatbot",
-                title="Chatbot Interaction",
-                content=f"User asked: {user_message[:120]}",
-                metadata={
-                    "model": model,
-                    "user_message": user_message,
-                    "assistant_reply": reply
-                },
-            )
-        except Exception as log_err:
-            print(f"⚠️ Failed to log chatbot message: {log_err}")
+        log_interaction(messages, reply, model)
 
         # ✅ Return the AI response
         return reply
@@ -63,3 +62,18 @@ def ask_gpt(messages, model=DEFAULT_MODEL):
     except Exception as e:
         print("❌ Groq Llama call failed:", e)
         return "⚠️ Sorry, the Groq AI service is currently unavailable. Please try again later."
+
+
+# ==============================
+# 📡 STREAMING VARIANT
+# ==============================
+async def stream_gpt(messages, model=DEFAULT_MODEL, user=None):
+    """Yield reply deltas as Groq produces them; the exchange is logged once the stream ends."""
+    parts, deltas = [], llm_gateway.stream_chat(messages, model=model, temperature=0.7, user=user)
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield delta
+    finally:
+        await deltas.aclose()
+    log_interaction(messages, "".join(parts).strip(), model)
@@ -0,0 +1,247 @@
+import os, re, time, asyncio, hashlib, threading
+from contextvars import ContextVar
+from sqlalchemy import select, func, delete, update
+from backend.database import SessionLocal, engine
+from backend.models.llm_cache import LLMCacheEntry
+from backend.utils.serializer import dumps
+
+# ======================================================
+# 🗃️ Persistent LLM response cache
+# ======================================================
+# Lives in aura.db so repeated questions survive restarts and are shared by
+# every worker. Entries expire after a TTL; beyond the byte budget the
+# least recently used answers are evicted first.
+LLM_CACHE_ENABLED = os.getenv("AURA_LLM_CACHE", "on").lower() not in ("0", "off", "false")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("AURA_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("AURA_LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+HIT_FLUSH_SECONDS = 5.0   # hit counters / last_used are written back in batches
+HIT_FLUSH_KEYS = 100
+
+# Per-request bypass: "Cache-Control: no-cache" or "X-AURA-LLM-Cache: bypass"
+BYPASS_HEADER = "x-aura-llm-cache"
+_bypass = ContextVar("llm_cache_bypass", default=False)
+
+LLMCacheEntry.__table__.create(bind=engine, checkfirst=True)
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt."""
+    return _WS_RE.sub(" ", str(text or "")).strip().casefold()
+
+
+def temperature_bucket(temperature) -> float:
+    """Temperatures within 0.1 of each other share cached answers."""
+    return round(float(temperature or 0.0), 1)
+
+
+def cache_key(model: str, messages, temperature, max_tokens=None) -> str:
+    normalized = [[m.get("role", ""), normalize_text(m.get("content", ""))] for m in messages]
+    payload = [model, normalized, temperature_bucket(temperature), max_tokens or 0]
+    return hashlib.sha256(dumps(payload)).hexdigest()
+
+
+# ---------- bypass header ----------
+def wants_bypass(headers) -> bool:
+    cache_control = (headers.get("cache-control") or "").lower()
+    return "no-cache" in cache_control or "no-store" in cache_control \
+        or (headers.get(BYPASS_HEADER) or "").lower() in ("bypass", "off", "0")
+
+
+def set_bypass(value: bool):
+    return _bypass.set(value)
+
+
+def reset_bypass(token):
+    _bypass.reset(token)
+
+
+def bypassed() -> bool:
+    return _bypass.get()
+
+
+class LLMCacheMiddleware:
+    """Pure ASGI middleware: flags the request's context when the client asked to skip the cache."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        token = set_bypass(wants_bypass(headers))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_bypass(token)
+
+
+class LLMCache:
+    """
+    get() / put() over the llm_cache table; async callers use aget() /
+    aput(), which run the SQLite work in a worker thread. A hit is a
+    plain SELECT: its hit count and last_used go to a pending map that
+    is written back in one batch every few seconds (and before every
+    eviction pass, so LRU order stays right). Counters are per process;
+    the byte total is read from the table once and then kept in step
+    with our own writes (and re-read after every eviction pass).
+    """
+
+    def __init__(self, ttl=LLM_CACHE_TTL_SECONDS, max_bytes=LLM_CACHE_MAX_BYTES, enabled=LLM_CACHE_ENABLED):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._bytes = None
+        self._pending_hits = {}   # key -> (hits, last_used) not yet written
+        self._hits_flushed = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.stores = 0
+        self.expired = 0
+        self.evictions = 0
+        self.latency_saved_ms = 0.0
+
+    def _total_bytes(self, db) -> int:
+        if self._bytes is None:
+            self._bytes = db.scalar(select(func.coalesce(func.sum(LLMCacheEntry.size), 0))) or 0
+        return self._bytes
+
+    # ---------- reads ----------
+    def get(self, key: str):
+        """Cached reply for key, or None (miss, expired, bypassed or disabled)."""
+        if not self.enabled:
+            return None
+        if bypassed():
+            with self._lock:
+                self.bypasses += 1
+            return None
+        now = time.time()
+        with SessionLocal() as db:
+            row = db.get(LLMCacheEntry, key)
+            if row is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+            if now - row.created_at > self.ttl:
+                db.delete(row)
+                db.commit()
+                with self._lock:
+                    self._bytes = None
+                    self.expired += 1
+                    self.misses += 1
+                return None
+            response, saved = row.response, row.latency_ms
+        with self._lock:
+            self.hits += 1
+            self.latency_saved_ms += saved
+            hits, _ = self._pending_hits.get(key, (0, now))
+            self._pending_hits[key] = (hits + 1, now)
+            due = len(self._pending_hits) >= HIT_FLUSH_KEYS \
+                or time.monotonic() - self._hits_flushed >= HIT_FLUSH_SECONDS
+        if due:
+            self.flush_hits()
+        return response
+
+    async def aget(self, key: str):
+        """get() without blocking the event loop."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    def _write_hits(self, db):
+        pending, self._pending_hits = self._pending_hits, {}
+        self._hits_flushed = time.monotonic()
+        for key, (hits, last_used) in pending.items():
+            db.execute(update(LLMCacheEntry).where(LLMCacheEntry.key == key)
+                       .values(last_used=last_used, hits=LLMCacheEntry.hits + hits))
+
+    def flush_hits(self):
+        """Write pending hit counters back to the table."""
+        with self._lock, SessionLocal() as db:
+            if self._pending_hits:
+                self._write_hits(db)
+                db.commit()
+
+    # ---------- writes ----------
+    def put(self, key: str, model: str, response: str, latency_ms: float = 0.0):
+        """Store (or refresh) a reply, then evict LRU entries beyond the byte budget."""
+        if not self.enabled or not response:
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, SessionLocal() as db:
+            old = db.get(LLMCacheEntry, key)
+            total = self._total_bytes(db) - (old.size if old else 0) + size
+            db.merge(LLMCacheEntry(key=key, model=model, response=response, size=size,
+                                   latency_ms=latency_ms, created_at=now, last_used=now, hits=0))
+            db.flush()
+            if total > self.max_bytes:
+                self._write_hits(db)
+                total = self._evict(db, keep=key)
+            db.commit()
+            self._bytes = total
+            self.stores += 1
+
+    async def aput(self, key: str, model: str, response: str, latency_ms: float = 0.0):
+        """put() without blocking the event loop."""
+        if self.enabled and response:
+            await asyncio.to_thread(self.put, key, model, response, latency_ms)
+
+    def _evict(self, db, keep: str) -> int:
+        # Expired rows go first, then the least recently used until we are under budget
+        cutoff = time.time() - self.ttl
+        self.evictions += db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.created_at < cutoff)).rowcount or 0
+        total = db.scalar(select(func.coalesce(func.sum(LLMCacheEntry.size), 0))) or 0
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return total
+        victims, freed = [], 0
+        for key, size in db.execute(select(LLMCacheEntry.key, LLMCacheEntry.size)
+                                    .where(LLMCacheEntry.key != keep)
+                                    .order_by(LLMCacheEntry.last_used)):
+            if freed >= excess:
+                break
+            victims.append(key)
+            freed += size
+        for i in range(0, len(victims), 500):
+            db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(victims[i:i + 500])))
+        self.evictions += len(victims)
+        return total - freed
+
+    def clear(self):
+        with self._lock, SessionLocal() as db:
+            db.execute(delete(LLMCacheEntry))
+            db.commit()
+            self._pending_hits = {}
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._bytes is None:
+                with SessionLocal() as db:
+                    self._total_bytes(db)
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl,
+                "max_bytes": self.max_bytes,
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "stores": self.stores,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "latency_saved_ms": round(self.latency_saved_ms, 1),
+            }
+
+
+# Shared by llm_gateway
+llm_cache = LLMCache()
@@ -0,0 +1,341 @@
+import os, time, asyncio, threading
+from collections import deque
+from contextvars import ContextVar
+import httpx
+from groq import AsyncGroq
+from backend.services.llm_cache import llm_cache, cache_key
+from backend.services.llm_scheduler import llm_scheduler, ollama_scheduler, LLM_MAX_CONCURRENCY
+from backend.services.llm_router import ProviderRouter, LLM_PROVIDERS, mark_upstream
+from backend.utils.chunker import estimate_tokens
+from backend.utils import ollama_client
+
+# ======================================================
+# 🤖 One async gateway for every Groq completion
+# ======================================================
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+DEFAULT_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+
+# Sizing / timeouts (override via env); concurrency lives in llm_scheduler
+LLM_TIMEOUT_SECONDS = float(os.getenv("AURA_LLM_TIMEOUT", "60"))
+LLM_MAX_CONNECTIONS = int(os.getenv("AURA_LLM_MAX_CONNECTIONS", str(LLM_MAX_CONCURRENCY * 2)))
+LLM_MAX_RETRIES = int(os.getenv("AURA_LLM_MAX_RETRIES", "1"))
+DEFAULT_COMPLETION_TOKENS = 512   # assumed reply size when max_tokens isn't given
+_LATENCY_SAMPLES = 512
+
+
+class LLMError(RuntimeError):
+    """The completion could not be produced (no key, provider error or empty reply)."""
+
+
+class LLMEmptyReply(LLMError):
+    """The provider answered, but with no text."""
+    provider_healthy = True   # not an outage: the router fails over without tripping the breaker
+
+
+class LLMTimeout(LLMError):
+    """The completion did not finish within its timeout (queue wait included)."""
+
+
+# ---------- per-request call accounting ----------
+_call_counter = ContextVar("llm_call_counter", default=None)
+
+
+class CallCounter:
+    """
+    Counts upstream completions started inside `with CallCounter() as c:`
+    (tasks spawned inside inherit it). Cache hits and coalesced waits are
+    not upstream calls, so they don't count; hedged attempts do.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_call_counter.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        _call_counter.reset(self._tokens.pop())
+
+    async def track(self, deltas):
+        """Count the calls made while an async generator of deltas is consumed."""
+        with self:
+            try:
+                async for delta in deltas:
+                    yield delta
+            finally:
+                await deltas.aclose()
+
+
+def _count_upstream():
+    counter = _call_counter.get()
+    if counter is not None:
+        counter.calls += 1
+
+
+class LLMGateway:
+    """
+    Async Groq client shared by all routers and services. One pooled
+    HTTP client keeps connections warm, llm_scheduler decides who goes
+    next (priority class, per-user turns, tokens-per-minute budget), and
+    every call carries its own timeout, so slow completions never block
+    the event loop or each other. Plain completions go through a
+    ProviderRouter, so a slow or failing Groq is hedged by Ollama.
+    """
+
+    def __init__(self, api_key=GROQ_API_KEY, scheduler=llm_scheduler, timeout=LLM_TIMEOUT_SECONDS):
+        self.api_key = api_key
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self._client = None
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=_LATENCY_SAMPLES)   # call latency (ms) of recent completions
+        self._ttfts = deque(maxlen=_LATENCY_SAMPLES)       # time to first streamed token (ms)
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.streams = 0
+        self._flights = {}   # cache key -> task of the upstream call in flight
+        self.leaders = 0
+        self.coalesced = 0
+        # Providers in AURA_LLM_PROVIDERS order; Groq only with a key
+        self.router = ProviderRouter()
+        for name in LLM_PROVIDERS:
+            if name == "groq" and api_key:
+                self.router.register("groq", self._groq_complete)
+            elif name == "ollama":
+                self.router.register("ollama", self._ollama_complete, model=ollama_client.OLLAMA_MODEL)
+
+    # ---------- client ----------
+    def _groq(self) -> AsyncGroq:
+        if not self.api_key:
+            raise LLMError("Missing GROQ_API_KEY environment variable")
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONCURRENCY),
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+            )
+            self._client = AsyncGroq(api_key=self.api_key, http_client=http_client, max_retries=LLM_MAX_RETRIES)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        await ollama_client.aclose()
+
+    # ---------- completions ----------
+    @staticmethod
+    def _prompt_tokens(messages) -> int:
+        return sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+
+    def _estimate(self, messages, max_tokens) -> int:
+        """Tokens a request may spend: prompt plus the reply cap (scheduler budget)."""
+        return self._prompt_tokens(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+    async def chat(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=None, timeout=None, cache=True,
+                   priority="interactive", user=None, cache_if=None) -> str:
+        """
+        Return the stripped reply text for a chat completion. Served from
+        llm_cache when possible; identical prompts already in flight share
+        that one upstream call instead of starting their own (single-flight).
+        priority is "interactive", "batch" or "background"; user gets fair turns.
+        cache_if(reply) -> bool keeps unusable replies (e.g. broken JSON)
+        out of the cache, and ignores any that are already in it.
+        """
+        key = cache_key(model, messages, temperature, max_tokens)
+        if cache:
+            cached = await llm_cache.aget(key)
+            if cached is not None and (cache_if is None or cache_if(cached)):
+                return cached
+
+        flight = self._flights.get(key)
+        if flight is None:
+            # Own task, so one caller disconnecting doesn't cancel it for the others
+            flight = asyncio.ensure_future(
+                self._complete(messages, model, temperature, max_tokens, timeout, key if cache else None, priority, user,
+                               cache_if)
+            )
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done, key=key: self._land(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _land(self, key: str, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            flight.exception()   # mark retrieved even if every waiter went away
+
+    async def _complete(self, messages, model, temperature, max_tokens, timeout, key, priority, user,
+                        cache_if=None) -> str:
+        """
+        One routed completion (Groq, hedged / failed over to Ollama). Only
+        answers from the primary provider are cached under key (if given).
+        """
+        timeout = timeout or self.timeout
+        requested = time.perf_counter()
+        try:
+            reply, provider = await asyncio.wait_for(
+                self.router.complete(messages, model, temperature, max_tokens, timeout, priority, user), timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise LLMTimeout(f"{model} did not answer within {timeout:.0f}s")
+        except LLMError:
+            self.errors += 1
+            raise
+        except Exception as e:
+            self.errors += 1
+            raise LLMError(f"{model} call failed: {e}") from e
+
+        self.completed += 1
+        if key and provider == self.router.primary and (cache_if is None or cache_if(reply)):
+            await llm_cache.aput(key, model, reply, latency_ms=(time.perf_counter() - requested) * 1000)
+        return reply
+
+    async def _groq_complete(self, messages, model, temperature, max_tokens, timeout, priority, user) -> str:
+        kwargs = {"model": model, "messages": messages, "temperature": temperature, "timeout": timeout}
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+        client = self._groq()
+        async with self.scheduler.slot(priority, user, self._estimate(messages, max_tokens)) as slot:
+            _count_upstream()
+            mark_upstream()
+            started = time.perf_counter()
+            try:
+                response = await client.chat.completions.create(**kwargs)
+                usage = getattr(response, "usage", None)
+                slot.used = getattr(usage, "total_tokens", None)
+            finally:
+                with self._lock:
+                    self._latencies.append((time.perf_counter() - started) * 1000)
+        reply = (response.choices[0].message.content or "").strip() if response.choices else ""
+        if not reply:
+            raise LLMEmptyReply(f"{model} returned an empty reply")
+        return reply
+
+    async def _ollama_complete(self, messages, model, temperature, max_tokens, timeout, priority, user) -> str:
+        # Self-hosted: its own concurrency cap, no Groq token budget
+        async with ollama_scheduler.slot(priority, user):
+            _count_upstream()
+            mark_upstream()
+            reply = (await ollama_client.chat_ollama(messages, model, temperature, max_tokens, timeout)).strip()
+        if not reply:
+            raise LLMEmptyReply(f"{model} returned an empty reply")
+        return reply
+
+    async def stream_chat(self, messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=None, timeout=None, cache=True,
+                          priority="interactive", user=None):
+        """
+        Async generator of reply text deltas as Groq produces them. A cached
+        reply comes out as one delta; a fresh one is cached once complete.
+        While Groq's circuit breaker is open the routed (Ollama) answer is
+        sent as one delta instead. timeout bounds the whole stream, queue
+        wait included.
+        """
+        key = cache_key(model, messages, temperature, max_tokens) if cache else None
+        if key:
+            cached = await llm_cache.aget(key)
+            if cached is not None:
+                yield cached
+                return
+
+        if not self.router.acquire("groq"):
+            yield await self._complete(messages, model, temperature, max_tokens, timeout, key, priority, user)
+            return
+
+        timeout = timeout or self.timeout
+        kwargs = {"model": model, "messages": messages, "temperature": temperature, "timeout": timeout, "stream": True}
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+        requested = time.perf_counter()
+        deadline = requested + timeout
+
+        # Any exit before the stream starts (no key, queue timeout, client gone
+        # while queued) gives no verdict: release a half-open probe either way
+        try:
+            client = self._groq()
+            slot = await asyncio.wait_for(self.scheduler.acquire(priority, user, self._estimate(messages, max_tokens)), timeout)
+        except asyncio.TimeoutError:
+            self.router.abandon("groq")
+            self.timeouts += 1
+            raise LLMTimeout(f"{model} did not start within {timeout:.0f}s")
+        except BaseException:
+            self.router.abandon("groq")
+            raise
+
+        started = time.perf_counter()
+        self.streams += 1
+        _count_upstream()
+        parts, first_token, stream, ok = [], None, None, None   # ok stays None if the client went away
+        answered = False   # the stream ran to the end (an empty one isn't an outage)
+        try:
+            stream = await asyncio.wait_for(client.chat.completions.create(**kwargs), max(0.1, deadline - started))
+            async for chunk in stream:
+                delta = (chunk.choices[0].delta.content or "") if chunk.choices else ""
+                if not delta:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter()
+                parts.append(delta)
+                yield delta
+                if time.perf_counter() > deadline:
+                    raise asyncio.TimeoutError
+            ok, answered = bool(parts), True
+        except asyncio.TimeoutError:
+            ok = False
+            self.timeouts += 1
+            raise LLMTimeout(f"{model} did not finish streaming within {timeout:.0f}s")
+        except Exception as e:
+            ok = False
+            self.errors += 1
+            raise LLMError(f"{model} stream failed: {e}") from e
+        finally:
+            if stream is not None:
+                await stream.close()
+            if ok is None:
+                self.router.abandon("groq")
+            else:
+                self.router.record("groq", model, ok, healthy=True if answered else None)
+            slot.used = self._prompt_tokens(messages) + estimate_tokens("".join(parts))
+            self.scheduler.release(slot)
+            with self._lock:
+                self._latencies.append((time.perf_counter() - started) * 1000)
+                if first_token is not None:
+                    self._ttfts.append((first_token - requested) * 1000)
+
+        reply = "".join(parts).strip()
+        if not reply:
+            self.errors += 1
+            raise LLMEmptyReply(f"{model} returned an empty reply")
+        self.completed += 1
+        if key:
+            await llm_cache.aput(key, model, reply, latency_ms=(time.perf_counter() - requested) * 1000)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            ttfts = sorted(self._ttfts)
+        return {
+            "timeout_seconds": self.timeout,
+            "completed": self.completed,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_latency_ms": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+            "p95_latency_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1) if latencies else 0.0,
+            "streams": self.streams,
+            "coalesced": self.coalesced,
+            "coalesce_rate": round(self.coalesced / (self.leaders + self.coalesced), 4) if self.leaders + self.coalesced else 0.0,
+            "flights_in_progress": len(self._flights),
+            "avg_ttft_ms": round(sum(ttfts) / len(ttfts), 1) if ttfts else 0.0,
+            "p95_ttft_ms": round(ttfts[int(len(ttfts) * 0.95) - 1], 1) if ttfts else 0.0,
+        }
+
+
+# Shared by every router / service that talks to Groq
+llm_gateway = LLMGateway()
+
@@ -0,0 +1,285 @@
+import os, time, asyncio, threading
+from collections import deque
+from contextvars import ContextVar
+
+# ======================================================
+# 🧭 Latency-aware provider routing (Groq ⇄ Ollama)
+# ======================================================
+# Each completion goes to the first healthy provider. If it is still busy
+# after that provider's p95 latency, the same request is hedged to the next
+# one and whichever answers first wins (the other is cancelled). A provider
+# that keeps failing is skipped by its circuit breaker until a cooldown has
+# passed, then one probe request decides whether it is back.
+# Ollama (and so hedging) is only on by default once OLLAMA_URL is set.
+OLLAMA_CONFIGURED = bool(os.getenv("OLLAMA_URL"))
+LLM_PROVIDERS = [p.strip() for p in os.getenv("AURA_LLM_PROVIDERS", "groq,ollama" if OLLAMA_CONFIGURED else "groq").split(",")
+                 if p.strip()]
+LLM_HEDGE_ENABLED = os.getenv("AURA_LLM_HEDGE", "on" if OLLAMA_CONFIGURED else "off").lower() not in ("0", "off", "false")
+LLM_HEDGE_AFTER_MS = float(os.getenv("AURA_LLM_HEDGE_AFTER_MS", "8000"))   # until p95 is known
+LLM_HEDGE_MIN_MS = 200.0
+LLM_HEDGE_MIN_SAMPLES = 20
+LLM_BREAKER_FAILURES = int(os.getenv("AURA_LLM_BREAKER_FAILURES", "5"))      # consecutive
+LLM_BREAKER_ERROR_RATE = float(os.getenv("AURA_LLM_BREAKER_ERROR_RATE", "0.5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("AURA_LLM_BREAKER_COOLDOWN", "30"))
+_WINDOW = 200
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Per attempt: [perf_counter() when its request actually went upstream (after any queueing)]
+_upstream_started = ContextVar("llm_upstream_started", default=None)
+
+
+class NoProviderAvailable(RuntimeError):
+    pass
+
+
+def mark_upstream():
+    """Providers call this right before the upstream request: latency is measured from here."""
+    clock = _upstream_started.get()
+    if clock is not None:
+        clock[0] = time.perf_counter()
+
+
+class _Window:
+    """Rolling latency / outcome samples for one provider + model."""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=_WINDOW)
+        self.outcomes = deque(maxlen=_WINDOW)   # True = success
+        self.calls = 0
+        self.censored = 0   # cancelled while upstream: elapsed time kept as a lower bound
+
+    def percentile(self, q: float):
+        if not self.latencies:
+            return None
+        samples = sorted(self.latencies)
+        return samples[max(0, int(len(samples) * q) - 1)]
+
+    def error_rate(self) -> float:
+        return round(self.outcomes.count(False) / len(self.outcomes), 4) if self.outcomes else 0.0
+
+
+class _Breaker:
+    """closed → open after repeated failures → half_open (one probe) after the cooldown."""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self.rejected = 0
+        self.probing = False
+        self.outcomes = deque(maxlen=_WINDOW)
+
+    def acquire(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= LLM_BREAKER_COOLDOWN:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.opens += 1
+
+    def record(self, ok: bool):
+        self.outcomes.append(ok)
+        if self.state == HALF_OPEN:
+            self.probing = False
+            if ok:
+                self.state, self.failures = CLOSED, 0
+                self.outcomes.clear()
+            else:
+                self._open()
+            return
+        if ok:
+            self.failures = 0
+            return
+        self.failures += 1
+        rate = self.outcomes.count(False) / len(self.outcomes)
+        if self.state == CLOSED and (self.failures >= LLM_BREAKER_FAILURES
+                                     or (len(self.outcomes) >= LLM_HEDGE_MIN_SAMPLES and rate >= LLM_BREAKER_ERROR_RATE)):
+            self._open()
+
+    def abandon(self):
+        """A call was cancelled (lost a hedge race): no verdict either way."""
+        if self.state == HALF_OPEN:
+            self.probing = False
+
+
+class _Provider:
+    __slots__ = ("name", "call", "model")
+
+    def __init__(self, name, call, model=None):
+        self.name = name
+        self.call = call      # async (messages, model, temperature, max_tokens, timeout, priority, user) -> str
+        # An exception with provider_healthy = True (e.g. an empty reply) still fails
+        # the attempt but is no sign of an outage: it doesn't count against the breaker
+        self.model = model    # fixed model name, or None to use the requested one
+
+
+class ProviderRouter:
+    """
+    complete() returns (reply, provider name). Providers are tried in
+    registration order; health is tracked per provider (breaker) and per
+    provider + model (latency, error rate). Runs on the event loop.
+    """
+
+    def __init__(self, hedge=LLM_HEDGE_ENABLED):
+        self.hedge = hedge
+        self._providers = []
+        self._breakers = {}
+        self._windows = {}
+        self._lock = threading.Lock()
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def register(self, name: str, call, model: str = None):
+        self._providers.append(_Provider(name, call, model))
+        self._breakers[name] = _Breaker()
+
+    @property
+    def primary(self):
+        return self._providers[0].name if self._providers else None
+
+    def _window(self, provider: str, model: str) -> _Window:
+        key = (provider, model)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _Window()
+        return window
+
+    # ---------- health ----------
+    def acquire(self, provider: str) -> bool:
+        """True if the provider's breaker lets a request through (may start a probe)."""
+        breaker = self._breakers.get(provider)
+        return breaker is not None and breaker.acquire()
+
+    def record(self, provider: str, model: str, ok: bool, latency_ms: float = None, healthy: bool = None):
+        """healthy overrides ok for the breaker (the provider answered, just not usefully)."""
+        self._breakers[provider].record(ok if healthy is None else healthy)
+        with self._lock:
+            window = self._window(provider, model)
+            window.calls += 1
+            window.outcomes.append(ok)
+            if ok and latency_ms is not None:
+                window.latencies.append(latency_ms)
+
+    def abandon(self, provider: str):
+        self._breakers[provider].abandon()
+
+    def censor(self, provider: str, model: str, latency_ms: float):
+        """
+        A call cancelled while upstream (lost a hedge race, caller gave up):
+        its elapsed time goes in as a lower bound, so the slow tail that
+        triggered the hedge still counts towards p95.
+        """
+        with self._lock:
+            window = self._window(provider, model)
+            window.latencies.append(latency_ms)
+            window.censored += 1
+
+    def hedge_delay(self, provider: str, model: str) -> float:
+        """Seconds to wait on provider before hedging: its p95 once known."""
+        with self._lock:
+            window = self._window(provider, model)
+            p95 = window.percentile(0.95) if len(window.latencies) >= LLM_HEDGE_MIN_SAMPLES else None
+        return max(LLM_HEDGE_MIN_MS, p95 if p95 is not None else LLM_HEDGE_AFTER_MS) / 1000
+
+    # ---------- routing ----------
+    async def _attempt(self, provider: _Provider, model: str, args, clock: list):
+        # Runs in its own task, so the provider's mark_upstream() fills this attempt's
+        # clock; queue / token-budget waits before it stay out of the latency samples
+        _upstream_started.set(clock)
+        started = time.perf_counter()
+        try:
+            reply = await provider.call(args[0], model, *args[1:])
+        except Exception as e:
+            print(f"⚠️ LLM provider {provider.name} ({model}) failed: {e}")
+            self.record(provider.name, model, ok=False, healthy=getattr(e, "provider_healthy", None))
+            raise
+        started = clock[0] or started
+        self.record(provider.name, model, ok=True, latency_ms=(time.perf_counter() - started) * 1000)
+        return reply
+
+    async def complete(self, messages, model, temperature=0.7, max_tokens=None, timeout=None,
+                       priority="interactive", user=None):
+        args = (messages, temperature, max_tokens, timeout, priority, user)
+        candidates = iter(self._providers)
+        tasks, clocks, last_error = {}, {}, None
+
+        def start_next() -> bool:
+            for provider in candidates:
+                if self.acquire(provider.name):
+                    used = provider.model or model
+                    clock = clocks.setdefault(provider.name, [None])
+                    task = asyncio.ensure_future(self._attempt(provider, used, args, clock))
+                    # Cancelled (even before it ran): release a half-open probe without a verdict
+                    task.add_done_callback(lambda t, name=provider.name: t.cancelled() and self.abandon(name))
+                    tasks[task] = (provider.name, used)
+                    return True
+            return False
+
+        if not start_next():
+            raise NoProviderAvailable("No LLM provider is available (all circuit breakers open)")
+        first, can_hedge, hedged = next(iter(tasks.values())), self.hedge, False
+        try:
+            while tasks:
+                delay = self.hedge_delay(*first) if can_hedge else None
+                done, _ = await asyncio.wait(tasks, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slower than its p95: race a backup against it
+                    can_hedge = False
+                    if start_next():
+                        self.hedges += 1
+                        hedged = True
+                    continue
+                for task in done:
+                    name, _ = tasks.pop(task)
+                    if task.exception() is None:
+                        if hedged and name != first[0]:
+                            self.hedge_wins += 1
+                        return task.result(), name
+                    last_error = task.exception()
+                if not tasks and start_next():
+                    self.failovers += 1
+        finally:
+            for task, (name, used) in tasks.items():
+                if task.done():
+                    task.cancelled() or task.exception()   # finished alongside the winner
+                    continue
+                if clocks[name][0] is not None:
+                    self.censor(name, used, (time.perf_counter() - clocks[name][0]) * 1000)
+                task.cancel()
+        raise last_error
+
+    def stats(self) -> dict:
+        with self._lock:
+            models = {
+                f"{provider}/{model}": {
+                    "calls": window.calls,
+                    "p50_latency_ms": round(window.percentile(0.5) or 0.0, 1),
+                    "p95_latency_ms": round(window.percentile(0.95) or 0.0, 1),
+                    "error_rate": window.error_rate(),
+                    "censored": window.censored,
+                }
+                for (provider, model), window in self._windows.items()
+            }
+        return {
+            "providers": [p.name for p in self._providers],
+            "hedging": self.hedge,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "breakers": {
+                name: {"state": b.state, "consecutive_failures": b.failures, "opens": b.opens, "rejected": b.rejected}
+                for name, b in self._breakers.items()
+            },
+            "models": models,
+        }
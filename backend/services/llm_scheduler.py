@@ -0,0 +1,176 @@
+import os, time, asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+# ======================================================
+# 🚦 Priority / fair-share dispatch for LLM calls
+# ======================================================
+# Every completion waits here for a slot. Classes are served strictly in
+# order (interactive before batch before background); inside a class,
+# users take turns, so one big PDF upload can't queue ahead of everyone
+# else's chunks. A token bucket keeps the whole process under the
+# provider's tokens-per-minute limit.
+PRIORITIES = ("interactive", "batch", "background")
+LLM_MAX_CONCURRENCY = int(os.getenv("AURA_LLM_MAX_CONCURRENCY", "16"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("AURA_LLM_TOKENS_PER_MINUTE", "60000"))   # 0 = no budget
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("AURA_OLLAMA_MAX_CONCURRENCY", "4"))
+_WAIT_SAMPLES = 512
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "user", "tokens", "used", "enqueued")
+
+    def __init__(self, future, priority, user, tokens):
+        self.future = future
+        self.priority = priority
+        self.user = user
+        self.tokens = tokens
+        self.used = None          # actual tokens, if the caller learns them
+        self.enqueued = time.perf_counter()
+
+
+class LLMScheduler:
+    """
+    acquire() resolves when the caller may start its request; release()
+    hands the slot (and any unused token estimate) back. Runs on the event
+    loop only — no locks.
+    """
+
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, tokens_per_minute=LLM_TOKENS_PER_MINUTE):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self._queues = {p: OrderedDict() for p in PRIORITIES}   # priority -> user -> deque of waiters
+        self._running = 0
+        self._tokens = float(tokens_per_minute)
+        self._refilled = time.monotonic()
+        self._timer = None
+        self._waits = {p: deque(maxlen=_WAIT_SAMPLES) for p in PRIORITIES}
+        self._max_wait = dict.fromkeys(PRIORITIES, 0.0)
+        self._waiting = dict.fromkeys(PRIORITIES, 0)
+        self._dispatched = dict.fromkeys(PRIORITIES, 0)
+        self.throttled = 0
+
+    # ---------- token bucket ----------
+    def _refill(self):
+        now = time.monotonic()
+        if self.tokens_per_minute:
+            self._tokens = min(float(self.tokens_per_minute),
+                               self._tokens + (now - self._refilled) * self.tokens_per_minute / 60.0)
+        self._refilled = now
+
+    def _wake_later(self, needed: float):
+        if self._timer is None:
+            self.throttled += 1
+            delay = needed * 60.0 / self.tokens_per_minute
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    # ---------- queueing ----------
+    def _head(self):
+        for priority in PRIORITIES:
+            users = self._queues[priority]
+            if users:
+                return users[next(iter(users))][0]
+        return None
+
+    def _pop(self, waiter: _Waiter):
+        users = self._queues[waiter.priority]
+        users[waiter.user].popleft()
+        if users[waiter.user]:
+            users.move_to_end(waiter.user)   # round-robin: next user's turn
+        else:
+            del users[waiter.user]
+        self._waiting[waiter.priority] -= 1
+
+    def _dispatch(self):
+        while self._running < self.max_concurrency:
+            waiter = self._head()
+            if waiter is None:
+                return
+            if self.tokens_per_minute:
+                self._refill()
+                if waiter.tokens > self._tokens:
+                    # Head of line waits for the bucket; lower classes don't jump it
+                    self._wake_later(waiter.tokens - self._tokens)
+                    return
+                self._tokens -= waiter.tokens
+            self._pop(waiter)
+            self._running += 1
+            wait_ms = (time.perf_counter() - waiter.enqueued) * 1000
+            self._waits[waiter.priority].append(wait_ms)
+            self._max_wait[waiter.priority] = max(self._max_wait[waiter.priority], wait_ms)
+            self._dispatched[waiter.priority] += 1
+            waiter.future.set_result(None)
+
+    async def acquire(self, priority: str = "interactive", user: str = None, tokens: int = 0) -> _Waiter:
+        """Wait for a slot. tokens is the request's estimated prompt + completion size."""
+        if priority not in self._queues:
+            raise ValueError(f"Unknown LLM priority: {priority}")
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)   # never wait for more than a full bucket
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority, user or "", tokens)
+        self._queues[priority].setdefault(waiter.user, deque()).append(waiter)
+        self._waiting[priority] += 1
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(waiter)      # granted just as we were cancelled
+            else:
+                queue = self._queues[priority].get(waiter.user)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._queues[priority][waiter.user]
+                    self._waiting[priority] -= 1
+                    self._dispatch()
+            raise
+        return waiter
+
+    def release(self, waiter: _Waiter):
+        """Give the slot back; a known actual size corrects the bucket for the estimate."""
+        self._running -= 1
+        if self.tokens_per_minute and waiter.used is not None:
+            self._refill()
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + waiter.tokens - waiter.used)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str = "interactive", user: str = None, tokens: int = 0):
+        waiter = await self.acquire(priority, user, tokens)
+        try:
+            yield waiter
+        finally:
+            self.release(waiter)
+
+    def stats(self) -> dict:
+        classes = {}
+        for priority in PRIORITIES:
+            waits = sorted(self._waits[priority])
+            classes[priority] = {
+                "waiting": self._waiting[priority],
+                "dispatched": self._dispatched[priority],
+                "avg_wait_ms": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                "p95_wait_ms": round(waits[int(len(waits) * 0.95) - 1], 2) if waits else 0.0,
+                "max_wait_ms": round(self._max_wait[priority], 2),
+            }
+        if self.tokens_per_minute:
+            self._refill()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self._running,
+            "tokens_per_minute": self.tokens_per_minute,
+            "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+            "throttled": self.throttled,
+            "classes": classes,
+        }
+
+
+# Shared by llm_gateway: Groq traffic (with its TPM budget) and the self-hosted
+# Ollama fallback (concurrency cap only)
+llm_scheduler = LLMScheduler()
+ollama_scheduler = LLMScheduler(max_concurrency=OLLAMA_MAX_CONCURRENCY, tokens_per_minute=0)
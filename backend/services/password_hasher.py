@@ -0,0 +1,84 @@
+import os, time, asyncio, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# 🔐 bcrypt executor sizing (override via env)
+BCRYPT_WORKERS = int(os.getenv("AURA_BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+BCRYPT_MAX_PENDING = int(os.getenv("AURA_BCRYPT_MAX_PENDING", "64"))
+_WAIT_SAMPLES = 512
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when more than max_pending hash/verify calls are already waiting."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify on a small dedicated thread pool so the event
+    loop never blocks on them. At most `workers` run at once, at most
+    `max_pending` may be queued or running; beyond that callers get
+    PasswordHasherBusy (→ 503) instead of piling up unbounded.
+    """
+
+    def __init__(self, workers=BCRYPT_WORKERS, max_pending=BCRYPT_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._waits = deque(maxlen=_WAIT_SAMPLES)   # queue wait (ms) of recent calls
+        self.completed = 0
+        self.rejected = 0
+        self.max_wait_ms = 0.0
+        self._total_run_ms = 0.0
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the bcrypt pool and await its result."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy("Too many password operations in progress")
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                done = time.perf_counter()
+                with self._lock:
+                    wait_ms = (started - submitted) * 1000
+                    self._waits.append(wait_ms)
+                    self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+                    self._total_run_ms += (done - started) * 1000
+                    self.completed += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, task)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                "p95_queue_wait_ms": round(waits[int(len(waits) * 0.95) - 1], 2) if waits else 0.0,
+                "max_queue_wait_ms": round(self.max_wait_ms, 2),
+                "avg_run_ms": round(self._total_run_ms / self.completed, 2) if self.completed else 0.0,
+            }
+
+
+# Shared by signup / login
+password_hasher = PasswordHasher()
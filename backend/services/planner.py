@@ -2,7 +2,8 @@ from backend.models.schemas import PlannerRequest, PlannerResponse
 from datetime import date, timedelta, datetime, time as dt_time
 from typing import List, Dict, Any, Tuple
 from zoneinfo import ZoneInfo
-import os, json
+import os
+from backend.utils.serializer import load_file
 
 IST = ZoneInfo("Asia/Kolkata")
 
@@ -34,8 +35,7 @@ def load_existing_tasks() -> Dict[date, List[Tuple[str, str]]]:
             continue
 
         try:
-            with open(os.path.join(base_dir, fname), "r") as f:
-                data = json.load(f)
+            data = load_file(os.path.join(base_dir, fname))
 
             for entry in data.get("schedule", []):
                 d = datetime.fromisoformat(entry["date"]).date()
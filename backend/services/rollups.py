@@ -0,0 +1,191 @@
+from sqlalchemy import select, func, inspect
+from sqlalchemy.dialects.sqlite import insert
+from backend.database import SessionLocal, engine
+from backend.models.entry import SavedEntry
+from backend.models.rollup import DailyRollup, MoodRollup
+from backend.utils.serializer import loads
+
+# ======================================================
+# 📈 Incremental daily rollups
+# ======================================================
+# Every entry_store.add() bumps one DailyRollup row (and one MoodRollup row
+# for moods) inside the same transaction, so stats never need to scan the
+# raw history: reading a day costs one row per module.
+_NEW_TABLES = not inspect(engine).has_table(DailyRollup.__tablename__)
+DailyRollup.__table__.create(bind=engine, checkfirst=True)
+MoodRollup.__table__.create(bind=engine, checkfirst=True)
+
+
+def _attention(entry: dict):
+    try:
+        return float(entry.get("attention_score"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _flashcards(entry: dict) -> int:
+    meta = entry.get("metadata") if isinstance(entry.get("metadata"), dict) else {}
+    if isinstance(meta.get("num_cards"), int):
+        return meta["num_cards"]
+    return len(entry.get("flashcards") or [])
+
+
+# ======================================================
+# ✍️ Writes (called inside the caller's session)
+# ======================================================
+def record(db, module: str, email: str, day: str, entry: dict, llm_calls: int = 0):
+    """Fold one saved entry into its (email, day, module) bucket."""
+    attention = _attention(entry) if module == "focus" else None
+    values = {
+        "email": email or "",
+        "day": day,
+        "module": module,
+        "entries": 1,
+        "attention_sum": attention or 0.0,
+        "attention_count": 1 if attention is not None else 0,
+        "llm_calls": llm_calls,
+        "flashcards": _flashcards(entry) if module == "flashcards" else 0,
+    }
+    stmt = insert(DailyRollup).values(**values)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["email", "day", "module"],
+        set_={
+            col: getattr(DailyRollup, col) + getattr(stmt.excluded, col)
+            for col in ("entries", "attention_sum", "attention_count", "llm_calls", "flashcards")
+        },
+    ))
+
+    mood = entry.get("mood") if module == "mood" else None
+    if mood:
+        stmt = insert(MoodRollup).values(email=email or "", day=day, mood=str(mood), count=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["email", "day", "mood"],
+            set_={"count": MoodRollup.count + stmt.excluded.count},
+        ))
+
+
+def forget(db, module: str, email: str, rows):
+    """
+    Take deleted entries ((timestamp, data) rows, read before deleting) back
+    out of their buckets. A bucket left without entries is dropped, together
+    with its llm_calls (those aren't stored per entry, so can't be split).
+    """
+    email = email or ""
+    per_day = {}
+    for timestamp, data in rows:
+        d = per_day.setdefault(timestamp[:10], {
+            "entries": 0, "attention_sum": 0.0, "attention_count": 0, "flashcards": 0, "moods": {},
+        })
+        d["entries"] += 1
+        if module not in ("focus", "flashcards", "mood"):
+            continue   # nothing beyond the count to take back
+        entry = loads(data)
+        attention = _attention(entry) if module == "focus" else None
+        if attention is not None:
+            d["attention_sum"] += attention
+            d["attention_count"] += 1
+        if module == "flashcards":
+            d["flashcards"] += _flashcards(entry)
+        mood = entry.get("mood") if module == "mood" else None
+        if mood:
+            d["moods"][str(mood)] = d["moods"].get(str(mood), 0) + 1
+
+    for day, d in per_day.items():
+        bucket = [DailyRollup.email == email, DailyRollup.day == day, DailyRollup.module == module]
+        db.query(DailyRollup).filter(*bucket).update({
+            getattr(DailyRollup, col): func.max(getattr(DailyRollup, col) - d[col], 0)
+            for col in ("entries", "attention_sum", "attention_count", "flashcards")
+        }, synchronize_session=False)
+        db.query(DailyRollup).filter(*bucket, DailyRollup.entries <= 0).delete(synchronize_session=False)
+        for mood, count in d["moods"].items():
+            cell = [MoodRollup.email == email, MoodRollup.day == day, MoodRollup.mood == mood]
+            db.query(MoodRollup).filter(*cell).update(
+                {MoodRollup.count: MoodRollup.count - count}, synchronize_session=False)
+            db.query(MoodRollup).filter(*cell, MoodRollup.count <= 0).delete(synchronize_session=False)
+
+
+def rebuild(batch_rows: int = 1000) -> int:
+    """
+    Recompute every rollup from saved_entries (one streaming pass). Returns entries folded.
+    LLM call counts are not stored on entries, so they restart from zero.
+    """
+    folded = 0
+    stmt = select(SavedEntry.module, SavedEntry.email, SavedEntry.timestamp, SavedEntry.data)
+    with SessionLocal() as reader, SessionLocal() as db:
+        db.query(DailyRollup).delete()
+        db.query(MoodRollup).delete()
+        for row in reader.execute(stmt.execution_options(yield_per=batch_rows)):
+            record(db, row.module, row.email, row.timestamp[:10], loads(row.data))
+            folded += 1
+        db.commit()
+    print(f"📈 Rebuilt daily rollups from {folded} entries")
+    return folded
+
+
+# First start with rollups: fold in the history that already exists
+if _NEW_TABLES and inspect(engine).has_table(SavedEntry.__tablename__):
+    rebuild()
+
+
+# ======================================================
+# 📖 Reads (one row per module per day)
+# ======================================================
+def _days(rows, mood_rows) -> list:
+    days = {}
+    for r in rows:
+        d = days.setdefault(r.day, {
+            "day": r.day, "entries": 0, "modules": {}, "llm_calls": 0,
+            "flashcards": 0, "avg_attention": None, "moods": {},
+            "_att": [0.0, 0],
+        })
+        d["entries"] += r.entries
+        if r.entries:
+            d["modules"][r.module] = d["modules"].get(r.module, 0) + r.entries
+        d["llm_calls"] += r.llm_calls
+        d["flashcards"] += r.flashcards
+        d["_att"][0] += r.attention_sum
+        d["_att"][1] += r.attention_count
+    for r in mood_rows:
+        if r.day in days:
+            days[r.day]["moods"][r.mood] = days[r.day]["moods"].get(r.mood, 0) + r.count
+
+    result = []
+    for day in sorted(days, reverse=True):
+        d = days[day]
+        total, count = d.pop("_att")
+        d["avg_attention"] = round(total / count, 2) if count else None
+        result.append(d)
+    return result
+
+
+def _query(filters, start: str = None, end: str = None) -> list:
+    stats = select(
+        DailyRollup.day, DailyRollup.module,
+        func.sum(DailyRollup.entries).label("entries"),
+        func.sum(DailyRollup.attention_sum).label("attention_sum"),
+        func.sum(DailyRollup.attention_count).label("attention_count"),
+        func.sum(DailyRollup.llm_calls).label("llm_calls"),
+        func.sum(DailyRollup.flashcards).label("flashcards"),
+    ).where(*filters(DailyRollup))
+    moods = select(
+        MoodRollup.day, MoodRollup.mood, func.sum(MoodRollup.count).label("count"),
+    ).where(*filters(MoodRollup))
+    if start:
+        stats, moods = stats.where(DailyRollup.day >= start), moods.where(MoodRollup.day >= start)
+    if end:
+        stats, moods = stats.where(DailyRollup.day <= end), moods.where(MoodRollup.day <= end)
+
+    with SessionLocal() as db:
+        rows = db.execute(stats.group_by(DailyRollup.day, DailyRollup.module)).all()
+        mood_rows = db.execute(moods.group_by(MoodRollup.day, MoodRollup.mood)).all()
+    return _days(rows, mood_rows)
+
+
+def user_days(email: str, start: str = None, end: str = None) -> list:
+    """A user's per-day stats in [start, end] (YYYY-MM-DD, inclusive), newest first."""
+    return _query(lambda t: [t.email == (email or "")], start, end)
+
+
+def global_days(start: str = None, end: str = None) -> list:
+    """Per-day stats across all users in [start, end], newest first."""
+    return _query(lambda t: [], start, end)
@@ -0,0 +1,165 @@
+import re, math, heapq
+from collections import Counter
+from sqlalchemy import select, delete, inspect
+from sqlalchemy.dialects.sqlite import insert
+from backend.database import SessionLocal, engine
+from backend.models.entry import SavedEntry
+from backend.models.search import SearchPosting, SearchDoc, SearchStats
+from backend.services import blob_store
+from backend.utils.serializer import loads
+
+# ======================================================
+# 🔎 Per-user full-text index (BM25)
+# ======================================================
+# Postings live in SQLite next to the entries, keyed (email, term, entry_id),
+# so a query reads only the posting lists of its own terms for one user and
+# nothing has to be rebuilt after a restart.
+SEARCH_FIELDS = {
+    "autonote": ("title", "summary", "highlights", "bullets", "transcript"),
+    "doubts": ("topic", "question", "response"),
+    "confusion": ("title", "content"),
+    "chatbot": ("question", "answer"),
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "what", "with", "how", "why",
+}
+
+_NEW_TABLES = not inspect(engine).has_table(SearchPosting.__tablename__)
+for _model in (SearchPosting, SearchDoc, SearchStats):
+    _model.__table__.create(bind=engine, checkfirst=True)
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _text_of(module: str, entry: dict) -> str:
+    # Offloaded transcripts / answers are indexed in full, not just the preview
+    entry = blob_store.hydrate(entry)
+    parts = []
+    for field in SEARCH_FIELDS.get(module, ()):
+        value = entry.get(field)
+        if isinstance(value, list):
+            parts.extend(str(v) for v in value)
+        elif value:
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+# ======================================================
+# ✍️ Incremental indexing (called inside the caller's session)
+# ======================================================
+def index(db, entry_id: int, module: str, email: str, entry: dict):
+    """Add one saved entry to its owner's index. Non-searchable modules are ignored."""
+    if module not in SEARCH_FIELDS:
+        return
+    tokens = tokenize(_text_of(module, entry))
+    if not tokens:
+        return
+
+    email = email or ""
+    db.execute(insert(SearchPosting), [
+        {"email": email, "term": term, "entry_id": entry_id, "tf": tf}
+        for term, tf in Counter(tokens).items()
+    ])
+    db.add(SearchDoc(entry_id=entry_id, email=email, module=module, length=len(tokens)))
+    stmt = insert(SearchStats).values(email=email, docs=1, total_length=len(tokens))
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["email"],
+        set_={
+            "docs": SearchStats.docs + stmt.excluded.docs,
+            "total_length": SearchStats.total_length + stmt.excluded.total_length,
+        },
+    ))
+
+
+def forget(db, entry_ids: list):
+    """Drop entries from the index (e.g. after delete_for_user)."""
+    docs = db.execute(select(SearchDoc).where(SearchDoc.entry_id.in_(entry_ids))).scalars().all()
+    for doc in docs:
+        db.query(SearchStats).filter(SearchStats.email == doc.email).update({
+            SearchStats.docs: SearchStats.docs - 1,
+            SearchStats.total_length: SearchStats.total_length - doc.length,
+        }, synchronize_session=False)
+        db.execute(delete(SearchPosting).where(
+            SearchPosting.email == doc.email, SearchPosting.entry_id == doc.entry_id
+        ))
+        db.delete(doc)
+
+
+def rebuild(batch_rows: int = 1000) -> int:
+    """Re-index every searchable entry from saved_entries. Returns entries indexed."""
+    indexed = 0
+    stmt = select(SavedEntry.id, SavedEntry.module, SavedEntry.email, SavedEntry.data).where(
+        SavedEntry.module.in_(list(SEARCH_FIELDS))
+    )
+    with SessionLocal() as reader, SessionLocal() as db:
+        for model in (SearchPosting, SearchDoc, SearchStats):
+            db.query(model).delete()
+        for row in reader.execute(stmt.execution_options(yield_per=batch_rows)):
+            index(db, row.id, row.module, row.email, loads(row.data))
+            indexed += 1
+        db.commit()
+    print(f"🔎 Indexed {indexed} entries for search")
+    return indexed
+
+
+# First start with search: index the history that already exists
+if _NEW_TABLES and inspect(engine).has_table(SavedEntry.__tablename__):
+    rebuild()
+
+
+# ======================================================
+# 📖 Queries
+# ======================================================
+def search(email: str, query: str, limit: int = 20, modules: set = None) -> list:
+    """Top-`limit` BM25 matches in one user's entries: [{"module", "score", "entry"}]."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    email = email or ""
+
+    with SessionLocal() as db:
+        stats = db.get(SearchStats, email)
+        if not stats or stats.docs <= 0:
+            return []
+        avg_len = stats.total_length / stats.docs
+
+        postings = db.execute(
+            select(SearchPosting.term, SearchPosting.entry_id, SearchPosting.tf)
+            .where(SearchPosting.email == email, SearchPosting.term.in_(terms))
+        ).all()
+        if not postings:
+            return []
+
+        doc_filter = [SearchDoc.entry_id.in_({p.entry_id for p in postings})]
+        if modules:
+            doc_filter.append(SearchDoc.module.in_(list(modules)))
+        docs = {
+            d.entry_id: (d.module, d.length)
+            for d in db.execute(select(SearchDoc.entry_id, SearchDoc.module, SearchDoc.length).where(*doc_filter))
+        }
+
+        df = Counter(p.term for p in postings)
+        scores = {}
+        for p in postings:
+            if p.entry_id not in docs:
+                continue
+            idf = math.log(1 + (stats.docs - df[p.term] + 0.5) / (df[p.term] + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * docs[p.entry_id][1] / avg_len)
+            scores[p.entry_id] = scores.get(p.entry_id, 0.0) + idf * p.tf * (BM25_K1 + 1) / (p.tf + norm)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+        data = dict(db.execute(
+            select(SavedEntry.id, SavedEntry.data).where(SavedEntry.id.in_([entry_id for entry_id, _ in top]))
+        ).all())
+
+    return [
+        {"module": docs[entry_id][0], "score": round(score, 4), "entry": loads(data[entry_id])}
+        for entry_id, score in top if entry_id in data
+    ]
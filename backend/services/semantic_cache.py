@@ -0,0 +1,224 @@
+import os, re, math, time, zlib, threading
+from collections import Counter, deque
+import numpy as np
+from sqlalchemy import select, delete
+from backend.database import SessionLocal, engine
+from backend.models.llm_cache import SemanticCacheEntry
+from backend.services.llm_cache import bypassed
+
+# ======================================================
+# 🧲 Near-duplicate question cache (TF-IDF + cosine)
+# ======================================================
+# Paraphrased doubts ("what is polymorphism" / "explain polymorphism")
+# reuse an earlier explanation instead of another Groq call. Questions are
+# hashed into fixed-size TF vectors, weighted by IDF at query time and
+# compared with one NumPy mat-vec — no model download, fully offline.
+# Hashing lets different words share a bucket ("interpreter" / "array"),
+# so a cosine match is only served when the two questions also share
+# enough actual tokens.
+SEMANTIC_CACHE_ENABLED = os.getenv("AURA_SEMANTIC_CACHE", "on").lower() not in ("0", "off", "false")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("AURA_SEMANTIC_CACHE_THRESHOLD", "0.75"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("AURA_SEMANTIC_CACHE_SIZE", "2000"))   # per scope
+SEMANTIC_CACHE_MIN_OVERLAP = float(os.getenv("AURA_SEMANTIC_CACHE_MIN_OVERLAP", "0.5"))   # token Jaccard
+SEMANTIC_CACHE_DIM = 1024
+SEMANTIC_CACHE_CANDIDATES = 5   # best cosine rows checked for token overlap
+_SEARCH_SAMPLES = 512
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# search_index's stopwords plus the filler students wrap questions in
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "what", "with", "how", "why",
+    "explain", "define", "definition", "describe", "meaning", "mean", "means", "concept",
+    "simple", "simply", "please", "can", "you", "me", "tell", "about", "does", "do", "i",
+    "understand", "explained", "explanation", "explaining", "example", "examples", "detail", "detailed", "way", "terms",
+}
+
+SemanticCacheEntry.__table__.create(bind=engine, checkfirst=True)
+
+
+def tokenize(text: str) -> list:
+    tokens = []
+    for t in _TOKEN_RE.findall(str(text or "").lower()):
+        if len(t) < 2 or t in _STOPWORDS:
+            continue
+        if len(t) > 3 and t.endswith("s") and not t.endswith("ss"):
+            t = t[:-1]   # crude plural folding: "objects" ~ "object"
+        tokens.append(t)
+    return tokens
+
+
+def vectorize(text: str):
+    """Sublinear TF vector over hashed buckets, or None when nothing is left after stopwords."""
+    return _vector(tokenize(text))
+
+
+def _vector(tokens: list):
+    counts = Counter(zlib.crc32(t.encode("utf-8")) % SEMANTIC_CACHE_DIM for t in tokens)
+    if not counts:
+        return None
+    vec = np.zeros(SEMANTIC_CACHE_DIM, dtype=np.float32)
+    for bucket, tf in counts.items():
+        vec[bucket] = 1.0 + math.log(tf)
+    return vec
+
+
+def overlap(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two token sets."""
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class _ScopeIndex:
+    """TF rows for one scope, grown by doubling; document frequencies kept in step."""
+
+    def __init__(self):
+        self.ids, self.answers, self.tokens = [], [], []   # tokens: frozenset per row
+        self.matrix = np.zeros((64, SEMANTIC_CACHE_DIM), dtype=np.float32)
+        self.df = np.zeros(SEMANTIC_CACHE_DIM, dtype=np.int32)
+        self._norms = None   # row norms under the current IDF (dropped on every change)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, entry_id: int, answer: str, tokens: frozenset, vec):
+        n = len(self.ids)
+        if n == self.matrix.shape[0]:
+            grown = np.zeros((n * 2, SEMANTIC_CACHE_DIM), dtype=np.float32)
+            grown[:n] = self.matrix
+            self.matrix = grown
+        self.matrix[n] = vec
+        self.df += vec > 0
+        self.ids.append(entry_id)
+        self.answers.append(answer)
+        self.tokens.append(tokens)
+        self._norms = None
+
+    def drop_oldest(self, count: int):
+        keep = self.matrix[count:len(self.ids)]
+        self.matrix = np.zeros((max(64, keep.shape[0] * 2), SEMANTIC_CACHE_DIM), dtype=np.float32)
+        self.matrix[:keep.shape[0]] = keep
+        self.df = (keep > 0).sum(axis=0).astype(np.int32)
+        del self.ids[:count], self.answers[:count], self.tokens[:count]
+        self._norms = None
+
+    def best(self, vec, tokens: frozenset, threshold: float, min_overlap: float):
+        """
+        (similarity, row) of the closest stored question that clears both
+        the cosine threshold and the token overlap; row is -1 if none does.
+        """
+        n = len(self.ids)
+        if not n:
+            return 0.0, -1
+        idf = np.log((1.0 + n) / (1.0 + self.df)).astype(np.float32) + 1.0
+        idf2 = idf * idf
+        rows = self.matrix[:n]
+        if self._norms is None:
+            self._norms = np.sqrt((rows * rows) @ idf2)
+        q_norm = float(np.sqrt((vec * vec) @ idf2))
+        scores = (rows @ (vec * idf2)) / (self._norms * q_norm + 1e-9)
+        k = min(SEMANTIC_CACHE_CANDIDATES, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        for row in top[np.argsort(-scores[top])]:
+            score = float(scores[row])
+            if score < threshold:
+                break
+            if overlap(tokens, self.tokens[row]) >= min_overlap:
+                return score, int(row)
+        return float(scores[top].max()), -1
+
+
+class SemanticCache:
+    """
+    One in-memory index per scope ("doubts", "confusion"), loaded lazily
+    from the semantic_cache table. Beyond max_entries the oldest tenth of
+    a scope is dropped (from memory and disk) in one go.
+    """
+
+    def __init__(self, threshold=SEMANTIC_CACHE_THRESHOLD, max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+                 enabled=SEMANTIC_CACHE_ENABLED, min_overlap=SEMANTIC_CACHE_MIN_OVERLAP):
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._scopes = {}
+        self._search_ms = deque(maxlen=_SEARCH_SAMPLES)
+        self.lookups = 0
+        self.hits = 0
+        self.adds = 0
+
+    def _scope(self, scope: str) -> _ScopeIndex:
+        index = self._scopes.get(scope)
+        if index is None:
+            index = self._scopes[scope] = _ScopeIndex()
+            stmt = (select(SemanticCacheEntry.id, SemanticCacheEntry.question, SemanticCacheEntry.answer)
+                    .where(SemanticCacheEntry.scope == scope)
+                    .order_by(SemanticCacheEntry.id.desc()).limit(self.max_entries))
+            with SessionLocal() as db:
+                rows = db.execute(stmt).all()
+            for entry_id, question, answer in reversed(rows):
+                tokens = tokenize(question)
+                vec = _vector(tokens)
+                if vec is not None:
+                    index.add(entry_id, answer, frozenset(tokens), vec)
+        return index
+
+    def lookup(self, scope: str, question: str):
+        """(answer, similarity) of a near-duplicate question, or None."""
+        if not self.enabled or bypassed():
+            return None
+        tokens = tokenize(question)
+        vec = _vector(tokens)
+        if vec is None:
+            return None
+        started = time.perf_counter()
+        with self._lock:
+            index = self._scope(scope)
+            score, row = index.best(vec, frozenset(tokens), self.threshold, self.min_overlap)
+            answer = index.answers[row] if row >= 0 else None
+            self.lookups += 1
+            self.hits += answer is not None
+            self._search_ms.append((time.perf_counter() - started) * 1000)
+        return (answer, round(score, 4)) if answer is not None else None
+
+    def add(self, scope: str, question: str, answer: str):
+        """Remember a freshly generated explanation for future paraphrases."""
+        if not self.enabled or not answer:
+            return
+        tokens = tokenize(question)
+        vec = _vector(tokens)
+        if vec is None:
+            return
+        with self._lock, SessionLocal() as db:
+            index = self._scope(scope)
+            row = SemanticCacheEntry(scope=scope, question=question, answer=answer, created_at=time.time())
+            db.add(row)
+            db.flush()
+            index.add(row.id, answer, frozenset(tokens), vec)
+            if len(index) > self.max_entries:
+                drop = max(1, self.max_entries // 10)
+                cutoff = index.ids[drop]
+                db.execute(delete(SemanticCacheEntry).where(SemanticCacheEntry.scope == scope,
+                                                            SemanticCacheEntry.id < cutoff))
+                index.drop_oldest(drop)
+            db.commit()
+            self.adds += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sorted(self._search_ms)
+            return {
+                "enabled": self.enabled,
+                "threshold": self.threshold,
+            "min_overlap": self.min_overlap,
+                "entries": {scope: len(index) for scope, index in self._scopes.items()},
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "adds": self.adds,
+                "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                "avg_search_ms": round(sum(samples) / len(samples), 3) if samples else 0.0,
+            }
+
+
+# Shared by the doubts and confusion routers
+semantic_cache = SemanticCache()
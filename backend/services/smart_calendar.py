@@ -1,34 +1,25 @@
-import os, json
 from datetime import datetime
+from backend.services import entry_store
 
-# 🧭 Compute absolute base path (3 levels up from /backend/services/)
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 📁 Smart Study Calendar entries live in the shared entry store (module "calendar"),
+# the same rows routers/calendar.py serves; the old study_calendar.json is imported there.
+CALENDAR_MODULE = "calendar"
 
-# 📁 Smart Study Calendar Directory
-CALENDAR_DIR = os.path.join(BASE_DIR, "saved_files", "calendar")
-CALENDAR_PATH = os.path.join(CALENDAR_DIR, "study_calendar.json")
-os.makedirs(CALENDAR_DIR, exist_ok=True)
 
+def load_calendar(email: str):
+    """📚 Load a user's saved study sessions (newest first)."""
+    return entry_store.page_for_user(CALENDAR_MODULE, email)["entries"]
 
-def load_calendar():
-    """📚 Load saved study sessions from local Smart Calendar file."""
-    if not os.path.exists(CALENDAR_PATH):
-        with open(CALENDAR_PATH, "w", encoding="utf-8") as f:
-            json.dump([], f)
-    with open(CALENDAR_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
 
-
-def save_to_calendar(schedule):
+def save_to_calendar(schedule, email: str):
     """
     ✅ Save structured study schedule into Smart Study Calendar.
     Each block now includes start_time, end_time, difficulty, and due.
     """
-    calendar = load_calendar()
-
     for day in schedule:
         for block in day.get("blocks", []):
             entry = {
+                "email": email,
                 "date": day.get("date"),
                 "task": block.get("task"),
                 "subject": block.get("subject", "General"),
@@ -39,22 +30,17 @@ def save_to_calendar(schedule):
                 "due": block.get("due"),
                 "timestamp": datetime.utcnow().isoformat(),
             }
-            calendar.append(entry)
-
-    with open(CALENDAR_PATH, "w", encoding="utf-8") as f:
-        json.dump(calendar, f, indent=2)
+            entry_store.add(CALENDAR_MODULE, email, entry)
 
     return {"status": "success", "count": len(schedule)}
 
 
-def list_calendar():
-    """📅 Return all saved Smart Calendar entries."""
-    data = load_calendar()
-    return {"entries": data}
+def list_calendar(email: str):
+    """📅 Return all of a user's saved Smart Calendar entries."""
+    return {"entries": load_calendar(email)}
 
 
-def clear_calendar():
-    """🧹 Clear all saved Smart Calendar entries."""
-    with open(CALENDAR_PATH, "w", encoding="utf-8") as f:
-        json.dump([], f)
+def clear_calendar(email: str):
+    """🧹 Clear a user's saved Smart Calendar entries."""
+    entry_store.delete_for_user(CALENDAR_MODULE, email)
     return {"status": "cleared"}
@@ -1,9 +1,12 @@
+import asyncio, threading
 from typing import List
 from transformers import pipeline
 from backend.utils.save_helper import save_entry  # ✅ Unified logger for Smart Study
+from backend.utils.chunker import chunk_text
 
-# Lazy global summarization model
+# Lazy global summarization model (one inference at a time, off the event loop)
 _summarizer = None
+_summarizer_lock = threading.Lock()
 
 
 def _get_summarizer():
@@ -11,8 +14,9 @@ def _get_summarizer():
     Lazy-load a small summarization model to reduce startup time and memory footprint.
     """
     global _summarizer
-    if _summarizer is None:
-        _summarizer = pipeline("summarization", model="t5-small")
+    with _summarizer_lock:
+        if _summarizer is None:
+            _summarizer = pipeline("summarization", model="t5-small")
     return _summarizer
 
 
@@ -48,13 +52,17 @@ def process_transcript(text: str, emphasize_keywords: List[str]):
     Automatically logs the result in Smart Study timeline.
     """
     summarizer = _get_summarizer()
-    chunk = text[:2000]  # limit text size for small model
+    # Whole sentences packed into the model's 512-token window, counted with its own tokenizer
+    count_tokens = lambda s: len(summarizer.tokenizer.encode(s, add_special_tokens=False))
+    chunks = list(chunk_text(text, "t5-small", count_tokens=count_tokens)) or [text]
 
     # --- Summarize ---
     try:
-        summary = summarizer(chunk, max_length=120, min_length=40, do_sample=False)[0]["summary_text"]
+        with _summarizer_lock:
+            results = summarizer(chunks, max_length=120, min_length=40, do_sample=False, truncation=True)
+        summary = " ".join(r["summary_text"].strip() for r in results)
     except Exception:
-        summary = chunk[:300]
+        summary = chunks[0][:300]
 
     # --- Extract insights ---
     bullets = simple_bullets(text)
@@ -78,3 +86,11 @@ def process_transcript(text: str, emphasize_keywords: List[str]):
         print(f"⚠️ Failed to save transcript summary log: {e}")
 
     return {"summary": summary, "highlights": highlights, "bullets": bullets}
+
+
+async def process_transcript_async(text: str, emphasize_keywords: List[str]):
+    """
+    process_transcript() for async handlers: t5 inference (and the first
+    model load) runs in a worker thread so the event loop keeps serving.
+    """
+    return await asyncio.to_thread(process_transcript, text, emphasize_keywords)
@@ -0,0 +1,95 @@
+import os, time, hashlib, threading
+from collections import OrderedDict
+from backend.services.user_directory import user_directory
+
+# 🎟️ Verified-token cache sizing (override via env)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AURA_TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("AURA_TOKEN_CACHE_TTL", "300"))
+
+
+class TokenCache:
+    """
+    Maps sha256(token) → resolved user so a JWT that was already verified is
+    not decoded and looked up again. An entry lives until the earlier of its
+    TTL and the token's own exp, is dropped as soon as the user directory
+    changes, and the oldest entries are evicted beyond max_entries.
+    Raw tokens are never kept in memory.
+    """
+
+    def __init__(self, max_entries=TOKEN_CACHE_MAX_ENTRIES, ttl=TOKEN_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # digest -> (user, expires_at, directory_version)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str):
+        """Return the cached user for token, or None on a miss."""
+        digest = self._digest(token)
+        version = user_directory.current_version()
+        with self._lock:
+            cached = self._entries.get(digest)
+            if cached is None:
+                self.misses += 1
+                return None
+            user, expires_at, cached_version = cached
+            if time.time() >= expires_at:
+                del self._entries[digest]
+                self.expired += 1
+                self.misses += 1
+                return None
+            if cached_version != version:
+                del self._entries[digest]
+                self.invalidated += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: dict, exp=None):
+        """Remember a verified token. exp is the JWT's expiry (seconds since epoch)."""
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+        digest = self._digest(token)
+        version = user_directory.current_version()
+        with self._lock:
+            self._entries[digest] = (user, expires_at, version)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "invalidated": self.invalidated,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# Shared by get_current_user
+token_cache = TokenCache()
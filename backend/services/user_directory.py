@@ -0,0 +1,121 @@
+import os, threading
+from backend.utils.file_cache import file_signature
+from backend.utils.serializer import dump_file, load_file
+
+# ======================================================
+# 👥 One user directory for password and Google logins
+# ======================================================
+USER_FILE = os.path.join(os.path.dirname(__file__), "..", "users.json")
+# Google logins used to write their own list here; merged in once
+LEGACY_GOOGLE_USERS_FILE = os.path.join("saved_files", "users.json")
+
+
+class UserDirectory:
+    """
+    users.json held in memory with a hash index on the lower-cased email.
+    Lookups are O(1); the file is re-read only when its (mtime, size, inode)
+    changes, so other worker processes' signups are still picked up.
+    Returned user dicts are shared: treat them as read-only.
+    """
+
+    def __init__(self, path: str = USER_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._users = []
+        self._by_email = {}
+        self._sig = None
+        self.version = 0   # bumped on every change (for caches keyed on users)
+
+    # ---------- loading ----------
+    def _reload_if_changed(self):
+        sig = file_signature(self.path)
+        if sig == self._sig:
+            return
+        with self._lock:
+            sig = file_signature(self.path)
+            if sig == self._sig:
+                return
+            try:
+                users = load_file(self.path) if sig else []
+            except (ValueError, UnicodeDecodeError):
+                print(f"⚠️ Could not parse {self.path}; keeping the users already loaded")
+                return
+            self._index(users if isinstance(users, list) else [])
+            self._sig = sig
+            self.version += 1
+
+    def _index(self, users: list):
+        self._users = users
+        self._by_email = {u["email"].lower(): u for u in users if u.get("email")}
+
+    def _save(self):
+        dump_file(self.path, self._users)
+        self._sig = file_signature(self.path)
+        self.version += 1
+
+    # ---------- lookups ----------
+    def get(self, email: str):
+        """Return the user with this email (case-insensitive) or None."""
+        if not email:
+            return None
+        self._reload_if_changed()
+        return self._by_email.get(email.lower())
+
+    def current_version(self) -> int:
+        """Version of the directory after picking up any on-disk change."""
+        self._reload_if_changed()
+        return self.version
+
+    def __len__(self):
+        self._reload_if_changed()
+        return len(self._users)
+
+    # ---------- writes ----------
+    def add(self, user: dict) -> dict:
+        """Insert a new user. Raises ValueError if the email is already registered."""
+        with self._lock:
+            self._reload_if_changed()
+            key = user["email"].lower()
+            if key in self._by_email:
+                raise ValueError("Email already registered")
+            self._users = self._users + [user]
+            self._by_email[key] = user
+            self._save()
+        return user
+
+    def get_or_create(self, email: str, defaults: dict) -> dict:
+        """Return the existing user or create one from defaults (atomic under the lock)."""
+        with self._lock:
+            existing = self.get(email)
+            if existing:
+                return existing
+            return self.add({"email": email, **defaults})
+
+    def merge_file(self, path: str) -> int:
+        """One-shot import of another users.json; the source is renamed to .merged."""
+        if not os.path.exists(path) or os.path.abspath(path) == os.path.abspath(self.path):
+            return 0
+        try:
+            others = load_file(path)
+        except (ValueError, UnicodeDecodeError):
+            others = []
+        added = 0
+        with self._lock:
+            self._reload_if_changed()
+            for user in others if isinstance(others, list) else []:
+                if user.get("email") and user["email"].lower() not in self._by_email:
+                    self._users = self._users + [user]
+                    self._by_email[user["email"].lower()] = user
+                    added += 1
+            if added:
+                self._save()
+        os.replace(path, path + ".merged")
+        print(f"👥 Merged {added} user(s) from {path}")
+        return added
+
+
+# Shared by auth.py and auth_google.py
+user_directory = UserDirectory()
+if not os.path.exists(USER_FILE):
+    dump_file(USER_FILE, [])
+user_directory.merge_file(LEGACY_GOOGLE_USERS_FILE)
@@ -0,0 +1,136 @@
+import os, re
+
+# ======================================================
+# ✂️ Token-budgeted text chunking for LLM inputs
+# ======================================================
+# Splits on paragraph, then sentence boundaries and packs as many whole
+# units as fit a model's token budget, with a few sentences of overlap
+# between neighbours. Works lazily, so a 500-page PDF never has to be
+# held as a list of chunks.
+CHARS_PER_TOKEN = 4          # rough English average for Llama / GPT tokenizers
+DEFAULT_TOKEN_BUDGET = int(os.getenv("AURA_CHUNK_TOKENS", "3000"))
+DEFAULT_OVERLAP_TOKENS = int(os.getenv("AURA_CHUNK_OVERLAP_TOKENS", "100"))
+
+# Input tokens per chunk, leaving room for the prompt and the answer
+MODEL_TOKEN_BUDGETS = {
+    "llama-3.1-8b-instant": DEFAULT_TOKEN_BUDGET,
+    "llama-3.3-70b-versatile": DEFAULT_TOKEN_BUDGET,
+    "llama-3.1-70b-versatile": DEFAULT_TOKEN_BUDGET,
+    "t5-small": 480,          # 512-token encoder
+}
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?。])[\"')\]]*\s+")
+_WS_RE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer download): ~4 chars or ~0.75 words per token."""
+    return max(len(text) // CHARS_PER_TOKEN, int(len(text.split()) * 4 / 3), 1 if text else 0)
+
+
+def token_budget(model: str = None) -> int:
+    return MODEL_TOKEN_BUDGETS.get(model or "", DEFAULT_TOKEN_BUDGET)
+
+
+def _paragraphs(source):
+    """Paragraphs of a str or of an iterable of str pieces (pages, file lines), lazily."""
+    if isinstance(source, str):
+        source = (source,)
+    pending = ""
+    for piece in source:
+        pending += piece
+        start = 0
+        for match in _PARAGRAPH_RE.finditer(pending):
+            yield pending[start:match.start()]
+            start = match.end()
+        pending = pending[start:]
+    if pending:
+        yield pending
+
+
+def _split_long(sentence: str, max_tokens: int, count_tokens):
+    """
+    A sentence bigger than the whole budget is cut on word boundaries.
+    Each part is the longest run of words that fits, found by binary
+    search (every word is at least one token, so a part never has more
+    than max_tokens words): O(n log max_tokens) instead of re-counting
+    a growing prefix word by word.
+    """
+    words, start = sentence.split(" "), 0
+    while start < len(words):
+        lo, hi = 1, min(max_tokens, len(words) - start)   # a single word always goes out, even if too big
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if count_tokens(" ".join(words[start:start + mid])) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        yield " ".join(words[start:start + lo])
+        start += lo
+
+
+def _units(source, max_tokens: int, count_tokens):
+    """(text, tokens, starts_paragraph) for every sentence, in order."""
+    for paragraph in _paragraphs(source):
+        paragraph = _WS_RE.sub(" ", paragraph).strip()
+        if not paragraph:
+            continue
+        first = True
+        for sentence in _SENTENCE_RE.split(paragraph):
+            if not sentence:
+                continue
+            tokens = count_tokens(sentence)
+            pieces = _split_long(sentence, max_tokens, count_tokens) if tokens > max_tokens else (sentence,)
+            for piece in pieces:
+                yield piece, (tokens if piece is sentence else count_tokens(piece)), first
+                first = False
+
+
+def _join(units) -> str:
+    text = ""
+    for sentence, _, new_paragraph in units:
+        text += ("\n\n" if new_paragraph else " ") + sentence if text else sentence
+    return text
+
+
+def chunk_text(source, model: str = None, max_tokens: int = None, overlap_tokens: int = None,
+               count_tokens=estimate_tokens):
+    """
+    Yield chunks of at most max_tokens (default: the model's budget).
+    source is a str or any iterable of str; count_tokens can be a real
+    tokenizer's length function. Each chunk starts with up to
+    overlap_tokens of trailing sentences from the previous one.
+    """
+    max_tokens = max_tokens or token_budget(model)
+    overlap_tokens = DEFAULT_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    overlap_tokens = min(overlap_tokens, max_tokens // 4)
+
+    current, used, fresh = [], 0, 0   # fresh = units not carried over from the previous chunk
+    for unit in _units(source, max_tokens, count_tokens):
+        tokens = unit[1]
+        # Prefer to close a well-filled chunk at a paragraph break
+        paragraph_break = unit[2] and used >= max_tokens * 0.75
+        if current and fresh and (used + tokens > max_tokens or paragraph_break):
+            yield _join(current)
+            carried, carried_tokens = [], 0
+            for prev in reversed(current):
+                if carried_tokens + prev[1] > overlap_tokens:
+                    break
+                carried.insert(0, prev)
+                carried_tokens += prev[1]
+            while carried and carried_tokens + tokens > max_tokens:
+                carried_tokens -= carried.pop(0)[1]
+            # The carried sentences no longer open a paragraph in the new chunk
+            current = [(s, t, False) for s, t, _ in carried]
+            used, fresh = carried_tokens, 0
+        current.append(unit)
+        used += tokens
+        fresh += 1
+    if fresh:
+        yield _join(current)
+
+
+def first_chunk(source, model: str = None, **kwargs) -> str:
+    """The leading chunk that fits the model's budget (for single-call prompts)."""
+    return next(chunk_text(source, model, **kwargs), "")
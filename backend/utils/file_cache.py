@@ -0,0 +1,141 @@
+import os, threading
+from collections import OrderedDict
+from backend.utils.serializer import dump_file, load_file
+
+# 🧠 Parsed-file cache budget (approximate, measured in on-disk bytes)
+FILE_CACHE_MAX_BYTES = int(os.getenv("AURA_FILE_CACHE_MB", "64")) * 1024 * 1024
+
+
+def file_signature(path: str):
+    """(mtime, size, inode) — any change means the cached parse is stale."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileCache:
+    """
+    In-process cache of parsed data files, validated against the file's
+    (mtime, size, inode) on every read and evicted LRU within a byte budget.
+    Cached objects are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, max_bytes: int = FILE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (signature, content)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, path: str, loader, default=None):
+        """Return the parsed content of path, re-parsing only if the file changed."""
+        path = os.path.abspath(path)
+        sig = file_signature(path)
+        if sig is None:
+            self.invalidate(path)
+            return default
+
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached and cached[0] == sig:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        content = loader(path)
+        self._put(path, sig, content)
+        return content
+
+    def store(self, path: str, content):
+        """Writers call this right after writing so the next read is a hit."""
+        path = os.path.abspath(path)
+        sig = file_signature(path)
+        if sig is not None:
+            self._put(path, sig, content)
+
+    def append(self, path: str, before_sig, records: list, added_bytes: int):
+        """
+        Mirror an append into the cached list in place. Only applied when the
+        cache was current before the write and the file grew by exactly our
+        bytes — otherwise someone else wrote too and we just drop the entry.
+        """
+        path = os.path.abspath(path)
+        after_sig = file_signature(path)
+        with self._lock:
+            cached = self._entries.get(path)
+            if not cached:
+                return
+            if (
+                cached[0] == before_sig
+                and after_sig is not None
+                and after_sig[1] == before_sig[1] + added_bytes
+                and isinstance(cached[1], list)
+            ):
+                cached[1].extend(records)
+                self._entries[path] = (after_sig, cached[1])
+                self._bytes += added_bytes
+                self._evict()
+            else:
+                self._drop(path)
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._drop(os.path.abspath(path))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    # ---------- internals ----------
+    def _put(self, path, sig, content):
+        with self._lock:
+            self._drop(path)
+            if sig[1] > self.max_bytes:
+                return
+            self._entries[path] = (sig, content)
+            self._bytes += sig[1]
+            self._evict()
+
+    # _drop / _evict expect the lock to be held
+    def _drop(self, path):
+        cached = self._entries.pop(path, None)
+        if cached:
+            self._bytes -= cached[0][1]
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (sig, _) = self._entries.popitem(last=False)
+            self._bytes -= sig[1]
+            self.evictions += 1
+
+
+# Shared instance used by every router and helper
+file_cache = FileCache()
+
+
+def load_json(path: str, default=None):
+    """Cached document load — falls back to default if the file is missing or corrupt."""
+    try:
+        return file_cache.load(path, load_file, default)
+    except (ValueError, UnicodeDecodeError):
+        return default
+
+
+def write_json(path: str, data):
+    """Atomically write a document (compact, configured format) and refresh the cached copy."""
+    dump_file(path, data)
+    file_cache.store(path, data)
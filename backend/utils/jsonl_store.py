@@ -0,0 +1,125 @@
+import os, threading
+from backend.utils.file_cache import file_cache, file_signature
+from backend.utils.serializer import dumps_lines, loads, load_file
+
+# 🔒 One lock per process keeps concurrent appends from interleaving lines
+_LOCK = threading.Lock()
+
+
+def jsonl_path(path: str) -> str:
+    """Return the .jsonl twin of a legacy .json file path."""
+    base, ext = os.path.splitext(path)
+    return path if ext == ".jsonl" else base + ".jsonl"
+
+
+def migrate_array_file(path: str) -> str:
+    """
+    One-shot migration of a legacy JSON-array file to JSON Lines.
+    The original is kept next to it as <name>.json.migrated.
+    Returns the .jsonl path (safe to call repeatedly).
+    """
+    target = jsonl_path(path)
+    if target == path or os.path.exists(target) or not os.path.exists(path):
+        return target
+
+    with _LOCK:
+        if os.path.exists(target):
+            return target
+        try:
+            data = load_file(path)
+        except (ValueError, UnicodeDecodeError):
+            data = []
+        if not isinstance(data, list):
+            data = [data]
+
+        tmp = target + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(dumps_lines(data))
+        os.replace(tmp, target)
+        os.replace(path, path + ".migrated")
+
+    print(f"📦 Migrated {len(data)} records: {path} → {target}")
+    return target
+
+
+def init_store(path: str) -> str:
+    """Ensure the store's folder and .jsonl file exist (migrating a legacy array if present)."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    target = migrate_array_file(path)
+    if not os.path.exists(target):
+        open(target, "a", encoding="utf-8").close()
+    return target
+
+
+def append_record(path: str, entry: dict):
+    """Append one record as a single JSON line — O(1) regardless of history size."""
+    append_records(path, [entry])
+
+
+def append_records(path: str, entries: list):
+    """Append a batch of records with a single write call."""
+    if not entries:
+        return
+    data = dumps_lines(entries)
+    with _LOCK:
+        before = file_signature(path)
+        with open(path, "ab") as f:
+            f.write(data)
+        if before is not None:
+            file_cache.append(path, before, entries, len(data))
+
+
+def iter_records(path: str):
+    """Stream records line by line. Torn or corrupt lines are skipped."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                continue
+
+
+def read_records(path: str) -> list:
+    """Load every record of a store (cached until the file changes — treat as read-only)."""
+    return file_cache.load(path, lambda p: list(iter_records(p)), [])
+
+
+def last_record(path: str, block_size: int = 4096):
+    """Return the newest record by reading backwards from the end of the file."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            lines = buf.rstrip(b"\n").split(b"\n")
+            # Need one complete line (or to have reached the start of the file)
+            if len(lines) > 1 or pos == 0:
+                for raw in reversed(lines if pos == 0 else lines[1:]):
+                    try:
+                        return loads(raw)
+                    except ValueError:
+                        continue
+    return None
+
+
+def rewrite_records(path: str, records: list):
+    """Atomically replace the whole store (used for deletes)."""
+    tmp = path + ".tmp"
+    with _LOCK:
+        with open(tmp, "wb") as f:
+            f.write(dumps_lines(records))
+        os.replace(tmp, path)
+        file_cache.store(path, list(records))
@@ -0,0 +1,27 @@
+from fastapi.responses import StreamingResponse
+from backend.utils.pagination import NDJSON_MEDIA_TYPE
+
+# Lines are coalesced into chunks of about this size before being sent
+NDJSON_CHUNK_BYTES = 64 * 1024
+
+
+def _chunks(lines):
+    """First record goes out on its own (fast first byte), the rest in ~64 KiB chunks."""
+    buf, size, first = [], 0, True
+    for line in lines:
+        buf.append(line + "\n")
+        size += len(line) + 1
+        if first or size >= NDJSON_CHUNK_BYTES:
+            yield "".join(buf)
+            buf, size, first = [], 0, False
+    if buf:
+        yield "".join(buf)
+
+
+def ndjson_response(lines) -> StreamingResponse:
+    """
+    Stream an iterable of JSON strings (one record each) as application/x-ndjson.
+    Sync iterables are consumed in Starlette's threadpool, so a generator that
+    reads straight from the database never blocks the event loop.
+    """
+    return StreamingResponse(_chunks(lines), media_type=NDJSON_MEDIA_TYPE)
@@ -2,11 +2,16 @@
 import os
 import time
 import requests
+import httpx
 
 OLLAMA_BASE = os.getenv("OLLAMA_URL", "https://ollama-railway-hr3a.onrender.com")
 OLLAMA_GENERATE = OLLAMA_BASE.rstrip("/") + "/api/generate"
 OLLAMA_PULL = OLLAMA_BASE.rstrip("/") + "/api/pull"
+OLLAMA_CHAT = OLLAMA_BASE.rstrip("/") + "/api/chat"
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "phi3:mini")  # <-- default model name, override via env
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("AURA_OLLAMA_MAX_CONNECTIONS", "8"))
+
+_async_client = None
 
 def ensure_model_loaded(model_name: str = None, timeout_seconds: int = 600):
     """
@@ -39,3 +44,37 @@ def query_ollama(prompt: str, model_name: str = None, timeout: int = 120):
     if r.status_code != 200:
         raise ValueError(f"Ollama returned {r.status_code}: {r.text}")
     return r.json()
+
+
+def _client() -> httpx.AsyncClient:
+    """Pooled async HTTP client, created on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=OLLAMA_MAX_CONNECTIONS, max_keepalive_connections=OLLAMA_MAX_CONNECTIONS),
+            timeout=httpx.Timeout(120.0, connect=10.0),
+        )
+    return _async_client
+
+async def chat_ollama(messages, model_name: str = None, temperature: float = None, max_tokens: int = None, timeout: float = 120):
+    """
+    Async chat completion via POST /api/chat; returns the reply text.
+    Raises httpx.HTTPError on network errors, ValueError if Ollama returns non-200.
+    """
+    model = model_name or OLLAMA_MODEL
+    options = {}
+    if temperature is not None:
+        options["temperature"] = temperature
+    if max_tokens:
+        options["num_predict"] = max_tokens
+    payload = {"model": model, "messages": messages, "stream": False, "options": options}
+    r = await _client().post(OLLAMA_CHAT, json=payload, timeout=timeout)
+    if r.status_code != 200:
+        raise ValueError(f"Ollama returned {r.status_code}: {r.text}")
+    return (r.json().get("message") or {}).get("content") or ""
+
+async def aclose():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
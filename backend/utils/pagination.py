@@ -0,0 +1,67 @@
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import Query, HTTPException, Request
+
+MAX_PAGE_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@dataclass
+class PageParams:
+    """Keyset page request shared by every saved-history endpoint."""
+    limit: Optional[int] = None          # None = whole history (legacy clients)
+    cursor: Optional[tuple] = None       # (timestamp, id) of the last row already served
+    since: Optional[str] = None          # inclusive ISO-8601 lower bound
+    until: Optional[str] = None          # exclusive ISO-8601 upper bound
+    stream: bool = False                 # client sent Accept: application/x-ndjson
+    expand: bool = False                 # inline offloaded fields instead of previews + blob refs
+
+
+def encode_cursor(timestamp: str, row_id: int) -> str:
+    """Opaque cursor pointing just after (timestamp, id) in newest-first order."""
+    raw = f"{timestamp}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    timestamp, row_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").rsplit("|", 1)
+    return timestamp, int(row_id)
+
+
+def _utc_iso(value: Optional[datetime]) -> Optional[str]:
+    """Stored timestamps are naive UTC, so bring aware bounds into the same form."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def page_params(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full history"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    since: Optional[datetime] = Query(None, description="Only entries at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only entries before this time"),
+    expand: bool = Query(False, description="Inline offloaded transcripts / answers instead of previews"),
+) -> PageParams:
+    """FastAPI dependency: parse and validate ?limit=&cursor=&since=&until=&expand= (and the Accept header)."""
+    decoded = None
+    if cursor:
+        try:
+            decoded = decode_cursor(cursor)
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return PageParams(
+        limit=limit,
+        cursor=decoded,
+        since=_utc_iso(since),
+        until=_utc_iso(until),
+        stream=NDJSON_MEDIA_TYPE in request.headers.get("accept", ""),
+        expand=expand,
+    )
@@ -1,9 +1,10 @@
-import os, json
+import os
 from datetime import datetime
+from backend.utils.jsonl_store import migrate_array_file, append_record
+from backend.utils.timeline_writer import timeline_writer
 
 # 🌍 Central directory for all Smart Study data
 BASE_SAVE_DIR = "saved_data"
-GLOBAL_LOG_FILE = os.path.join(BASE_SAVE_DIR, "smart_study_log.json")
 
 
 def ensure_dir(path: str):
@@ -13,27 +14,21 @@ def ensure_dir(path: str):
 
 
 def _write_json(filepath: str, entry: dict):
-    """Append an entry safely to a JSON file."""
-    if not os.path.exists(filepath):
-        with open(filepath, "w") as f:
-            json.dump([], f, indent=2)
+    """Append an entry as one JSON line (legacy .json arrays are migrated on first use)."""
+    target = migrate_array_file(filepath)
+    entry["timestamp"] = datetime.utcnow().isoformat()
+    append_record(target, entry)
 
-    with open(filepath, "r+", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            data = []
 
-        entry["timestamp"] = datetime.utcnow().isoformat()
-        data.append(entry)
-        f.seek(0)
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def _queue_timeline(entry: dict):
+    """Hand a timeline entry to the write-behind queue (flushed in batches to day segments)."""
+    timeline_writer.submit(entry)
 
 
 def save_data(module_name: str, filename: str, entry: dict):
     """
     Save an entry to a module's own file and the unified Smart Study log.
-    Example: saved_data/autonote/saved_autonotes.json + smart_study_log.json
+    Example: saved_data/autonote/saved_autonotes.jsonl + saved_data/timeline/<day>.jsonl
     """
     ensure_dir(BASE_SAVE_DIR)
 
@@ -51,7 +46,7 @@ def save_data(module_name: str, filename: str, entry: dict):
         "metadata": entry.get("metadata", entry),
         "timestamp": datetime.utcnow().isoformat(),
     }
-    _write_json(GLOBAL_LOG_FILE, unified_entry)
+    _queue_timeline(unified_entry)
 
     print(f"✅ Saved entry for {module_name}: {unified_entry['title']}")
 
@@ -72,5 +67,5 @@ def save_entry(module: str, title: str, content: str, metadata: dict = None):
     }
 
     # Save to global timeline only (for minor events)
-    _write_json(GLOBAL_LOG_FILE, entry)
+    _queue_timeline(entry)
     print(f"🧠 Logged new study entry: {title} ({module})")
@@ -0,0 +1,91 @@
+import os, json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # optional on-disk format for whole-document files
+except ImportError:
+    msgpack = None
+
+# ======================================================
+# 🧬 One serializer for every save / load helper
+# ======================================================
+# AURA_STORAGE_FORMAT=json     compact JSON via orjson (stdlib fallback)
+# AURA_STORAGE_FORMAT=msgpack  MessagePack for whole-document files
+# JSON Lines stores always stay JSON (one record per line, tail-readable).
+# Readers sniff the format, so pretty-printed legacy files keep working.
+HAS_ORJSON = orjson is not None
+STORAGE_FORMAT = os.getenv("AURA_STORAGE_FORMAT", "json").lower()
+if STORAGE_FORMAT == "msgpack" and msgpack is None:
+    print("⚠️ AURA_STORAGE_FORMAT=msgpack but msgpack is not installed — using JSON")
+    STORAGE_FORMAT = "json"
+
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS if HAS_ORJSON else 0
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj) -> str:
+    """Compact JSON text (for TEXT columns and NDJSON lines)."""
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data):
+    """Parse JSON from bytes or str. Raises ValueError on bad input."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_lines(records) -> bytes:
+    """Encode records as JSON Lines in a single buffer."""
+    return b"".join(dumps(r) + b"\n" for r in records)
+
+
+def copy(obj):
+    """Deep copy of a JSON-shaped value (cheaper than copy.deepcopy)."""
+    return loads(dumps(obj))
+
+
+# ======================================================
+# 📄 Whole-document files
+# ======================================================
+def encode_document(obj, fmt: str = None) -> bytes:
+    if (fmt or STORAGE_FORMAT) == "msgpack":
+        return msgpack.packb(obj, use_bin_type=True)
+    return dumps(obj)
+
+
+def decode_document(data: bytes):
+    """JSON (compact or legacy pretty-printed) or MessagePack, detected from the bytes."""
+    head = data.lstrip()[:1]
+    if not head:
+        raise ValueError("empty document")
+    # Our documents are objects or arrays; MessagePack maps/arrays never start with { or [
+    if head in (b"{", b"["):
+        return loads(data)
+    if msgpack is None:
+        raise ValueError("document is not JSON and msgpack is not installed")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def dump_file(path: str, obj, fmt: str = None):
+    """Atomically write a document in the configured storage format."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode_document(obj, fmt))
+    os.replace(tmp, path)
+
+
+def load_file(path: str):
+    """Read a document written by dump_file or by the old json.dump(..., indent=2)."""
+    with open(path, "rb") as f:
+        return decode_document(f.read())
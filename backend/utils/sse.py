@@ -0,0 +1,59 @@
+import time, inspect
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from backend.utils.serializer import dumps_str
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_sse(request: Request) -> bool:
+    """True when the client sent Accept: text/event-stream."""
+    return SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def sse_event(data, event: str = None) -> str:
+    """One SSE frame; data is JSON-encoded so newlines in tokens never break framing."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {dumps_str(data)}\n\n"
+
+
+async def single_delta(text: str):
+    """Wrap an already known answer (cache hit) as a one-delta stream."""
+    yield text
+
+
+async def stream_completion(deltas, on_complete):
+    """
+    Forward text deltas as `data: {"delta": ...}` events. Once the stream
+    has finished, on_complete(full_text) runs (persistence, email, ...) and
+    its dict goes out as the final `event: done`, with ttft_ms added.
+    Failures end the stream with `event: error`. deltas is always closed,
+    so a client that disconnects mid-answer releases the upstream stream
+    and its scheduler slot right away.
+    """
+    started = time.perf_counter()
+    ttft_ms, parts = None, []
+    try:
+        async for delta in deltas:
+            if ttft_ms is None:
+                ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+            parts.append(delta)
+            yield sse_event({"delta": delta})
+        result = on_complete("".join(parts).strip())
+        if inspect.isawaitable(result):
+            result = await result
+        yield sse_event({**(result or {}), "ttft_ms": ttft_ms}, event="done")
+    except Exception as e:
+        print(f"❌ Stream failed: {e}")
+        yield sse_event({"detail": str(e)}, event="error")
+    finally:
+        await deltas.aclose()
+
+
+def sse_response(events) -> StreamingResponse:
+    """text/event-stream response; proxies are asked not to buffer it."""
+    return StreamingResponse(
+        events,
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
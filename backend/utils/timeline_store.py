@@ -0,0 +1,149 @@
+import os, gzip, threading
+from datetime import datetime, date, timedelta
+from backend.utils.file_cache import load_json, write_json
+from backend.utils.jsonl_store import append_records, iter_records, migrate_array_file
+from backend.utils.serializer import dumps_lines, loads
+
+# ======================================================
+# 🗓️ Day-partitioned Smart Study timeline
+# ======================================================
+# saved_data/timeline/
+#   manifest.json         {"segments": {"2025-10-26": {"count": 12, "compressed": false}}}
+#   2025-10-26.jsonl      today's (and recent) append-only segments
+#   2025-10-01.jsonl.gz   older segments, compacted + gzip-compressed
+TIMELINE_DIR = os.path.join("saved_data", "timeline")
+MANIFEST_FILE = os.path.join(TIMELINE_DIR, "manifest.json")
+LEGACY_LOG_FILE = os.path.join("saved_data", "smart_study_log.json")
+TIMELINE_COMPACT_AFTER_DAYS = int(os.getenv("AURA_TIMELINE_COMPACT_DAYS", "7"))
+
+_LOCK = threading.RLock()
+
+
+def _day_of(entry: dict) -> str:
+    ts = str(entry.get("timestamp") or "")
+    return ts[:10] if len(ts) >= 10 else datetime.utcnow().date().isoformat()
+
+
+def _plain_path(day: str) -> str:
+    return os.path.join(TIMELINE_DIR, f"{day}.jsonl")
+
+
+def _gz_path(day: str) -> str:
+    return os.path.join(TIMELINE_DIR, f"{day}.jsonl.gz")
+
+
+def _load_manifest() -> dict:
+    manifest = load_json(MANIFEST_FILE, {}) or {}
+    # Copy: the cached manifest is shared with other readers
+    return {"segments": {k: dict(v) for k, v in manifest.get("segments", {}).items()}}
+
+
+def _iter_gz(path: str):
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                continue
+
+
+def _iter_segment(day: str):
+    """Compressed part first (older), then anything appended since compaction."""
+    if os.path.exists(_gz_path(day)):
+        yield from _iter_gz(_gz_path(day))
+    yield from iter_records(_plain_path(day))
+
+
+# ======================================================
+# ✍️ Writes
+# ======================================================
+def append_entries(entries: list):
+    """Append a batch of timeline entries to their day segments (one manifest write per batch)."""
+    if not entries:
+        return
+    by_day = {}
+    for entry in entries:
+        by_day.setdefault(_day_of(entry), []).append(entry)
+
+    with _LOCK:
+        os.makedirs(TIMELINE_DIR, exist_ok=True)
+        manifest = _load_manifest()
+        new_day = False
+        for day, day_entries in by_day.items():
+            append_records(_plain_path(day), day_entries)
+            seg = manifest["segments"].setdefault(day, {"count": 0, "compressed": False})
+            new_day = new_day or seg["count"] == 0
+            seg["count"] += len(day_entries)
+        write_json(MANIFEST_FILE, manifest)
+
+    # Rotation: the first write of a new day compacts the old ones
+    if new_day:
+        compact()
+
+
+# ======================================================
+# 📖 Range reads (only overlapping segments are opened)
+# ======================================================
+def list_days(start: date = None, end: date = None) -> list:
+    """Days with data in [start, end], newest first."""
+    lo = start.isoformat() if start else ""
+    hi = end.isoformat() if end else "9999-12-31"
+    days = [d for d in _load_manifest()["segments"] if lo <= d <= hi]
+    return sorted(days, reverse=True)
+
+
+def iter_days(start: date = None, end: date = None):
+    """Yield (day, entries) for each day in range, newest day first, entries in write order."""
+    for day in list_days(start, end):
+        yield day, list(_iter_segment(day))
+
+
+def iter_range(start: date = None, end: date = None):
+    """Stream every entry in [start, end], oldest day first."""
+    for day in reversed(list_days(start, end)):
+        yield from _iter_segment(day)
+
+
+# ======================================================
+# 🗜️ Compaction of old segments
+# ======================================================
+def compact(older_than_days: int = TIMELINE_COMPACT_AFTER_DAYS) -> int:
+    """Rewrite segments older than N days as gzip files (dropping torn lines). Returns segments compacted."""
+    cutoff = (datetime.utcnow().date() - timedelta(days=older_than_days)).isoformat()
+    compacted = 0
+    with _LOCK:
+        manifest = _load_manifest()
+        for day, seg in manifest["segments"].items():
+            if day >= cutoff or not os.path.exists(_plain_path(day)):
+                continue
+            entries = list(_iter_segment(day))
+            tmp = _gz_path(day) + ".tmp"
+            with gzip.open(tmp, "wb") as f:
+                f.write(dumps_lines(entries))
+            os.replace(tmp, _gz_path(day))
+            os.remove(_plain_path(day))
+            seg.update({"count": len(entries), "compressed": True})
+            compacted += 1
+        if compacted:
+            write_json(MANIFEST_FILE, manifest)
+    if compacted:
+        print(f"🗜️ Compacted {compacted} timeline segment(s)")
+    return compacted
+
+
+# ======================================================
+# 📦 One-shot split of the old single-file log
+# ======================================================
+def migrate_legacy_log() -> int:
+    """Split saved_data/smart_study_log.json(l) into day segments, then rename it to .imported."""
+    source = migrate_array_file(LEGACY_LOG_FILE)
+    if not os.path.exists(source):
+        return 0
+    entries = list(iter_records(source))
+    append_entries(entries)
+    os.replace(source, source + ".imported")
+    print(f"📦 Split {len(entries)} timeline entries into day segments")
+    return len(entries)
@@ -0,0 +1,220 @@
+import os, time, queue, atexit, threading
+from backend.utils.timeline_store import append_entries
+
+# ⚙️ Write-behind tuning (override via env)
+TIMELINE_QUEUE_SIZE = int(os.getenv("AURA_TIMELINE_QUEUE_SIZE", "10000"))
+TIMELINE_BATCH_SIZE = int(os.getenv("AURA_TIMELINE_BATCH_SIZE", "200"))
+TIMELINE_FLUSH_SECONDS = float(os.getenv("AURA_TIMELINE_FLUSH_SECONDS", "1.0"))
+TIMELINE_WRITE_RETRIES = int(os.getenv("AURA_TIMELINE_WRITE_RETRIES", "3"))
+TIMELINE_RETRY_SECONDS = 0.5   # first retry delay, doubled each time
+
+
+class _FlushMarker:
+    """Queued by flush(): the writer sets the event once everything before it is on disk."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = True
+
+
+_STOP = object()
+
+
+class WriteBehindLogger:
+    """
+    Buffers entries in a bounded queue and hands them to sink(batch) from a
+    background thread, so request handlers never wait on disk I/O.
+    A batch is flushed when it reaches batch_size or flush_seconds elapse.
+    submit() never waits on the queue: when it is full, the entry is
+    written straight to the sink by the caller (backpressure instead of
+    loss). A failing sink is retried with backoff; a batch that still
+    fails is carried into the next flush. Entries are only dropped when
+    that can't work either — past the queue capacity with the sink down,
+    or at shutdown — and every drop is counted and logged.
+    """
+
+    def __init__(self, sink, maxsize=TIMELINE_QUEUE_SIZE, batch_size=TIMELINE_BATCH_SIZE,
+                 flush_seconds=TIMELINE_FLUSH_SECONDS, retries=TIMELINE_WRITE_RETRIES,
+                 retry_seconds=TIMELINE_RETRY_SECONDS):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.retries = retries
+        self.retry_seconds = retry_seconds
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._carry = []   # entries of a failed flush, written first next time (writer thread only)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.written_through = 0
+        self.retried = 0
+        self.errors = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    # ---------- producer side ----------
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="timeline-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, entry: dict) -> bool:
+        """Queue one entry (written through when the queue is full); False only if it was lost."""
+        self.start()
+        with self._metrics_lock:
+            self.submitted += 1
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            return self._write_through(entry)
+
+    def _write_through(self, entry: dict) -> bool:
+        # Queue full: the writer is behind, so this caller pays for its own write
+        try:
+            self.sink([entry])
+        except Exception as e:
+            with self._metrics_lock:
+                self.errors += 1
+            self._drop(1, f"queue full and direct write failed: {e}")
+            return False
+        with self._metrics_lock:
+            self.written_through += 1
+            self.written += 1
+        return True
+
+    def _drop(self, count: int, reason: str):
+        with self._metrics_lock:
+            self.dropped += count
+            total = self.dropped
+        # First drop, then every 1000th, so a stuck disk doesn't flood the log
+        if total == count or total // 1000 != (total - count) // 1000:
+            print(f"⚠️ Timeline writer dropped {count} entries ({reason}); {total} dropped so far")
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything submitted so far is on disk; False if a write failed or timed out."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout) and marker.ok
+
+    def stop(self, timeout: float = 10.0):
+        """Graceful shutdown: drain the queue and stop the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "submitted": self.submitted,
+                "written": self.written,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "written_through": self.written_through,
+                "retried": self.retried,
+                "errors": self.errors,
+                "pending_retry": len(self._carry),
+                "last_flush_ms": round(self.last_flush_ms, 2),
+                "avg_flush_ms": round(self._total_flush_ms / self.batches, 2) if self.batches else 0.0,
+                "max_flush_ms": round(self.max_flush_ms, 2),
+            }
+
+    # ---------- writer thread ----------
+    def _run(self):
+        while True:
+            # With a failed batch carried over, wake up on our own to retry it
+            try:
+                item = self._queue.get(timeout=self.flush_seconds) if self._carry else self._queue.get()
+            except queue.Empty:
+                item = None
+            batch, markers, stop = [], [], False
+            deadline = time.monotonic() + self.flush_seconds
+
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushMarker):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+
+                if stop or markers or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if stop:
+                # Drain whatever producers managed to queue before shutdown
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, _FlushMarker):
+                        markers.append(item)
+                    elif item is not _STOP:
+                        batch.append(item)
+
+            batch, self._carry = self._carry + batch, []
+            ok = self._write(batch)
+            if not ok:
+                if stop:
+                    self._drop(len(batch), "sink still failing at shutdown")
+                else:
+                    keep = self._queue.maxsize or len(batch)
+                    if len(batch) > keep:
+                        self._drop(len(batch) - keep, "retry backlog full")
+                    self._carry = batch[-keep:]
+            for marker in markers:
+                marker.ok = ok
+                marker.done.set()
+            if stop:
+                return
+
+    def _write(self, batch: list) -> bool:
+        """Hand batch to the sink, retrying with backoff; False if every attempt failed."""
+        if not batch:
+            return True
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                self.sink(batch)
+                break
+            except Exception as e:
+                with self._metrics_lock:
+                    self.errors += 1
+                print(f"⚠️ Timeline flush failed ({len(batch)} entries, attempt {attempt + 1}): {e}")
+                if attempt == self.retries:
+                    return False
+                with self._metrics_lock:
+                    self.retried += 1
+                time.sleep(self.retry_seconds * 2 ** attempt)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._metrics_lock:
+            self.written += len(batch)
+            self.batches += 1
+            self.last_flush_ms = elapsed
+            self.max_flush_ms = max(self.max_flush_ms, elapsed)
+            self._total_flush_ms += elapsed
+        return True
+
+
+# Shared writer for the unified Smart Study timeline (day segments)
+timeline_writer = WriteBehindLogger(sink=append_entries)
+atexit.register(timeline_writer.stop)
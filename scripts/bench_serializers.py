@@ -0,0 +1,124 @@
+"""
+Compare storage formats on the real shapes found in saved_data / saved_files.
+
+    python scripts/bench_serializers.py                # every data file in the repo
+    python scripts/bench_serializers.py --scale 50     # each document's records repeated 50x
+    python scripts/bench_serializers.py saved_data/smart_study_log.json
+
+For every document it reports encoded size and encode/decode time for
+stdlib json (indent=2, the old format), stdlib json compact, orjson and
+msgpack. Formats whose package is not installed are skipped.
+"""
+import argparse, glob, json, os, sys, time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_GLOBS = [
+    "saved_data/**/*.json", "saved_data/**/*.jsonl",
+    "saved_files/**/*.json", "backend/saved_files/**/*.json",
+    "saved_*.json",
+]
+
+
+def _formats():
+    fmts = {
+        "json indent=2": (
+            lambda o: json.dumps(o, indent=2, ensure_ascii=False).encode("utf-8"),
+            json.loads,
+        ),
+        "json compact": (
+            lambda o: json.dumps(o, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            json.loads,
+        ),
+    }
+    if orjson:
+        fmts["orjson"] = (lambda o: orjson.dumps(o, option=orjson.OPT_NON_STR_KEYS), orjson.loads)
+    if msgpack:
+        fmts["msgpack"] = (
+            lambda o: msgpack.packb(o, use_bin_type=True),
+            lambda b: msgpack.unpackb(b, raw=False, strict_map_key=False),
+        )
+    return fmts
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def _scaled(doc, scale):
+    if scale > 1 and isinstance(doc, list):
+        return doc * scale
+    return doc
+
+
+def _time(fn, arg, min_seconds=0.2):
+    """Average seconds per call, repeating until min_seconds have elapsed."""
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn(arg)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / runs
+
+
+def bench(paths, scale):
+    fmts = _formats()
+    totals = {name: [0, 0.0, 0.0] for name in fmts}
+
+    print(f"{'document':<58} {'format':<14} {'bytes':>10} {'encode µs':>11} {'decode µs':>11}")
+    for path in paths:
+        try:
+            doc = _scaled(_load(path), scale)
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"⚠️ skipping {path}: {e}")
+            continue
+        label = os.path.relpath(path, ROOT)[-58:]
+        for name, (encode, decode) in fmts.items():
+            data = encode(doc)
+            enc, dec = _time(encode, doc), _time(decode, data)
+            totals[name][0] += len(data)
+            totals[name][1] += enc
+            totals[name][2] += dec
+            print(f"{label:<58} {name:<14} {len(data):>10} {enc * 1e6:>11.1f} {dec * 1e6:>11.1f}")
+            label = ""
+
+    base = totals["json indent=2"]
+    print("\nTotals (relative to json indent=2)")
+    for name, (size, enc, dec) in totals.items():
+        if not base[0]:
+            break
+        print(
+            f"  {name:<14} {size:>10} bytes ({size / base[0]:.0%})"
+            f"  encode {enc / base[1]:.2f}x  decode {dec / base[2]:.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="data files (default: every saved_* file in the repo)")
+    parser.add_argument("--scale", type=int, default=1, help="repeat list documents N times")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(
+        {p for pattern in DEFAULT_GLOBS for p in glob.glob(os.path.join(ROOT, pattern), recursive=True)}
+    )
+    if not paths:
+        sys.exit("No data files found.")
+    bench(paths, args.scale)
+
+
+if __name__ == "__main__":
+    main()
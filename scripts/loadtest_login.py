@@ -0,0 +1,103 @@
+"""
+Login-burst load test: event-loop latency must stay flat while bcrypt runs.
+
+    python scripts/loadtest_login.py                 # 200 logins, 50 at a time
+    python scripts/loadtest_login.py -n 500 -c 100
+    python scripts/loadtest_login.py --blocking      # old behaviour, for comparison
+
+Runs the real /auth/login route in-process (httpx ASGI transport) against a
+throwaway users file. While the burst is running, a ticker measures how late
+the event loop wakes it up every 10 ms and a /ping route is timed. Both should
+stay in the low milliseconds when bcrypt runs on the bcrypt pool;
+with --blocking (bcrypt called inline) each login stalls the loop.
+"""
+import argparse, asyncio, os, sys, tempfile, time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+WORKDIR = tempfile.mkdtemp(prefix="aura-loadtest-")
+os.chdir(WORKDIR)  # keep saved_files / saved_data side effects out of the repo
+
+import httpx
+from fastapi import FastAPI
+from backend.routers import auth
+from backend.services.user_directory import user_directory
+from backend.services.password_hasher import password_hasher
+
+TICK_SECONDS = 0.01
+
+
+def _pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def _ticker(lags: list, stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((loop.time() - expected) * 1000)
+
+
+async def main(total: int, concurrency: int, blocking: bool):
+    user_directory.__init__(os.path.join(WORKDIR, "users.json"))
+    app = FastAPI()
+    app.include_router(auth.router)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if blocking:
+        async def inline(fn, *args):
+            return fn(*args)
+        auth.run_bcrypt = inline
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://aura") as client:
+        creds = {"email": "load@test.dev", "password": "correct horse battery", "name": "Load"}
+        r = await client.post("/auth/signup", json=creds)
+        assert r.status_code == 200, r.text
+
+        lags, pings, statuses = [], [], []
+        stop = asyncio.Event()
+        sem = asyncio.Semaphore(concurrency)
+
+        async def login():
+            async with sem:
+                r = await client.post("/auth/login", json={"email": creds["email"], "password": creds["password"]})
+                statuses.append(r.status_code)
+
+        async def pinger():
+            while not stop.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                pings.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.02)
+
+        ticker = asyncio.create_task(_ticker(lags, stop))
+        pinging = asyncio.create_task(pinger())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(ticker, pinging)
+
+    print(f"mode: {'blocking (inline bcrypt)' if blocking else 'bcrypt pool'}")
+    print(f"logins: {total} ({concurrency} concurrent) in {elapsed:.2f}s — "
+          f"{sum(s == 200 for s in statuses)} ok, "
+          f"{sum(s == 503 for s in statuses)} busy")
+    print(f"event-loop lag ms:  p50 {_pct(lags, 0.5):.1f}  p99 {_pct(lags, 0.99):.1f}  max {max(lags or [0]):.1f}")
+    print(f"/ping latency ms:   p50 {_pct(pings, 0.5):.1f}  p99 {_pct(pings, 0.99):.1f}  max {max(pings or [0]):.1f}")
+    if not blocking:
+        print("password_hasher:", password_hasher.stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--total", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("--blocking", action="store_true", help="call bcrypt inline (pre-fix behaviour)")
+    args = parser.parse_args()
+    asyncio.run(main(args.total, args.concurrency, args.blocking))
@@ -0,0 +1,10 @@
+import os, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def pytest_configure(config):
+    # Services open aura.db and saved_data/ relative to the working directory
+    # (and create their tables on import): keep each run's data in a scratch dir.
+    os.chdir(tempfile.mkdtemp(prefix="aura-tests-"))
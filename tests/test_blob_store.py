@@ -0,0 +1,61 @@
+import pytest
+from backend.services import blob_store, entry_store
+from backend.utils.pagination import PageParams
+
+BIG = "lecture transcript " * 500
+
+
+def test_put_is_content_addressed_and_deduplicated():
+    first, second = blob_store.put(b"same bytes"), blob_store.put(b"same bytes")
+    assert first == second and blob_store.get(first["sha256"]) == b"same bytes"
+
+
+def test_unknown_or_malformed_sha_is_not_found():
+    with pytest.raises(blob_store.BlobNotFound):
+        blob_store.get("0" * 64)
+    with pytest.raises(blob_store.BlobNotFound):
+        blob_store.get("../../aura.db")
+
+
+def test_offload_keeps_a_preview_and_hydrate_restores_it():
+    cards = [{"q": f"question {n}", "a": "answer " * 20} for n in range(40)]
+    entry = blob_store.offload({"transcript": BIG, "title": "short", "metadata": {"cards": cards}},
+                               "transcript", "title", "metadata.cards")
+    assert set(entry["blobs"]) == {"transcript", "metadata.cards"}
+    assert entry["title"] == "short" and len(entry["transcript"]) < len(BIG)
+    assert "cards" not in entry["metadata"]
+
+    full = blob_store.hydrate(entry)
+    assert full["transcript"] == BIG and full["metadata"]["cards"] == cards and "blobs" not in full
+
+
+def test_pages_are_lean_unless_expanded():
+    entry = blob_store.offload({"timestamp": "2026-02-01T10:00:00", "transcript": BIG}, "transcript")
+    sha = entry["blobs"]["transcript"]["sha256"]
+    entry_store.add("autonote", "blob-pages@test.local", entry)
+
+    lean = entry_store.page_for_user("autonote", "blob-pages@test.local", PageParams(limit=1))
+    full = entry_store.page_for_user("autonote", "blob-pages@test.local", PageParams(limit=1, expand=True))
+    assert lean["entries"][0]["blobs"]["transcript"]["sha256"] == sha
+    assert full["entries"][0]["transcript"] == BIG
+    assert entry_store.latest_for_user("autonote", "blob-pages@test.local")["transcript"] == BIG
+
+    timeline = entry_store.timeline_page("blob-pages@test.local", ["autonote"], PageParams(limit=5))
+    expanded = entry_store.timeline_page("blob-pages@test.local", ["autonote"], PageParams(limit=5, expand=True))
+    assert "blobs" in timeline["entries"][0]["entry"] and expanded["entries"][0]["entry"]["transcript"] == BIG
+
+
+def test_owner_is_recorded_at_offload_time():
+    # e.g. doubt_logger, which persists outside entry_store
+    entry = blob_store.offload({"response": "explanation " * 400}, "response", owner="blob-owner@test.local")
+    sha = entry["blobs"]["response"]["sha256"]
+    assert blob_store.owns("blob-owner@test.local", sha)
+    assert not blob_store.owns("blob-stranger@test.local", sha)
+
+
+def test_saving_through_the_store_claims_the_blobs():
+    entry = blob_store.offload({"transcript": "saved " * 600}, "transcript")
+    sha = entry["blobs"]["transcript"]["sha256"]
+    assert not blob_store.owns("blob-saver@test.local", sha)
+    entry_store.add("autonote", "blob-saver@test.local", entry)
+    assert blob_store.owns("blob-saver@test.local", sha)
@@ -0,0 +1,48 @@
+import pytest
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, encode_cursor, decode_cursor
+
+EMAIL = "pages@test.local"
+STAMPS = ["2026-01-01T09:00:00", "2026-01-02T09:00:00", "2026-01-02T09:00:00",
+          "2026-01-03T09:00:00", "2026-01-04T09:00:00"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def entries():
+    for n, stamp in enumerate(STAMPS):
+        entry_store.add("mood", EMAIL, {"timestamp": stamp, "n": n})
+
+
+def _walk(limit, **bounds):
+    seen, cursor = [], None
+    while True:
+        page = entry_store.page_for_user("mood", EMAIL, PageParams(limit=limit, cursor=cursor, **bounds))
+        seen += [e["n"] for e in page["entries"]]
+        if not page["next_cursor"]:
+            return seen
+        cursor = decode_cursor(page["next_cursor"])
+
+
+def test_pages_are_newest_first_without_gaps_or_repeats():
+    # Equal timestamps are ordered by id, so n=2 comes before n=1
+    assert _walk(2) == [4, 3, 2, 1, 0]
+    assert _walk(5) == [4, 3, 2, 1, 0]
+
+
+def test_no_limit_returns_everything_without_a_cursor():
+    page = entry_store.page_for_user("mood", EMAIL)
+    assert len(page["entries"]) == 5 and page["next_cursor"] is None
+
+
+def test_since_is_inclusive_and_until_exclusive():
+    assert _walk(1, since="2026-01-02T09:00:00", until="2026-01-04T09:00:00") == [3, 2, 1]
+
+
+def test_other_users_are_not_paged():
+    assert entry_store.page_for_user("mood", "someone-else@test.local", PageParams(limit=10))["entries"] == []
+
+
+def test_cursor_round_trip_and_garbage():
+    assert decode_cursor(encode_cursor("2026-01-02T09:00:00", 42)) == ("2026-01-02T09:00:00", 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,144 @@
+import json, time, threading, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, exceptions, jwt
+from backend.services import google_certs as google_certs_module
+from backend.services.google_certs import GoogleCerts, parse_max_age
+
+AUDIENCE = "aura-test-client"
+
+
+def _keypair():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "stand-in")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+            .serial_number(x509.random_serial_number()).not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1)).sign(key, hashes.SHA256()))
+    private_pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                    serialization.NoEncryption())
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+KEYS = {kid: _keypair() for kid in ("kid-1", "kid-2")}
+
+
+def _token(kid):
+    now = int(time.time())
+    signer = crypt.RSASigner.from_string(KEYS[kid][0], key_id=kid)
+    payload = {"iss": "https://accounts.google.com", "aud": AUDIENCE, "sub": "42",
+               "email": "g@x.io", "iat": now, "exp": now + 600}
+    return jwt.encode(signer, payload).decode()
+
+
+class _KeyServer:
+    """Stand-in for Google's certs endpoint."""
+
+    def __init__(self):
+        self.kids, self.max_age, self.status, self.requests = ["kid-1"], 60, 200, 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                body = json.dumps({kid: KEYS[kid][1] for kid in server.kids}).encode()
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={server.max_age}, must-revalidate")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/oauth2/v1/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = _KeyServer()
+    yield server
+    server.httpd.shutdown()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(google_certs_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def certs(server, clock):
+    server.kids, server.max_age, server.status, server.requests = ["kid-1"], 60, 200, 0
+    certs = GoogleCerts(url=server.url, timeout=2)
+    certs._ensure_refresher = lambda: None   # refreshes only when the tests ask for them
+    yield certs
+    certs.stop()
+
+
+def test_parse_max_age():
+    assert parse_max_age("public, max-age=21035, must-revalidate") == 21035
+    assert parse_max_age("no-cache, max-age=60") == 0
+    assert parse_max_age("", default=7) == 7
+
+
+def test_served_from_memory_within_max_age(certs, server, clock):
+    assert certs.verify(_token("kid-1"), audience=AUDIENCE)["email"] == "g@x.io"
+    clock.now += 59
+    certs.verify(_token("kid-1"), audience=AUDIENCE)
+    assert server.requests == 1 and certs.stats()["hits"] == 1
+
+
+def test_refetched_after_max_age(certs, server, clock):
+    certs.certs()
+    clock.now += 61
+    certs.certs()
+    assert server.requests == 2
+
+
+def test_unknown_kid_forces_one_refetch(certs, server, clock):
+    certs.certs()
+    server.kids = ["kid-1", "kid-2"]   # Google rotated keys before our copy expired
+    assert certs.verify(_token("kid-2"), audience=AUDIENCE)["sub"] == "42"
+    assert server.requests == 2 and certs.stats()["forced_refreshes"] == 1
+
+    # A bogus kid right after can't trigger another fetch
+    server.kids = ["kid-1"]
+    certs.refresh()
+    with pytest.raises(Exception):
+        certs.verify(_token("kid-2"), audience=AUDIENCE)
+    assert server.requests == 3
+
+
+def test_stale_certs_are_used_while_the_key_server_fails(certs, server, clock):
+    certs.certs()
+    server.status = 503
+    clock.now += 61
+    assert certs.verify(_token("kid-1"), audience=AUDIENCE)["email"] == "g@x.io"
+    assert certs.stats()["stale_served"] == 1 and certs.stats()["errors"] == 1
+
+    # ...but not forever
+    clock.now += google_certs_module.CERTS_MAX_STALE_SECONDS
+    with pytest.raises(exceptions.TransportError):
+        certs.certs()
+
+
+def test_cold_cache_with_the_key_server_down_fails(certs, server):
+    server.status = 500
+    with pytest.raises(exceptions.TransportError):
+        certs.certs()
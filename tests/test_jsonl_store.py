@@ -0,0 +1,49 @@
+import json
+from backend.utils import jsonl_store
+
+
+def test_migrate_array_file_turns_a_json_array_into_lines(tmp_path):
+    legacy = tmp_path / "notes.json"
+    legacy.write_text(json.dumps([{"n": 1}, {"n": 2}]))
+    target = jsonl_store.migrate_array_file(str(legacy))
+
+    assert target.endswith("notes.jsonl")
+    assert [json.loads(l) for l in open(target)] == [{"n": 1}, {"n": 2}]
+    assert not legacy.exists() and (tmp_path / "notes.json.migrated").exists()
+    assert jsonl_store.migrate_array_file(str(legacy)) == target   # safe to call again
+
+
+def test_migrate_wraps_a_single_object(tmp_path):
+    legacy = tmp_path / "one.json"
+    legacy.write_text(json.dumps({"n": 1}))
+    assert list(jsonl_store.iter_records(jsonl_store.migrate_array_file(str(legacy)))) == [{"n": 1}]
+
+
+def test_appends_and_last_record(tmp_path):
+    path = jsonl_store.init_store(str(tmp_path / "log.json"))
+    assert jsonl_store.last_record(path) is None
+    jsonl_store.append_record(path, {"n": 1})
+    jsonl_store.append_records(path, [{"n": 2}, {"n": 3}])
+    assert jsonl_store.last_record(path) == {"n": 3}
+    assert jsonl_store.read_records(path) == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+
+def test_last_record_spans_blocks(tmp_path):
+    path = str(tmp_path / "big.jsonl")
+    jsonl_store.append_records(path, [{"n": n, "pad": "x" * 300} for n in range(50)])
+    assert jsonl_store.last_record(path, block_size=64)["n"] == 49
+
+
+def test_torn_trailing_line_is_skipped(tmp_path):
+    path = str(tmp_path / "torn.jsonl")
+    jsonl_store.append_records(path, [{"n": 1}, {"n": 2}])
+    with open(path, "ab") as f:
+        f.write(b'{"n": 3, "text": "half writ')   # crash mid-append
+    assert list(jsonl_store.iter_records(path)) == [{"n": 1}, {"n": 2}]
+    assert jsonl_store.last_record(path) == {"n": 2}
+
+
+def test_corrupt_and_blank_lines_in_the_middle_are_skipped(tmp_path):
+    path = tmp_path / "mixed.jsonl"
+    path.write_text('{"n": 1}\n\nnot json\n{"n": 2}\n')
+    assert list(jsonl_store.iter_records(str(path))) == [{"n": 1}, {"n": 2}]
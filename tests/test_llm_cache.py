@@ -0,0 +1,71 @@
+import time
+import pytest
+from sqlalchemy import select
+from backend.database import SessionLocal
+from backend.models.llm_cache import LLMCacheEntry
+from backend.services.llm_cache import LLMCache, cache_key, set_bypass, reset_bypass
+
+
+@pytest.fixture
+def cache():
+    cache = LLMCache(ttl=60, max_bytes=1_000_000, enabled=True)
+    cache.clear()
+    return cache
+
+
+def _stored_hits(key):
+    with SessionLocal() as db:
+        return db.scalar(select(LLMCacheEntry.hits).where(LLMCacheEntry.key == key))
+
+
+def test_key_ignores_whitespace_but_not_content():
+    a = cache_key("m", [{"role": "user", "content": "What is  a heap?"}], 0.0)
+    b = cache_key("m", [{"role": "user", "content": "what is a heap? "}], 0.0)
+    c = cache_key("m", [{"role": "user", "content": "What is a stack?"}], 0.0)
+    assert a == b != c
+
+
+def test_round_trip_and_miss(cache):
+    cache.put("k1", "m", "reply")
+    assert cache.get("k1") == "reply"
+    assert cache.get("nope") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_expired_entries_are_dropped(cache):
+    cache.put("old", "m", "stale")
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get("old") is None and cache.stats()["expired"] == 1
+
+
+def test_least_recently_used_is_evicted_first(cache):
+    cache.max_bytes = 30
+    cache.put("a", "m", "x" * 10)
+    time.sleep(0.01)
+    cache.put("b", "m", "y" * 10)
+    time.sleep(0.01)
+    assert cache.get("a")            # a is now more recent than b
+    time.sleep(0.01)
+    cache.put("c", "m", "z" * 15)
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_bypass_skips_the_cache(cache):
+    cache.put("k", "m", "reply")
+    token = set_bypass(True)
+    try:
+        assert cache.get("k") is None
+    finally:
+        reset_bypass(token)
+    assert cache.stats()["bypasses"] == 1 and cache.get("k") == "reply"
+
+
+def test_hits_are_written_back_in_batches(cache):
+    cache.put("hot", "m", "reply")
+    cache.get("hot")
+    cache.get("hot")
+    assert _stored_hits("hot") == 0
+    cache.flush_hits()
+    assert _stored_hits("hot") == 2
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from backend.services import llm_router
+from backend.services.llm_router import ProviderRouter, NoProviderAvailable, mark_upstream, OPEN, CLOSED
+from backend.services.llm_gateway import LLMEmptyReply
+
+
+def _reply(text, delay=0.0):
+    async def call(messages, model, *args):
+        await asyncio.sleep(delay)
+        return text
+    return call
+
+
+def _fail(exc=RuntimeError("boom")):
+    async def call(messages, model, *args):
+        raise exc
+    return call
+
+
+def _complete(router):
+    return asyncio.run(router.complete([{"role": "user", "content": "hi"}], "m"))
+
+
+def test_fails_over_to_the_next_provider():
+    router = ProviderRouter(hedge=False)
+    router.register("groq", _fail())
+    router.register("ollama", _reply("backup"))
+    assert _complete(router) == ("backup", "ollama")
+    assert router.stats()["failovers"] == 1
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled(monkeypatch):
+    monkeypatch.setattr(llm_router, "LLM_HEDGE_AFTER_MS", 50)
+    cancelled = []
+
+    async def slow(messages, model, *args):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    router = ProviderRouter(hedge=True)
+    router.register("groq", slow)
+    router.register("ollama", _reply("fast"))
+    assert _complete(router) == ("fast", "ollama")
+    stats = router.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1 and cancelled
+
+
+def test_breaker_opens_then_recovers_through_a_probe(monkeypatch):
+    outcome = {"fail": True}
+
+    async def flaky(messages, model, *args):
+        if outcome["fail"]:
+            raise RuntimeError("503")
+        return "back"
+
+    router = ProviderRouter(hedge=False)
+    router.register("groq", flaky)
+    for _ in range(llm_router.LLM_BREAKER_FAILURES):
+        with pytest.raises(RuntimeError):
+            _complete(router)
+    assert router.stats()["breakers"]["groq"]["state"] == OPEN
+    with pytest.raises(NoProviderAvailable):
+        _complete(router)
+
+    monkeypatch.setattr(llm_router, "LLM_BREAKER_COOLDOWN", 0)
+    outcome["fail"] = False
+    assert _complete(router) == ("back", "groq")
+    assert router.stats()["breakers"]["groq"]["state"] == CLOSED
+
+
+def test_empty_replies_fail_over_without_tripping_the_breaker():
+    router = ProviderRouter(hedge=False)
+    router.register("groq", _fail(LLMEmptyReply("empty")))
+    router.register("ollama", _reply("backup"))
+    for _ in range(llm_router.LLM_BREAKER_FAILURES + 2):
+        assert _complete(router) == ("backup", "ollama")
+    breaker = router.stats()["breakers"]["groq"]
+    assert breaker["state"] == CLOSED and breaker["opens"] == 0
+
+
+def test_latency_excludes_time_queued_before_the_upstream_call():
+    async def queued(messages, model, *args):
+        await asyncio.sleep(0.3)    # waiting for a scheduler slot
+        mark_upstream()
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    router = ProviderRouter(hedge=False)
+    router.register("groq", queued)
+    _complete(router)
+    assert router.stats()["models"]["groq/m"]["p95_latency_ms"] < 200
+
+
+def test_hedge_loser_leaves_a_censored_latency_sample(monkeypatch):
+    monkeypatch.setattr(llm_router, "LLM_HEDGE_AFTER_MS", 50)
+
+    async def stuck_upstream(messages, model, *args):
+        mark_upstream()
+        await asyncio.sleep(5)
+
+    async def stuck_in_queue(messages, model, *args):
+        await asyncio.sleep(5)   # never reached upstream
+
+    for slow, samples in ((stuck_upstream, 1), (stuck_in_queue, 0)):
+        router = ProviderRouter(hedge=True)
+        router.register("groq", slow)
+        router.register("ollama", _reply("fast"))
+        assert _complete(router) == ("fast", "ollama")
+        window = router.stats()["models"]["groq/m"]
+        assert window["censored"] == samples
+        if samples:
+            assert window["p95_latency_ms"] >= 50
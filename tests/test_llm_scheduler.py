@@ -0,0 +1,66 @@
+import time
+import asyncio
+from backend.services.llm_scheduler import LLMScheduler
+
+
+async def _served_order(scheduler, requests):
+    """Hold the only slot, queue requests (priority, user), then record dispatch order."""
+    order = []
+    held = await scheduler.acquire()
+
+    async def run(name, priority, user):
+        async with scheduler.slot(priority, user):
+            order.append(name)
+
+    tasks = [asyncio.create_task(run(name, priority, user)) for name, priority, user in requests]
+    await asyncio.sleep(0)
+    scheduler.release(held)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_higher_priority_classes_go_first():
+    scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0)
+    order = asyncio.run(_served_order(scheduler, [
+        ("bg", "background", "u"), ("batch", "batch", "u"), ("chat", "interactive", "u"),
+    ]))
+    assert order == ["chat", "batch", "bg"]
+
+
+def test_users_take_turns_within_a_class():
+    scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0)
+    order = asyncio.run(_served_order(scheduler, [
+        ("a1", "batch", "a"), ("a2", "batch", "a"), ("a3", "batch", "a"), ("b1", "batch", "b"),
+    ]))
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def main():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0)
+        held = await scheduler.acquire()
+        waiter = asyncio.create_task(scheduler.acquire("batch", "u"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.stats()["classes"]["batch"]["waiting"] == 0
+        scheduler.release(held)
+        async with scheduler.slot():
+            assert scheduler.stats()["running"] == 1
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(main())
+
+
+def test_token_budget_delays_the_next_request():
+    async def main():
+        scheduler = LLMScheduler(max_concurrency=4, tokens_per_minute=6000)   # 100 tokens/s
+        async with scheduler.slot(tokens=6000):
+            pass
+        started = time.perf_counter()
+        async with scheduler.slot(tokens=20):
+            pass
+        return time.perf_counter() - started, scheduler.stats()["throttled"]
+
+    waited, throttled = asyncio.run(main())
+    assert waited >= 0.15 and throttled == 1
@@ -0,0 +1,79 @@
+import asyncio
+from backend.services.llm_gateway import LLMGateway, CallCounter
+from backend.services.llm_router import ProviderRouter
+
+
+def _gateway(reply="answer", delay=0.05):
+    calls = []
+
+    async def provider(messages, model, *args):
+        calls.append(messages[-1]["content"])
+        await asyncio.sleep(delay)
+        return reply
+
+    gateway = LLMGateway(api_key=None)
+    gateway.router = ProviderRouter(hedge=False)
+    gateway.router.register("groq", provider)
+    return gateway, calls
+
+
+def _ask(gateway, *prompts):
+    async def main():
+        return await asyncio.gather(*(
+            gateway.chat([{"role": "user", "content": p}], cache=False) for p in prompts
+        ))
+    return asyncio.run(main())
+
+
+def test_identical_prompts_in_flight_share_one_call():
+    gateway, calls = _gateway()
+    assert _ask(gateway, "same", "same", "same") == ["answer"] * 3
+    assert calls == ["same"] and gateway.leaders == 1 and gateway.coalesced == 2
+
+
+def test_different_prompts_are_not_coalesced():
+    gateway, calls = _gateway()
+    _ask(gateway, "one", "two")
+    assert sorted(calls) == ["one", "two"] and gateway.coalesced == 0
+
+
+def test_a_cancelled_waiter_does_not_cancel_the_shared_call():
+    gateway, calls = _gateway(delay=0.1)
+
+    async def main():
+        messages = [{"role": "user", "content": "shared"}]
+        leaving = asyncio.ensure_future(gateway.chat(messages, cache=False))
+        staying = asyncio.ensure_future(gateway.chat(messages, cache=False))
+        await asyncio.sleep(0.02)
+        leaving.cancel()
+        return await staying
+
+    assert asyncio.run(main()) == "answer" and calls == ["shared"]
+    assert gateway._flights == {}
+
+
+def test_stream_cancelled_in_the_queue_releases_a_half_open_probe(monkeypatch):
+    from backend.services import llm_router
+    from backend.services.llm_scheduler import LLMScheduler
+
+    monkeypatch.setattr(llm_router, "LLM_BREAKER_COOLDOWN", 0)
+    gateway = LLMGateway(api_key="test-key", scheduler=LLMScheduler(max_concurrency=1, tokens_per_minute=0))
+    breaker = gateway.router._breakers["groq"]
+    breaker.state = llm_router.OPEN
+
+    async def main():
+        held = await gateway.scheduler.acquire()
+
+        async def consume():
+            async for _ in gateway.stream_chat([{"role": "user", "content": "hi"}], cache=False):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.02)
+        assert breaker.state == llm_router.HALF_OPEN and breaker.probing
+        task.cancel()                  # client disconnected while queued
+        await asyncio.gather(task, return_exceptions=True)
+        gateway.scheduler.release(held)
+
+    asyncio.run(main())
+    assert not breaker.probing and gateway.router.acquire("groq")
@@ -0,0 +1,30 @@
+from backend.services import entry_store, rollups
+
+EMAIL = "rollups@test.local"
+DAY = "2026-03-01"
+
+
+def _day():
+    return next((d for d in rollups.user_days(EMAIL, DAY, DAY)), None)
+
+
+def test_adds_fold_into_the_day():
+    entry_store.add("focus", EMAIL, {"timestamp": f"{DAY}T09:00:00", "attention_score": 80}, llm_calls=2)
+    entry_store.add("focus", EMAIL, {"timestamp": f"{DAY}T10:00:00", "attention_score": 60})
+    entry_store.add("mood", EMAIL, {"timestamp": f"{DAY}T11:00:00", "mood": "happy"})
+    entry_store.add("flashcards", EMAIL, {"timestamp": f"{DAY}T12:00:00", "metadata": {"num_cards": 12}},
+                    llm_calls=1)
+    day = _day()
+    assert day["entries"] == 4 and day["llm_calls"] == 3 and day["flashcards"] == 12
+    assert day["avg_attention"] == 70.0 and day["moods"] == {"happy": 1}
+
+
+def test_delete_takes_every_aggregate_back_out():
+    entry_store.delete_for_user("focus", EMAIL)
+    day = _day()
+    assert day["entries"] == 2 and day["avg_attention"] is None and day["llm_calls"] == 1
+    assert "focus" not in day["modules"]
+
+    entry_store.delete_for_user("mood", EMAIL)
+    entry_store.delete_for_user("flashcards", EMAIL)
+    assert _day() is None
@@ -0,0 +1,39 @@
+import pytest
+from backend.services import entry_store, search_index
+
+ALICE, BOB = "search-alice@test.local", "search-bob@test.local"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def entries():
+    entry_store.add("doubts", ALICE, {"topic": "graphs", "question": "How does Dijkstra find shortest paths?",
+                                      "response": "Dijkstra relaxes edges from a priority queue."})
+    entry_store.add("doubts", ALICE, {"topic": "sorting", "question": "Why is quicksort fast on average?",
+                                      "response": "Partitioning keeps the recursion shallow."})
+    entry_store.add("chatbot", ALICE, {"question": "Explain Dijkstra briefly", "answer": "Greedy shortest paths."})
+    entry_store.add("doubts", BOB, {"topic": "graphs", "question": "Dijkstra with negative edges?",
+                                    "response": "Use Bellman-Ford."})
+
+def test_tokenize_drops_stopwords_and_single_letters():
+    assert search_index.tokenize("What is the Heap, a tree?") == ["heap", "tree"]
+
+
+def test_best_match_ranks_first():
+    hits = search_index.search(ALICE, "quicksort partitioning")
+    assert hits and hits[0]["entry"]["topic"] == "sorting"
+
+
+def test_results_stay_within_one_user():
+    hits = search_index.search(ALICE, "dijkstra")
+    assert len(hits) == 2 and all(h["entry"].get("response") != "Use Bellman-Ford." for h in hits)
+
+
+def test_module_filter_and_unknown_terms():
+    assert [h["module"] for h in search_index.search(ALICE, "dijkstra", modules={"chatbot"})] == ["chatbot"]
+    assert search_index.search(ALICE, "zeppelin") == []
+    assert search_index.search(ALICE, "the a of") == []
+
+
+def test_deleted_entries_leave_the_index():
+    entry_store.delete_for_user("doubts", BOB)
+    assert search_index.search(BOB, "dijkstra") == []
@@ -0,0 +1,30 @@
+import numpy as np
+from backend.services.semantic_cache import SemanticCache, vectorize
+
+
+def test_paraphrase_reuses_the_answer():
+    cache = SemanticCache()
+    cache.add("t-paraphrase", "What is polymorphism?", "Many forms.")
+    hit = cache.lookup("t-paraphrase", "Can you explain polymorphism simply?")
+    assert hit is not None and hit[0] == "Many forms."
+
+
+def test_unrelated_question_misses():
+    cache = SemanticCache()
+    cache.add("t-unrelated", "inheritance in java", "Extends.")
+    assert cache.lookup("t-unrelated", "what is a binary heap") is None
+
+
+def test_hash_collision_is_not_served():
+    # "interpreter" and "array" land in the same hashed bucket
+    assert np.array_equal(vectorize("interpreter"), vectorize("array"))
+    cache = SemanticCache()
+    cache.add("t-collision", "what is an array", "A contiguous block of elements.")
+    assert cache.lookup("t-collision", "what is an interpreter") is None
+
+
+def test_true_match_behind_a_collision_is_found():
+    cache = SemanticCache()
+    cache.add("t-behind", "array", "wrong")
+    cache.add("t-behind", "interpreter", "right")
+    assert cache.lookup("t-behind", "interpreter")[0] == "right"
@@ -0,0 +1,45 @@
+import pytest
+from backend.database import engine
+from backend.services import entry_store
+from backend.utils.pagination import PageParams, decode_cursor
+
+EMAIL = "timeline@test.local"
+MODULES = ("autonote", "braindump", "calendar", "chatbot", "confusion", "distraction",
+           "doubts", "flashcards", "focus", "mood", "planner", "timepredict")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def entries():
+    # 36 entries, interleaved across modules by time
+    for n in range(36):
+        entry_store.add(MODULES[n % len(MODULES)], EMAIL, {"timestamp": f"2026-04-01T10:{n:02d}:00", "n": n})
+
+
+def test_pages_merge_modules_newest_first():
+    seen, cursor = [], None
+    while True:
+        page = entry_store.timeline_page(EMAIL, MODULES, PageParams(limit=7, cursor=cursor))
+        seen += [item["entry"]["n"] for item in page["entries"]]
+        if not page["next_cursor"]:
+            break
+        cursor = decode_cursor(page["next_cursor"])
+    assert seen == list(range(35, -1, -1))
+
+
+def test_stream_respects_limit_and_module_filter():
+    lines = list(entry_store.iter_timeline(EMAIL, ("mood", "focus"), PageParams(limit=4)))
+    assert len(lines) == 4 and all('"module":"mood"' in l or '"module":"focus"' in l for l in lines)
+    assert len(list(entry_store.iter_timeline(EMAIL, ("mood",)))) == 3
+
+
+def test_one_connection_per_merge_however_many_modules():
+    streams = [entry_store.iter_timeline(EMAIL, MODULES, PageParams(limit=5)) for _ in range(3)]
+    before = engine.pool.checkedout()
+    try:
+        for stream in streams:
+            next(stream)
+        assert engine.pool.checkedout() - before == 3
+    finally:
+        for stream in streams:
+            stream.close()
+    assert engine.pool.checkedout() == before
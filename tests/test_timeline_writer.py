@@ -0,0 +1,90 @@
+import threading
+from backend.utils.timeline_writer import WriteBehindLogger
+
+
+def test_batches_reach_the_sink_and_flush_waits_for_them():
+    written = []
+    writer = WriteBehindLogger(sink=written.extend, batch_size=3, flush_seconds=0.05)
+    for n in range(10):
+        assert writer.submit({"n": n})
+    assert writer.flush()
+    assert [e["n"] for e in written] == list(range(10))
+    writer.stop()
+    assert writer.stats()["written"] == 10 and writer.stats()["dropped"] == 0
+
+
+def test_full_queue_writes_through_instead_of_dropping():
+    in_sink, release, written = threading.Event(), threading.Event(), []
+
+    def sink(batch):
+        if batch == [{"n": 0}]:
+            in_sink.set()
+            release.wait(5)
+        written.extend(batch)
+
+    writer = WriteBehindLogger(sink=sink, maxsize=1, batch_size=1, flush_seconds=0.05)
+    writer.submit({"n": 0})
+    assert in_sink.wait(5)          # writer is now stuck on entry 0
+    assert writer.submit({"n": 1})  # fills the queue
+    assert writer.submit({"n": 2})  # written by the caller
+    assert written == [{"n": 2}]
+    release.set()
+    assert writer.flush()
+    assert sorted(e["n"] for e in written) == [0, 1, 2]
+    assert writer.stats()["dropped"] == 0 and writer.stats()["written_through"] == 1
+    writer.stop()
+
+
+def test_entry_is_only_dropped_when_the_direct_write_fails_too():
+    in_sink, release = threading.Event(), threading.Event()
+
+    def sink(batch):
+        if batch == [{"n": 0}]:
+            in_sink.set()
+            release.wait(5)
+            return
+        raise OSError("disk full")
+
+    writer = WriteBehindLogger(sink=sink, maxsize=1, batch_size=1, flush_seconds=0.05, retries=0)
+    writer.submit({"n": 0})
+    assert in_sink.wait(5)
+    writer.submit({"n": 1})
+    assert not writer.submit({"n": 2})
+    assert writer.stats()["dropped"] == 1
+    release.set()
+    writer.stop()
+
+
+def test_failing_sink_is_retried():
+    written, failures = [], [2]
+
+    def flaky(batch):
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError("disk hiccup")
+        written.extend(batch)
+
+    writer = WriteBehindLogger(sink=flaky, retries=3, retry_seconds=0, flush_seconds=0.05)
+    writer.submit({"n": 0})
+    assert writer.flush()
+    assert written == [{"n": 0}] and writer.stats()["retried"] == 2
+    writer.stop()
+
+
+def test_batch_that_keeps_failing_is_carried_into_the_next_flush():
+    written, healthy = [], threading.Event()
+
+    def sink(batch):
+        if not healthy.is_set():
+            raise OSError("disk full")
+        written.extend(batch)
+
+    writer = WriteBehindLogger(sink=sink, retries=0, retry_seconds=0, flush_seconds=0.05)
+    writer.submit({"n": 0})
+    assert not writer.flush()
+    assert writer.stats()["pending_retry"] == 1
+    healthy.set()
+    writer.submit({"n": 1})
+    assert writer.flush()
+    assert [e["n"] for e in written] == [0, 1] and writer.stats()["dropped"] == 0
+    writer.stop()
@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from backend.routers import auth
+from backend.services import token_cache as token_cache_module
+from backend.services.token_cache import TokenCache
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(token_cache_module, "time", clock)
+    return clock
+
+
+def test_hit_until_the_ttl_runs_out(clock):
+    cache = TokenCache(ttl=60)
+    cache.put("t", {"email": "a@x.io"})
+    clock.now += 59
+    assert cache.get("t") == {"email": "a@x.io"}
+    clock.now += 2
+    assert cache.get("t") is None and cache.stats()["expired"] == 1
+
+
+def test_never_outlives_the_tokens_own_exp(clock):
+    cache = TokenCache(ttl=300)
+    cache.put("t", {"email": "a@x.io"}, exp=clock.now + 10)
+    clock.now += 9
+    assert cache.get("t")
+    clock.now += 1
+    assert cache.get("t") is None
+
+
+def test_already_expired_tokens_are_not_cached(clock):
+    cache = TokenCache(ttl=300)
+    cache.put("t", {"email": "a@x.io"}, exp=clock.now - 1)
+    assert cache.get("t") is None and cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted_at_capacity(clock):
+    cache = TokenCache(max_entries=2, ttl=60)
+    cache.put("a", {"email": "a"})
+    cache.put("b", {"email": "b"})
+    assert cache.get("a")             # b is now the oldest
+    cache.put("c", {"email": "c"})
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_raw_tokens_are_not_kept(clock):
+    cache = TokenCache()
+    cache.put("secret-token", {"email": "a"})
+    assert "secret-token" not in cache._entries
+
+
+def test_get_current_user_stops_serving_a_token_at_its_exp(clock, monkeypatch):
+    exp = clock.now + 30
+    monkeypatch.setattr(auth, "find_user", lambda email: {"email": email})
+    monkeypatch.setattr(auth, "token_cache", TokenCache(ttl=300))
+    monkeypatch.setattr(auth.jwt, "decode", lambda *a, **k: {"sub": "cached@x.io", "exp": exp})
+
+    def current():
+        return asyncio.run(auth.get_current_user("Bearer some.jwt.token"))
+
+    assert current() == {"email": "cached@x.io"}
+
+    # From now on only the cache can vouch for the token, as if it had expired
+    def rejected(*args, **kwargs):
+        raise auth.JWTError("Signature has expired")
+
+    monkeypatch.setattr(auth.jwt, "decode", rejected)
+    clock.now = exp - 1
+    assert current() == {"email": "cached@x.io"}
+    clock.now = exp
+    with pytest.raises(HTTPException) as err:
+        current()
+    assert err.value.status_code == 401
@@ -0,0 +1,73 @@
+import os, threading
+from backend.services.user_directory import UserDirectory
+from backend.utils.serializer import dump_file, load_file
+
+
+def _directory(tmp_path, users=()):
+    path = str(tmp_path / "users.json")
+    dump_file(path, list(users))
+    return UserDirectory(path), path
+
+
+def test_lookups_are_case_insensitive(tmp_path):
+    directory, _ = _directory(tmp_path, [{"email": "Ada@Example.com", "name": "Ada"}])
+    assert directory.get("ada@example.com")["name"] == "Ada"
+    assert directory.get("nobody@example.com") is None
+
+
+def test_external_rewrite_is_picked_up(tmp_path):
+    directory, path = _directory(tmp_path, [{"email": "a@x.io"}])
+    assert directory.get("a@x.io") and len(directory) == 1
+    version = directory.current_version()
+
+    # Another worker process signs someone up
+    dump_file(path, [{"email": "a@x.io"}, {"email": "b@x.io"}])
+    assert directory.get("b@x.io") and len(directory) == 2
+    assert directory.current_version() > version
+
+
+def test_same_size_rewrite_with_a_new_inode_is_picked_up(tmp_path):
+    directory, path = _directory(tmp_path, [{"email": "old@x.io"}])
+    assert directory.get("old@x.io")
+    st = os.stat(path)
+
+    # Same length, same mtime: only the inode tells the files apart
+    dump_file(path, [{"email": "new@x.io"}])
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(path).st_size == st.st_size and os.stat(path).st_ino != st.st_ino
+    assert directory.get("new@x.io") and directory.get("old@x.io") is None
+
+
+def test_unparsable_file_keeps_the_loaded_users(tmp_path):
+    directory, path = _directory(tmp_path, [{"email": "a@x.io"}])
+    assert directory.get("a@x.io")
+    with open(path, "w") as f:
+        f.write("[{ half written")
+    assert directory.get("a@x.io")
+
+
+def test_concurrent_password_and_google_signups(tmp_path):
+    directory, path = _directory(tmp_path)
+    errors = []
+
+    def password_signup(n):
+        try:
+            directory.add({"email": f"user{n}@x.io", "provider": "password"})
+        except ValueError:
+            errors.append(n)   # Google got there first
+
+    def google_signup(n):
+        directory.get_or_create(f"USER{n}@x.io", {"provider": "google"})
+
+    threads = [threading.Thread(target=fn, args=(n,)) for n in range(20) for fn in (password_signup, google_signup)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    on_disk = load_file(path)
+    assert sorted(u["email"].lower() for u in on_disk) == sorted(f"user{n}@x.io" for n in range(20))
+    assert len(directory) == 20
+    # A password signup only failed where the Google account already existed
+    assert all(directory.get(f"user{n}@x.io")["provider"] == "google" for n in errors)
+    assert UserDirectory(path).get("user7@x.io")   # a fresh worker sees everyone